@@ -4,3 +4,12 @@ from future_bridge.wrapperFunction import app as fastapi_app
 
 app = func.AsgiFunctionApp(app=fastapi_app, http_auth_level=func.AuthLevel.ANONYMOUS)
 
+
+@app.warm_up_trigger("warmup_context")
+async def warm_up(warmup_context) -> None:
+    # Scale-out instances run the ASGI startup (warm-up of Mongo, tokens and catalogs) here,
+    # before the host routes traffic to them, instead of on their first HTTP request
+    if not app.startup_task_done:
+        if not await app.middleware.notify_startup():
+            raise RuntimeError("ASGI middleware startup failed.")
+        app.startup_task_done = True
@@ -5,12 +5,13 @@ import re
 import json
 
 from future_bridge.utils.JWTTokenGenrator import create_jwt
-from future_bridge.utils.sendEmail import MicrosoftEmailService
+from future_bridge.utils.sendEmail import get_microsoft_email_service
 from future_bridge.services.commonService import OTPService, get_otp_service
 from future_bridge.schema.commonSchema import ValidateOtpResponse,ValidateOtpBody,ResponseSchema,EmailSchema
 from future_bridge.config.messages import ErrorMessages
+from future_bridge.utils.requestTiming import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/sendOTP", tags=["Auth"], response_model=ResponseSchema)
@@ -19,7 +20,7 @@ async def send_otp(request: EmailSchema):
     email = request.email
 
     try:
-        response:ResponseSchema = await MicrosoftEmailService().send_otp(email)
+        response:ResponseSchema = await get_microsoft_email_service().send_otp(email)
 
         return response
     except Exception as e:
@@ -4,8 +4,9 @@ from future_bridge.schema.commonSchema import *
 from future_bridge.utils.google.token_validator import jwtBearer, get_token_from_header
 from future_bridge.utils.google.token_validation import validate_google_token
 from future_bridge.services.commonService import CommonService, get_common_service
+from future_bridge.utils.requestTiming import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post('/college/configuration', tags=["Common"],dependencies=[Depends(jwtBearer())], response_model=dict, summary="Stores the users college admission configuration")
 async def store_college_configuration(
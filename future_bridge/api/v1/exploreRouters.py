@@ -1,7 +1,7 @@
 from fastapi import FastAPI, HTTPException, APIRouter, Query, Depends, status, Request
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Literal
 import logging
-from future_bridge.services.exploreServices import explore_Service, ExploreService
+from future_bridge.services.exploreServices import explore_Service, ExploreService, SEARCH_FIELD_SOURCES, REPORT_FIELD_SOURCES, RECOMMENDATION_ITEM_FIELDS
 from future_bridge.schema.instituteSchema import SearchCollegesQuery, AdmissionChancesRequest
 from future_bridge.schema.commonSchema import ResponseSchema
 from future_bridge.config.messages import ErrorMessages
@@ -11,12 +11,17 @@ from future_bridge.utils.google.token_validation import validate_google_token
 from future_bridge.services.recommendationService import recommendation_service, RecommendationService
 from future_bridge.schema.recommendationSchema import RecommendationRequest, CollegeRecommendationRequest, CollegeRecommendationListResponse, AICapDetailsResponseSchema
 from future_bridge.schema.recommendationSchema import SearchByChoiceCode , SearchByCollegeName ,SearchByCollegeCode
+from future_bridge.utils.fastResponse import FastJSONResponse, fast_response
+from future_bridge.utils.fieldSelection import sparse_fields
+from future_bridge.utils.requestTiming import TimedRoute
 
-router = APIRouter()
+# Explore responses are large (up to hundreds of colleges and recommendation items); render them with orjson
+router = APIRouter(default_response_class=FastJSONResponse, route_class=TimedRoute)
 
 @router.post("/Quick_College_Scan/", tags=["Colleges"], response_model=ResponseSchema, summary="Search for colleges")
 async def search_colleges(
     query: SearchCollegesQuery,
+    fields: Optional[List[str]] = Depends(sparse_fields(SEARCH_FIELD_SOURCES)),
     explore_service: ExploreService = Depends(explore_Service)
 ):
     """
@@ -28,6 +33,7 @@ async def search_colleges(
     - **city**: Optional list of city names
     - **sort_by**: Optional field to sort by ("cutoff_cet" or "placement_percentage")
     - **order**: Optional sort order ("asc" or "desc")
+    - **fields**: Optional comma separated college fields to return (query parameter), e.g. college_name,city,fees
     - Additional filters can be passed as query parameters
     
     Returns:
@@ -41,7 +47,8 @@ async def search_colleges(
             cities=query.city,
             sort_by=query.sort_by,
             order=query.order,
-            filters=filters
+            filters=filters,
+            fields=fields
         )
 
         # Check if there's an error message in the result
@@ -67,8 +74,9 @@ async def search_colleges(
         elif result.get("total_records", 0) == 0 and query.course:
             success_message = f"No colleges found offering the course: {query.course}"
         
-        # Construct successful response
-        return ResponseSchema(
+        # Construct successful response (service-built data, serialized without re-validation)
+        return fast_response(
+            ResponseSchema,
             message=success_message,
             success=True,
             data=result
@@ -111,13 +119,15 @@ async def search_colleges(
 @router.get("/college/{id}", tags=["Colleges"], response_model=ResponseSchema, summary="Get college details by SJ_Institute_Code")
 async def get_college_details(
     id: int,
+    fields: Optional[List[str]] = Depends(sparse_fields(REPORT_FIELD_SOURCES)),
     explore_service: ExploreService = Depends(explore_Service)
 ):
     """
     Get detailed college info by SJ_Institute_Code, including department meta and cutoff data.
+    `fields` (e.g. College_Name,Location.City,Departments) limits the report to those fields.
     """
     try:
-        college_detail = await explore_service.get_college_report_by_college_name(id)
+        college_detail = await explore_service.get_college_report_by_college_name(id, fields)
         data = college_detail
         return ResponseSchema(
             message="College details retrieved successfully",
@@ -233,7 +243,8 @@ async def get_all_colleges_cutoff_data(
     """
     try:
         cutoff_data = await explore_service.get_all_cutoff_data()
-        return ResponseSchema(
+        return fast_response(
+            ResponseSchema,
             message="All cutoff data retrieved successfully",
             success=True,
             data=cutoff_data
@@ -246,6 +257,8 @@ async def get_all_colleges_cutoff_data(
 async def get_college_recommendation_list(
     payload:  CollegeRecommendationRequest,
     request: Request,
+    expand: Optional[Literal["college"]] = Query(None, description="Set to 'college' to embed the full institute metadata, cet_percentile and category in every item"),
+    fields: Optional[List[str]] = Depends(sparse_fields(RECOMMENDATION_ITEM_FIELDS)),
     explore_service: ExploreService = Depends(explore_Service)
 ):
     """
@@ -257,8 +270,13 @@ async def get_college_recommendation_list(
     - cet_percentile: float
     - Location: List[str]
     
+    Query:
+    - expand: "college" embeds the full institute metadata, cet_percentile and category in every item (the pre-compaction item shape)
+    - fields: comma separated item fields to return, e.g. sj_code,course,cutoff (college.<field> selects college fields)
+    
     Returns:
-    - ResponseSchema with Dream, Reach, Match, Safety arrays
+    - ResponseSchema with Dream, Reach, Match, Safety arrays of compact items (sj_code, choice_code,
+      course, cutoff, probability) and a `colleges` dictionary of college summaries keyed by sj_code
     """
     try:
         token = get_token_from_header(request)
@@ -270,8 +288,9 @@ async def get_college_recommendation_list(
         if not is_valid or not email:
             raise HTTPException(status_code=401, detail={"error": "Invalid or expired token", "technicalError": "Invalid or missing email in token"})
         
-        result = await explore_service.generate_college_recommendations(payload, email)
-        return CollegeRecommendationListResponse(
+        result = await explore_service.generate_college_recommendations(payload, email, expand, fields)
+        return fast_response(
+            CollegeRecommendationListResponse,
             message="College recommendations generated successfully",
             success=True,
             data=result
@@ -283,6 +302,8 @@ async def get_college_recommendation_list(
 @router.get("/recommendation/college-list", tags=["Recommendation"],dependencies=[Depends(jwtBearer())], response_model=CollegeRecommendationListResponse, summary="Get recommended colleges grouped by admission chances")
 async def get_college_recommendation_list(
     request: Request,
+    expand: Optional[Literal["college"]] = Query(None, description="Set to 'college' to embed the full institute metadata, cet_percentile and category in every item"),
+    fields: Optional[List[str]] = Depends(sparse_fields(RECOMMENDATION_ITEM_FIELDS)),
     explore_service: ExploreService = Depends(explore_Service)
 ):
     """
@@ -299,8 +320,9 @@ async def get_college_recommendation_list(
             raise HTTPException(status_code=401, detail={"error": "Invalid or expired token", "technicalError": "Invalid or missing email in token"})
         email =validation_result[1]
 
-        result = await explore_service.get_college_recommendation_list(email)
-        return CollegeRecommendationListResponse(
+        result = await explore_service.get_college_recommendation_list(email, expand, fields)
+        return fast_response(
+            CollegeRecommendationListResponse,
             message="College recommendations retrieved successfully",
             success=True,
             data=result
@@ -315,6 +337,8 @@ async def get_college_recommendation_list(
 async def get_college_recommendation_list_round(
     payload:  CollegeRecommendationRequest,
     request: Request,
+    expand: Optional[Literal["college"]] = Query(None, description="Set to 'college' to embed the full institute metadata, cet_percentile and category in every item"),
+    fields: Optional[List[str]] = Depends(sparse_fields(RECOMMENDATION_ITEM_FIELDS)),
     explore_service: ExploreService = Depends(explore_Service)
 ):
     """
@@ -330,8 +354,9 @@ async def get_college_recommendation_list_round(
         if not is_valid:
             raise HTTPException(status_code=401, detail={"error": "Invalid or expired token", "technicalError": "Invalid or missing email in token"})
         email =validation_result[1]
-        result = await explore_service.generate_college_recommendations_round(payload, email)
-        return CollegeRecommendationListResponse(
+        result = await explore_service.generate_college_recommendations_round(payload, email, expand, fields)
+        return fast_response(
+            CollegeRecommendationListResponse,
             message="College recommendations generated successfully",
             success=True,
             data=result
@@ -431,10 +456,12 @@ async def search_college_by_college_code(
 
 
 
-@router.post('/generate/diploma-round-list', tags=["Diploma"],dependencies=[Depends(jwtBearer())], response_model=dict, summary="Get recommended colleges grouped by admission chances")
+@router.post('/generate/diploma-round-list', tags=["Diploma"],dependencies=[Depends(jwtBearer())], response_model=CollegeRecommendationListResponse, summary="Get recommended colleges grouped by admission chances")
 async def get_college_recommendation_list_diploma(
     payload:  CollegeRecommendationRequest,
     request: Request,
+    expand: Optional[Literal["college"]] = Query(None, description="Set to 'college' to embed the full institute metadata, cet_percentile and category in every item"),
+    fields: Optional[List[str]] = Depends(sparse_fields(RECOMMENDATION_ITEM_FIELDS)),
     explore_service: ExploreService = Depends(explore_Service)
 ):
     """
@@ -450,21 +477,24 @@ async def get_college_recommendation_list_diploma(
         if not is_valid:
             raise HTTPException(status_code=401, detail={"error": "Invalid or expired token", "technicalError": "Invalid or missing email in token"})
         email =validation_result[1]
-        result = await explore_service.generate_college_recommendations_diploma(payload, email)
-        return {
-            "message":"College recommendations generated successfully",
-            "success":True,
-            "data":result
-        }
+        result = await explore_service.generate_college_recommendations_diploma(payload, email, expand, fields)
+        return fast_response(
+            CollegeRecommendationListResponse,
+            message="College recommendations generated successfully",
+            success=True,
+            data=result
+        )
     except Exception as e:
         logging.error(f"Error generating college recommendations: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail={"error": ErrorMessages.ERROR_INTERNAL_SERVER_ERROR, "technicalError": str(e)})
 
 
-@router.get("/get/diploma-round-list/{round_no}", tags=["Diploma"],dependencies=[Depends(jwtBearer())], response_model=dict, summary="Get recommended colleges grouped by admission chances")
+@router.get("/get/diploma-round-list/{round_no}", tags=["Diploma"],dependencies=[Depends(jwtBearer())], response_model=CollegeRecommendationListResponse, summary="Get recommended colleges grouped by admission chances")
 async def get_college_recommendation_list_diploma(
     request: Request,
     round_no: int,
+    expand: Optional[Literal["college"]] = Query(None, description="Set to 'college' to embed the full institute metadata, cet_percentile and category in every item"),
+    fields: Optional[List[str]] = Depends(sparse_fields(RECOMMENDATION_ITEM_FIELDS)),
     explore_service: ExploreService = Depends(explore_Service)
 ):
     """
@@ -480,12 +510,13 @@ async def get_college_recommendation_list_diploma(
         if not is_valid:
             raise HTTPException(status_code=401, detail={"error": "Invalid or expired token", "technicalError": "Invalid or missing email in token"})
         email =validation_result[1]
-        result = await explore_service.get_college_recommendation_list_diploma(round_no, email)
-        return {
-            "message":"College recommendations retrieved successfully",
-            "success":True,
-            "data":result
-        }
+        result = await explore_service.get_college_recommendation_list_diploma(round_no, email, expand, fields)
+        return fast_response(
+            CollegeRecommendationListResponse,
+            message="College recommendations retrieved successfully",
+            success=True,
+            data=result
+        )
     except Exception as e:
         logging.error(f"Error retrieving college recommendations: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail={"error": ErrorMessages.ERROR_INTERNAL_SERVER_ERROR, "technicalError": str(e)})
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import FileResponse
+import logging
+
+from future_bridge.config.messages import ErrorMessages
+from future_bridge.schema.commonSchema import ResponseSchema
+from future_bridge.utils.google.token_validator import jwtBearer
+from future_bridge.utils.loopWatchdog import loop_watchdog
+from future_bridge.utils.mongoMetrics import mongo_metrics
+from future_bridge.utils.profiling import list_reports, profiling_available, report_path
+from future_bridge.utils.requestTiming import request_timings
+from future_bridge.utils.warmup import warmup
+
+# Only mounted when Environment is not Production (see main.py / wrapperFunction)
+router = APIRouter()
+
+
+@router.get("/metrics", tags=["Internal"], dependencies=[Depends(jwtBearer())], response_model=ResponseSchema, include_in_schema=False, summary="Per-route MongoDB command metrics")
+async def get_mongo_metrics():
+    """
+    Mongo command counts, latency histograms and per-collection totals for every
+    route served by this worker since it started.
+    """
+    try:
+        return ResponseSchema(message="Metrics fetched successfully", success=True, data=mongo_metrics.snapshot())
+    except Exception as e:
+        logging.error(f"Error fetching Mongo metrics: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail={"error": ErrorMessages.ERROR_INTERNAL_SERVER_ERROR, "technicalError": str(e)})
+
+
+@router.get("/timings", tags=["Internal"], dependencies=[Depends(jwtBearer())], response_model=ResponseSchema, include_in_schema=False, summary="Per-route request timing breakdown")
+async def get_request_timings():
+    """
+    Histograms of total time and of the time spent in each layer (auth,
+    repository, service, endpoint, encode, fastapi) per route, over the requests
+    sampled by this worker (REQUEST_TIMING_SAMPLE_RATE).
+    """
+    try:
+        return ResponseSchema(message="Timings fetched successfully", success=True, data=request_timings.snapshot())
+    except Exception as e:
+        logging.error(f"Error fetching request timings: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail={"error": ErrorMessages.ERROR_INTERNAL_SERVER_ERROR, "technicalError": str(e)})
+
+
+@router.get("/blocking", tags=["Internal"], dependencies=[Depends(jwtBearer())], response_model=ResponseSchema, include_in_schema=False, summary="Event loop stalls by call site")
+async def get_blocking_calls():
+    """
+    Event loop lag histogram and the call sites that blocked the loop for longer
+    than LOOP_WATCHDOG_THRESHOLD_MS, worst first (LOOP_WATCHDOG_ENABLED only).
+    """
+    try:
+        return ResponseSchema(message="Blocking calls fetched successfully", success=True, data=loop_watchdog.snapshot())
+    except Exception as e:
+        logging.error(f"Error fetching blocking calls: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail={"error": ErrorMessages.ERROR_INTERNAL_SERVER_ERROR, "technicalError": str(e)})
+
+
+@router.get("/warmup", tags=["Internal"], dependencies=[Depends(jwtBearer())], response_model=ResponseSchema, include_in_schema=False, summary="Startup warm-up step timings")
+async def get_warmup_report():
+    """
+    Status, duration and result of every warm-up step this worker ran on startup,
+    and how long it took until the blocking steps were done.
+    """
+    try:
+        return ResponseSchema(message="Warm-up report fetched successfully", success=True, data=warmup.snapshot())
+    except Exception as e:
+        logging.error(f"Error fetching warm-up report: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail={"error": ErrorMessages.ERROR_INTERNAL_SERVER_ERROR, "technicalError": str(e)})
+
+
+@router.get("/profiles", tags=["Internal"], dependencies=[Depends(jwtBearer())], response_model=ResponseSchema, include_in_schema=False, summary="Stored request profiles")
+async def get_profiles():
+    """
+    Names of the pyinstrument reports stored by `X-Profile: store` requests on this worker, newest first.
+    """
+    if not profiling_available():
+        raise HTTPException(status_code=404, detail={"error": "Profiling is not available in this environment", "technicalError": "Profiling disabled"})
+    try:
+        return ResponseSchema(message="Profiles fetched successfully", success=True, data=list_reports())
+    except Exception as e:
+        logging.error(f"Error listing profiles: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail={"error": ErrorMessages.ERROR_INTERNAL_SERVER_ERROR, "technicalError": str(e)})
+
+
+@router.get("/profiles/{name}", tags=["Internal"], dependencies=[Depends(jwtBearer())], include_in_schema=False, summary="Stored request profile report")
+async def get_profile(name: str):
+    """
+    One stored pyinstrument HTML report.
+    """
+    path = report_path(name) if profiling_available() else None
+    if path is None:
+        raise HTTPException(status_code=404, detail={"error": "Profile not found", "technicalError": f"No stored profile named {name}"})
+    return FileResponse(path, media_type="text/html")
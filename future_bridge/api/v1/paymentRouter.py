@@ -4,11 +4,12 @@ import logging
 from future_bridge.config.messages import ErrorMessages, Success
 
 from future_bridge.services.razorPayService import PaymentService, get_payment_service
+from future_bridge.utils.requestTiming import TimedRoute
 
 from future_bridge.schema.paymentSchema import *
 from future_bridge.schema.commonSchema import *
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/payment/initiate", tags=["Payment"],response_model=ResponseSchema)
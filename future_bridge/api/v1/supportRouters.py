@@ -8,11 +8,13 @@ from fastapi.responses import StreamingResponse
 
 from future_bridge.schema.supportSchema import BulkActionRequest, ExportTicketsRequest, SupportRequest, SupportResponse, TicketFilterRequest
 from future_bridge.services.supportService import SupportService, get_support_service
+from future_bridge.utils.compression import skip_compression
 from future_bridge.utils.google.token_validator import jwtBearer, get_token_from_header
 from future_bridge.utils.google.token_validator import validate_google_token
+from future_bridge.utils.requestTiming import TimedRoute
 from future_bridge.schema.supportSchema import CommentRequest, CommentResponse, AdminCommentRequest, AdminCommentResponse
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 ALLOWED_EXTENSIONS = {"jpeg", "jpg", "png", "mp4", "mov", "avi"}
 MAX_FILE_SIZE_MB = 20
@@ -41,25 +43,10 @@ async def store_user_tickets(
         # Capture browser/system info
         browser_info = request.headers.get("user-agent", "Unknown")
 
-        # Validate attachments
+        # Validate attachments and stream them to Azure Blob (size limit enforced while uploading)
         blob_ids = []
         if files:
-            if len(files) > 2:
-                raise ValueError("Max 2 attachments allowed.")
-            
-            for file in files:
-                ext = file.filename.split(".")[-1].lower()
-                if ext not in ALLOWED_EXTENSIONS:
-                    raise ValueError(f"Invalid file type: {file.filename}. Allowed: {ALLOWED_EXTENSIONS}")
-
-                # Size validation
-                contents = await file.read()
-                if len(contents) > MAX_FILE_SIZE_MB * 1024 * 1024:
-                    raise ValueError(f"{file.filename} exceeds {MAX_FILE_SIZE_MB}MB limit.")
-
-                # Upload to Azure Blob and store blob ID
-                blob_id = await support_service.upload_to_blob(file.filename, contents)
-                blob_ids.append(blob_id)
+            blob_ids = await support_service.validate_and_upload_files(files, max_size_mb=MAX_FILE_SIZE_MB, max_files=2)
 
         result = await support_service.store_user_tickets(payload, browser_info, blob_ids)
 
@@ -88,21 +75,46 @@ async def get_all_tickets(
     Args:
         status (str, optional): Filter tickets by status.
         sort (str): Sort field and direction (e.g., 'created_at:desc').
-        page (int): Page number for pagination.
+        page (int): Page number for pagination (legacy; prefer cursor).
         limit (int): Maximum records per page.
+        cursor (str, optional): `next_cursor` returned by the previous page.
     """
     try:
         tickets_data = await support_service.get_all_tickets(
             filters.status.value if filters.status else None,
             filters.sort,
             filters.page,
-            filters.limit
+            filters.limit,
+            filters.cursor
         )
         return SupportResponse(message="Tickets fetched successfully", success=True, data=tickets_data)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logging.error(f"Error fetching tickets: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
     
+# Full-text search over tickets and comments
+@router.get("/tickets-search", tags=["Support"], dependencies=[Depends(jwtBearer())], response_model=SupportResponse, summary="Search support tickets")
+async def search_tickets(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms (ticket ID, name, email, details or comment text)"),
+    limit: int = Query(20, ge=1, le=100),
+    support_service: SupportService = Depends(get_support_service)
+):
+    """
+    Search tickets by ticket ID, name, username, details and comment text.
+    Results are ranked by relevance; every term must match.
+    Args:
+        q (str): Search terms.
+        limit (int): Maximum number of tickets to return.
+    """
+    try:
+        results = await support_service.search_tickets(q, limit)
+        return SupportResponse(message="Tickets searched successfully", success=True, data=results)
+    except Exception as e:
+        logging.error(f"Error searching tickets: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Error searching tickets")
+
 # Fetch single ticket by ID
 @router.get("/tickets/{ticket_id}", tags=["Support"], dependencies=[Depends(jwtBearer())], response_model=SupportResponse, summary="Fetch single support ticket details")
 async def get_ticket_by_id(
@@ -110,7 +122,8 @@ async def get_ticket_by_id(
     support_service: SupportService = Depends(get_support_service)
 ):
     """
-    Fetch details of a single support ticket by its unique ID.
+    Fetch details of a single support ticket by its unique ID, with all of its
+    comments oldest first (paged, newest first, at /tickets/{ticket_id}/comments).
     Args:
         ticket_id (str): Unique ticket ID.
     """
@@ -125,24 +138,61 @@ async def get_ticket_by_id(
         logging.error(f"Error fetching ticket: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error fetching ticket details")
 
-# Export tickets as CSV
+# Fetch a page of a ticket's comments
+@router.get("/tickets/{ticket_id}/comments", tags=["Support"], dependencies=[Depends(jwtBearer())], response_model=SupportResponse, summary="Fetch support ticket comments")
+async def get_ticket_comments(
+    ticket_id: str,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    support_service: SupportService = Depends(get_support_service)
+):
+    """
+    Fetch the comments of a ticket, newest first, one page at a time.
+    Args:
+        ticket_id (str): Unique ticket ID.
+        page (int): Page number.
+        limit (int): Comments per page.
+    """
+    try:
+        comments = await support_service.get_ticket_comments(ticket_id, page, limit)
+        if comments is None:
+            raise HTTPException(status_code=404, detail="Ticket not found")
+        return SupportResponse(message="Comments fetched successfully", success=True, data=comments)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error fetching comments: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Error fetching ticket comments")
+
+# Export tickets as CSV (compression is chosen by the client with ?gzip=true, not by the middleware)
 @router.post("/tickets-export", tags=["Support"], dependencies=[Depends(jwtBearer())], summary="Export support tickets as CSV")
+@skip_compression
 async def export_tickets_as_csv(
     request: ExportTicketsRequest,
+    gzip: bool = Query(False, description="Compress the CSV on the fly (support_tickets.csv.gz)"),
     support_service: SupportService = Depends(get_support_service)
 ):
     """
     Export all or filtered support tickets as a downloadable CSV file.
+    The file is streamed while it is generated, so large exports start immediately.
     Args:
         request (ExportTicketsRequest): Filter options (status, ticket_id).
+        gzip (bool): Return a gzip-compressed CSV.
     """
     try:
         # Generate CSV stream from service
         csv_output = await support_service.export_tickets_as_csv(
             status=request.status.value if request.status else None,
-            ticket_ids=request.ticket_ids
+            ticket_ids=request.ticket_ids,
+            compress=gzip
         )
 
+        if gzip:
+            return StreamingResponse(
+                csv_output,
+                media_type="application/gzip",
+                headers={"Content-Disposition": "attachment; filename=support_tickets.csv.gz"}
+            )
         return StreamingResponse(
             csv_output,
             media_type="text/csv",
@@ -169,7 +219,11 @@ async def bulk_action_on_tickets(
     """
     try:
         result = await support_service.perform_bulk_action(body.action, body.ticket_ids)
+        if result["failed_chunks"]:
+            return SupportResponse(message=f"Bulk action partially failed ({result['failed_chunks']} of {len(result['chunks'])} chunks)", success=False, data=result)
         return SupportResponse(message="Bulk action completed", success=True, data=result)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logging.error(f"Error in bulk action: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Error performing bulk action")
@@ -210,8 +264,20 @@ def extract_user_info_from_token(token: str) -> dict:
 # GET endpoint -> /support/my_tickets -> To get the Tickets as a User
 @router.get('/my_tickets', tags=["Support"], dependencies=[Depends(jwtBearer())], summary="Fetch user support tickets")
 async def get_user_tickets(
-    request: Request, support_service: SupportService = Depends(get_support_service)
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; passing limit or cursor selects the paginated response"),
+    cursor: Optional[str] = Query(None, description="Continuation token (next_cursor) from the previous page"),
+    support_service: SupportService = Depends(get_support_service)
 ):
+    """
+    Fetch the user's tickets, newest first.
+
+    Without `limit` and `cursor`, `data` is the list of every ticket with its
+    comments, as before pagination (kept for existing app builds). With either
+    of them, `data` is one page of ticket summaries (ticket_id, status,
+    created_at, comment count, last activity) with `next_cursor`; use
+    /my_tickets/{ticket_id} for the full ticket.
+    """
     try:
         # Extract token and user info
         token = get_token_from_header(request)
@@ -223,7 +289,10 @@ async def get_user_tickets(
             raise ValueError("Email not found in token.")
         
         # Fetch tickets
-        tickets = await support_service.get_user_tickets(user_email)
+        if limit is None and cursor is None:
+            tickets = await support_service.list_user_tickets(user_email)
+        else:
+            tickets = await support_service.get_user_tickets(user_email, limit or 20, cursor)
         return {
             "message": "User tickets fetched successfully.",
             "success": True,
@@ -237,6 +306,41 @@ async def get_user_tickets(
         raise HTTPException(status_code=500, detail="An unexpected error occurred while fetching user tickets.")
 
 
+# GET endpoint -> /support/my_tickets/{ticket_id} -> Full details of one of the user's tickets
+@router.get('/my_tickets/{ticket_id}', tags=["Support"], dependencies=[Depends(jwtBearer())], summary="Fetch one user support ticket")
+async def get_user_ticket(
+    ticket_id: str,
+    request: Request,
+    support_service: SupportService = Depends(get_support_service)
+):
+    """
+    Fetch the full details of one of the user's tickets with its newest comments.
+    """
+    try:
+        token = get_token_from_header(request)
+        user_info = extract_user_info_from_token(token)
+        user_email = user_info.get("email")
+        if not user_email:
+            raise ValueError("Email not found in token.")
+
+        ticket = await support_service.get_user_ticket(user_email, ticket_id)
+        if ticket is None:
+            raise HTTPException(status_code=404, detail="Ticket not found")
+        return {
+            "message": "User ticket fetched successfully.",
+            "success": True,
+            "data": ticket
+        }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logging.error(f"Validation error in get_user_ticket: {str(e)}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logging.error(f"Unexpected error in get_user_ticket: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="An unexpected error occurred while fetching the ticket.")
+
+
 # POST endpoint -> /support/add_comment
 @router.post('/add_comment', tags=["Support"], dependencies=[Depends(jwtBearer())], response_model=CommentResponse, summary="Add a comment to a ticket")
 async def add_comment_to_ticket(
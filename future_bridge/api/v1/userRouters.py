@@ -8,7 +8,8 @@ from future_bridge.config.messages import ErrorMessages
 from future_bridge.utils.google.token_validator import jwtBearer, get_token_from_header
 from future_bridge.utils.google.token_validator import validate_google_token
 from future_bridge.schema.recommendationSchema import CollegeDetails
-router = APIRouter()
+from future_bridge.utils.requestTiming import TimedRoute
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/store_user/", tags=["User"], response_model=UserResponse, summary="Store user in database")
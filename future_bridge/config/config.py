@@ -1,11 +1,15 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 import logging
+
+from future_bridge.config.logConfig import configure_logging
  
  
 load_dotenv()
  
 class Settings:
+    ENVIRONMENT: str = os.getenv("Environment", "")
     PROJECT_NAME: str = os.getenv("PROJECT_NAME", "Calling-Kosmos")
     DATABASE_URL: str = os.getenv("COSMO_URI")
     GENERATEDCAREERJOURNEY_URL: str = os.getenv('GENERATEDCAREERJOURNEY_URL')
@@ -30,6 +34,8 @@ class Settings:
     PHARMACY_COLLEGE_CUTOFF_COLLECTION='B_and_D_Pharmacy_cutoff'
     FEEDBACK_COLLECTION='user_feedback'
     SUPPORT_ISSUES_COLLECTION='support_issues'
+    SUPPORT_METRICS_COLLECTION='support_metrics'
+    SUPPORT_COMMENTS_COLLECTION='support_comments'
     UNIVERSITY_MAPPING='university_mapping'
     COMMON_ROUND_PREFERENCES='common_round_preferences'
     ROUND_COLLEGE_PREFERENCE_COLLECTION='common_round_college_preferences'
@@ -45,8 +51,71 @@ class Settings:
     CONUSELOR_INFO=''
     HR_INFO=''
     COLLEGE_ADMIN_COLLECTION=''
+    # How long the in-memory course key dictionary is trusted before reloading
+    COURSE_CATALOG_TTL_SECONDS = int(os.getenv("COURSE_CATALOG_TTL_SECONDS", "3600"))
+    # Create missing declared indexes (config/indexes.py) when the app starts
+    ENSURE_INDEXES_ON_STARTUP = os.getenv("ENSURE_INDEXES_ON_STARTUP", "false").lower() == "true"
+    # Report per-request Mongo command time in a Server-Timing response header
+    MONGO_SERVER_TIMING = os.getenv("MONGO_SERVER_TIMING", "false").lower() == "true"
+    # Attachments are streamed to Azure in blocks of this size instead of being read into memory whole
+    BLOB_UPLOAD_BLOCK_SIZE = int(os.getenv("BLOB_UPLOAD_BLOCK_SIZE", str(4 * 1024 * 1024)))
+    # Ticket list totals are served from memory and refreshed in the background once older than this
+    SUPPORT_TICKET_COUNT_TTL_SECONDS = int(os.getenv("SUPPORT_TICKET_COUNT_TTL_SECONDS", "60"))
+    # Interval of the $group reconcile that repairs drift in the support metrics counter (0 disables it)
+    SUPPORT_METRICS_RECONCILE_SECONDS = int(os.getenv("SUPPORT_METRICS_RECONCILE_SECONDS", "3600"))
+    # Ticket IDs are reserved from ticket_counters in blocks of this size per worker. Unused IDs of a
+    # block are skipped when the worker restarts; set SUPPORT_TICKET_ID_ALLOW_GAPS=false to reserve
+    # one ID per ticket (gap-free, but every ticket creation serializes on the counter document)
+    SUPPORT_TICKET_ID_BLOCK_SIZE = int(os.getenv("SUPPORT_TICKET_ID_BLOCK_SIZE", "50"))
+    SUPPORT_TICKET_ID_ALLOW_GAPS = os.getenv("SUPPORT_TICKET_ID_ALLOW_GAPS", "true").lower() == "true"
+    # Maximum comments per support_comments bucket document
+    SUPPORT_COMMENT_BUCKET_SIZE = int(os.getenv("SUPPORT_COMMENT_BUCKET_SIZE", "50"))
+    # Support ticket search: "memory" (in-process inverted index) or "mongo" (MongoDB text indexes)
+    SUPPORT_SEARCH_BACKEND = os.getenv("SUPPORT_SEARCH_BACKEND", "memory").lower()
+    # The in-process index is rebuilt from the collections in the background once older than this
+    SUPPORT_SEARCH_REBUILD_SECONDS = int(os.getenv("SUPPORT_SEARCH_REBUILD_SECONDS", "900"))
+    # Bulk ticket actions are applied in chunks of this many ticket IDs, this many chunks at a time
+    SUPPORT_BULK_CHUNK_SIZE = int(os.getenv("SUPPORT_BULK_CHUNK_SIZE", "200"))
+    SUPPORT_BULK_CONCURRENCY = int(os.getenv("SUPPORT_BULK_CONCURRENCY", "4"))
+    # Responses smaller than this are sent uncompressed; larger ones are gzip/brotli encoded per Accept-Encoding
+    COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+    # Flags of the config collection (accept_payment, ...) are cached in memory for this long
+    CONFIG_FLAGS_TTL_SECONDS = int(os.getenv("CONFIG_FLAGS_TTL_SECONDS", "60"))
+    # Warm-up on startup (utils/warmup.py): comma separated steps. Blocking steps finish before the
+    # instance serves traffic; background steps run after them without holding up readiness.
+    # Steps: mongo, config_flags, course_catalog, email_token, blob_client, ticket_search
+    WARMUP_BLOCKING_STEPS = os.getenv("WARMUP_BLOCKING_STEPS", "mongo,config_flags")
+    WARMUP_BACKGROUND_STEPS = os.getenv("WARMUP_BACKGROUND_STEPS", "course_catalog,email_token,blob_client")
+    # Upper bound on each blocking step so a slow dependency cannot stall startup
+    WARMUP_STEP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_STEP_TIMEOUT_SECONDS", "15"))
+    # Fraction of requests (0-1) timed per layer (auth, repository, service, ...); 0 disables sampling.
+    # Sampled requests are logged, aggregated at /internal/timings and, with REQUEST_TIMING_HEADER,
+    # reported in a Server-Timing response header
+    REQUEST_TIMING_SAMPLE_RATE = float(os.getenv("REQUEST_TIMING_SAMPLE_RATE", "0"))
+    REQUEST_TIMING_HEADER = os.getenv("REQUEST_TIMING_HEADER", "true").lower() == "true"
+    # On-demand pyinstrument profiling (X-Profile header / __profile query parameter), never in Production
+    PROFILING_INTERVAL_SECONDS = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.001"))
+    PROFILING_OUTPUT_DIR = os.getenv("PROFILING_OUTPUT_DIR", os.path.join(tempfile.gettempdir(), "future_bridge_profiles"))
+    # Debug-mode detector for sync calls blocking the event loop (stalls are logged and listed at
+    # /internal/blocking). The heartbeat runs every INTERVAL; stalls of THRESHOLD or longer are recorded
+    LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG_ENABLED", "false").lower() == "true"
+    LOOP_WATCHDOG_THRESHOLD_MS = float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", "100"))
+    LOOP_WATCHDOG_INTERVAL_MS = float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "20"))
+    # Logging (config/logConfig.py): without a host log handler (local runs), records go to stderr
+    # through a queue and listener thread, as JSON lines unless LOG_FORMAT=text; handlers of the
+    # Azure Functions host stay synchronous with their own format. Below WARNING, each logging call
+    # passes at most LOG_RATE_LIMIT records per LOG_RATE_LIMIT_WINDOW_SECONDS on every handler;
+    # LOG_RATE_LIMITS overrides it per logger, e.g. "root=50,pymongo=5" (0 = unlimited)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+    LOG_QUEUE_ENABLED = os.getenv("LOG_QUEUE_ENABLED", "true").lower() == "true"
+    LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "20"))
+    LOG_RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("LOG_RATE_LIMIT_WINDOW_SECONDS", "10"))
+    LOG_RATE_LIMITS = os.getenv("LOG_RATE_LIMITS", "")
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
- 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
+
+configure_logging(settings)
+logger = logging.getLogger(__name__)
\ No newline at end of file
@@ -0,0 +1,58 @@
+from future_bridge.config.config import settings
+
+# Declarative index spec for the main database, keyed by collection name.
+# Every hot filter/sort used by the repositories should be backed by an entry
+# here; `python -m future_bridge.utils.indexManager` creates whatever is missing.
+# Each entry is {"keys": [(field, direction), ...], "options": {...create_index kwargs}}.
+
+# One bucket document per (ticket, bucket number); unique so racing upserts cannot split a bucket.
+# Comment writes depend on it, so the support repository also creates it on first use.
+COMMENT_BUCKET_INDEX = {"keys": [("ticket_id", 1), ("bucket", 1)], "options": {"unique": True}}
+
+INDEX_SPECS = {
+    settings.USER_PAYMENT_COLLECTION: [
+        {"keys": [("username", 1), ("status", 1), ("payment_for", 1)]},
+        {"keys": [("order_id", 1)]},
+    ],
+    settings.SUPPORT_ISSUES_COLLECTION: [
+        # /my_tickets pages: user's tickets newest first, _id breaks created_at ties for the cursor
+        {"keys": [("username", 1), ("created_at", -1), ("_id", -1)]},
+        # Keyset pagination of the admin ticket list: (sort field, _id), optionally per status
+        {"keys": [("created_at", -1), ("_id", -1)]},
+        {"keys": [("status", 1), ("created_at", -1), ("_id", -1)]},
+        {"keys": [("ticket_id", 1), ("_id", 1)]},  # also serves the ticket_id lookups
+        {"keys": [("status", 1), ("ticket_id", 1), ("_id", 1)]},
+    ],
+    settings.SUPPORT_COMMENTS_COLLECTION: [
+        COMMENT_BUCKET_INDEX,
+    ],
+    settings.COLLEGE_CUTOFF_COLLECTION: [
+        # distinct("course_key") of the course catalog reload
+        {"keys": [("course_key", 1)]},
+        {"keys": [("Year", 1), ("Round", 1), ("SJ_Institute_Code", 1)]},
+        {"keys": [("Year", 1), ("Round", 1), ("course_key", 1)]},
+        {"keys": [("SJ_Institute_Code", 1), ("course_key", 1), ("Year", -1)]},
+    ],
+    settings.DIPLOMA_COLLEGE_CUTOFF_COLLECTION: [
+        # distinct("course_key") of the course catalog reload
+        {"keys": [("course_key", 1)]},
+        {"keys": [("Year", 1), ("Round", 1), ("course_key", 1)]},
+        {"keys": [("SJ_Institute_Code", 1), ("course_key", 1), ("Year", -1)]},
+    ],
+    settings.INSTIUTE_META_COLLECTION: [
+        {"keys": [("SJ_Institute_Code", 1)]},
+    ],
+    settings.DEPARTMENT_META_COLLECTION: [
+        {"keys": [("Choice_Code", 1)]},
+        {"keys": [("SJ_Institute_Code", 1)]},
+    ],
+    settings.RECOMMENDATIONS_COLLECTION: [
+        {"keys": [("username", 1), ("Round", 1)]},
+    ],
+    settings.DIPLOMA_RECOMMENDATIONS_COLLECTION: [
+        {"keys": [("username", 1), ("Round", 1)]},
+    ],
+    settings.COMMON_RECOMMENDATIONS: [
+        {"keys": [("useremail", 1), ("round_no", 1), ("exam_type", 1)]},
+    ],
+}
@@ -0,0 +1,174 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
+
+# Attributes every LogRecord has; anything else was passed with `extra=` and is added to the JSON entry
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "suppressed"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per log line: timestamp, level, logger, message, source
+    location, exception text and any `extra=` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        for name, value in vars(record).items():
+            if name not in _RECORD_ATTRIBUTES:
+                entry[name] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per call site sampling of repetitive records: at most `limit` records of one
+    logging call (logger, file, line) pass per `window_seconds`; the rest are
+    dropped and counted, and the first record of the next window carries the
+    count as `suppressed`. `overrides` sets other limits for loggers by name
+    prefix ("root" for the module-level logging.info calls); 0 means unlimited.
+    Warnings and errors are never dropped.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, overrides: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.overrides = overrides or {}
+        self._limits: Dict[str, int] = {}
+        self._windows: Dict[Tuple[str, str, int], List[float]] = {}  # [window start, passed, dropped]
+        self._lock = threading.Lock()
+
+    def _limit_for(self, logger_name: str) -> int:
+        limit = self._limits.get(logger_name)
+        if limit is None:
+            matches = [prefix for prefix in self.overrides if logger_name == prefix or logger_name.startswith(prefix + ".")]
+            limit = self.overrides[max(matches, key=len)] if matches else self.limit
+            self._limits[logger_name] = limit
+        return limit
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        limit = self._limit_for(record.name)
+        if limit <= 0:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                if window is not None and window[2]:
+                    record.suppressed = int(window[2])
+                self._windows[key] = [now, 1, 0]
+                return True
+            if window[1] < limit:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread. The stock
+    `prepare` runs the formatter (and renders tracebacks) on the calling thread;
+    here only the message arguments are merged, so later changes to them cannot
+    alter the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_configured = False
+_listener: Optional[QueueListener] = None
+
+
+def parse_rate_limits(value: str) -> Dict[str, int]:
+    """
+    Parse per-logger limits such as "root=50,pymongo=5".
+    """
+    limits = {}
+    for part in value.split(","):
+        name, _, limit = part.partition("=")
+        if name.strip() and limit.strip().isdigit():
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+def configure_logging(settings) -> None:
+    """
+    Set up the root logger: level, per call site sampling and, when the process
+    has no log handler yet (local runs, uvicorn), a stderr handler.
+
+    Handlers already on the root logger were installed by the hosting runtime.
+    The Azure Functions worker's handler reads the current invocation from the
+    calling thread and task when it emits, to correlate the line in Application
+    Insights, so those handlers stay synchronous and keep their own format; they
+    only get the sampling filter. The stderr handler added here writes JSON lines
+    (LOG_FORMAT=json) and, with LOG_QUEUE_ENABLED, is fed through a queue: the
+    calling thread (usually the event loop) only filters and enqueues records,
+    and a QueueListener thread formats and writes them.
+    """
+    global _configured, _listener
+    if _configured:
+        return
+    _configured = True
+
+    root = logging.getLogger()
+    root.setLevel(settings.LOG_LEVEL)
+    sampling = RateLimitFilter(settings.LOG_RATE_LIMIT, settings.LOG_RATE_LIMIT_WINDOW_SECONDS, parse_rate_limits(settings.LOG_RATE_LIMITS))
+
+    host_handlers = list(root.handlers)
+    for handler in host_handlers:
+        handler.addFilter(sampling)
+    if host_handlers:
+        return
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+    if not settings.LOG_QUEUE_ENABLED:
+        console.addFilter(sampling)
+        root.addHandler(console)
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _DeferredFormatQueueHandler(log_queue)
+    queue_handler.addFilter(sampling)
+    root.addHandler(queue_handler)
+    _listener = QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    # Flush whatever is still queued when the process exits
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
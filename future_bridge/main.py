@@ -1,9 +1,23 @@
 # This is the file from where execution starts
 
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.config import Config
 
+from future_bridge.config.config import settings
+from future_bridge.utils.blobStorage import close_blob_service_client
+from future_bridge.utils.compression import CompressionMiddleware
+from future_bridge.utils.indexManager import ensure_indexes
+from future_bridge.utils.loopWatchdog import start_loop_watchdog, stop_loop_watchdog
+from future_bridge.utils.mongoMetrics import MongoMetricsMiddleware
+from future_bridge.utils.profiling import ProfilingMiddleware
+from future_bridge.utils.requestTiming import RequestTimingMiddleware
+from future_bridge.utils.sendEmail import close_email_service
+from future_bridge.utils.warmup import warmup
+from future_bridge.services.supportService import start_support_metrics_reconciler, stop_support_metrics_reconciler
+
 from future_bridge.api.v1.exploreRouters import router as explore_router
 from future_bridge.api.v1.authRouters import router as auth_router
 from future_bridge.api.v1.userRouters import router as user_router
@@ -11,6 +25,7 @@ from future_bridge.api.v1.paymentRouter import router as payment_router
 # from future_bridge.api.v1.bbaRouters import router as bba_router
 from future_bridge.api.v1.commonRouters import router as common_router
 from future_bridge.api.v1.supportRouters import router as support_router
+from future_bridge.api.v1.internalRouters import router as internal_router
 
 # from future_bridge.api.v1.pharmacyRouters import router as pharmacy_router
 
@@ -29,6 +44,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Inside MongoMetricsMiddleware so sampled timings include the request's Mongo totals
+app.add_middleware(RequestTimingMiddleware)
+app.add_middleware(MongoMetricsMiddleware)
+# Per-request pyinstrument profiling (X-Profile header / __profile query parameter), gated like Swagger
+if config.get("Environment") != "Production":
+    app.add_middleware(ProfilingMiddleware)
+# Outermost: compress the final response body (gzip/brotli per Accept-Encoding)
+app.add_middleware(CompressionMiddleware)
 
 # Include routers
 app.include_router(explore_router, prefix="/api/v1/explore")
@@ -37,3 +60,43 @@ app.include_router(user_router, prefix="/api/v1/user")
 app.include_router(payment_router, prefix="/api/v1/payment")
 app.include_router(common_router, prefix="/api/v1/common")
 app.include_router(support_router, prefix="/api/v1/support")
+# Diagnostics (Mongo timings, blocking stacks, profiles) expose internals to any signed-in user, so gated like Swagger
+if config.get("Environment") != "Production":
+    app.include_router(internal_router, prefix="/internal")
+
+
+@app.on_event("startup")
+async def warm_up_instance():
+    # Mongo pool, AAD token, config flags and catalogs; see WARMUP_* settings for blocking vs background steps
+    try:
+        await warmup.start()
+    except Exception as e:
+        logging.error(f"Warm-up failed on startup: {e}", exc_info=True)
+
+
+@app.on_event("startup")
+async def ensure_mongo_indexes():
+    if not settings.ENSURE_INDEXES_ON_STARTUP:
+        return
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        logging.error(f"Failed to ensure MongoDB indexes on startup: {e}", exc_info=True)
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    start_support_metrics_reconciler()
+    start_loop_watchdog()
+
+
+@app.on_event("shutdown")
+async def close_shared_clients():
+    try:
+        await warmup.stop()
+        await stop_loop_watchdog()
+        await stop_support_metrics_reconciler()
+        await close_blob_service_client()
+        await close_email_service()
+    except Exception as e:
+        logging.error(f"Failed to close shared clients on shutdown: {e}", exc_info=True)
@@ -0,0 +1,156 @@
+"""
+Endpoint benchmark: drive the ASGI app in-process with httpx against the
+synthetic data set and report p50/p95/p99 latency, throughput and peak memory
+per endpoint, at one or more data set scales.
+
+Peak memory is measured with tracemalloc in a separate pass after the timed
+requests (tracing slows every allocation down): the high-water mark of Python
+allocations while `--concurrency` requests of the endpoint are in flight, over
+what was allocated before they started. Unlike the process RSS high-water mark
+it is specific to the endpoint and does not carry over from a heavier one.
+
+    python -m future_bridge.perf.benchmark --scale 1x 10x --requests 50 --concurrency 4
+
+By default the app talks to the in-process Mongo stand-in, which measures the
+application side (query shape, Python work, serialization) rather than server
+latency. Pass `--live --database <name>` to run against a database on the
+COSMO_URI server seeded with `python -m future_bridge.perf.syntheticData`.
+
+Needs the dev-only packages `mongomock-motor` and `httpx`:
+
+    pip install -r requirements-dev.txt
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from future_bridge.perf.queryBudget import auth_headers, prepare_stand_in, scenarios
+from future_bridge.perf.syntheticData import parse_scale
+from future_bridge.utils.configFlags import config_flags
+from future_bridge.utils.courseCatalog import course_catalog
+
+async def peak_alloc_mb(call: Callable[[], Awaitable[Any]], concurrency: int) -> float:
+    """
+    Peak of the Python memory allocated while `concurrency` calls run at once,
+    in MB above what was allocated before they started.
+    """
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await asyncio.gather(*(call() for _ in range(concurrency)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(max(peak - baseline, 0) / (1024 * 1024), 2)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def bench_endpoint(http, scenario: Dict[str, Any], headers: Dict[str, str], requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    """
+    Issue `requests` calls of one scenario with at most `concurrency` in flight,
+    then measure its peak memory in a traced pass.
+    """
+    async def call() -> float:
+        started = time.perf_counter()
+        response = await http.request(scenario["method"], scenario["path"], json=scenario.get("json"), headers=headers)
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code >= 500:
+            raise RuntimeError(f"{scenario['name']} failed with {response.status_code}: {response.text[:300]}")
+        return elapsed
+
+    for _ in range(warmup):
+        await call()
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited() -> float:
+        async with semaphore:
+            return await call()
+
+    started = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(limited() for _ in range(requests))))
+    wall = time.perf_counter() - started
+    peak_mb = await peak_alloc_mb(call, concurrency)
+    return {
+        "endpoint": scenario["name"],
+        "route": f"{scenario['method']} {scenario['path']}",
+        "requests": requests,
+        "concurrency": concurrency,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "throughput_rps": round(requests / wall, 2) if wall else None,
+        "peak_alloc_mb": peak_mb,
+    }
+
+
+async def run(scales: List[str], requests: int, concurrency: int, warmup: int, only: Optional[List[str]], live_database: Optional[str] = None) -> List[Dict[str, Any]]:
+    import httpx
+    from future_bridge.config.config import settings
+    from future_bridge.utils.db import get_db
+    from future_bridge.wrapperFunction import app
+
+    if live_database:
+        # Route every repository to the seeded benchmark database
+        settings.DATABASE = live_database
+
+    results = []
+    for scale_name in scales:
+        scale = parse_scale(scale_name)
+        if live_database:
+            db = await get_db()
+            allotment = await db[settings.COLLEGE_CUTOFF_COLLECTION].find_one({"Year": 2024, "Round": 2}, sort=[("GOPENS", 1)])
+            course_catalog.invalidate()
+            config_flags.invalidate()
+            endpoint_requests = scenarios(allotment["Choice_Code"])
+        else:
+            endpoint_requests = await prepare_stand_in(scale)
+        headers = auth_headers()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench.local", timeout=None) as http:
+            for scenario in endpoint_requests:
+                if only and scenario["name"] not in only:
+                    continue
+                result = await bench_endpoint(http, scenario, headers, requests, concurrency, warmup)
+                result["scale"] = scale_name
+                results.append(result)
+                print(
+                    f"{scale_name:>6} {result['endpoint']:<26} p50={result['p50_ms']:>9.2f}ms p95={result['p95_ms']:>9.2f}ms "
+                    f"p99={result['p99_ms']:>9.2f}ms {result['throughput_rps']:>8} req/s peak_alloc={result['peak_alloc_mb']}MB",
+                    flush=True,
+                )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the hot endpoints in-process against synthetic data")
+    parser.add_argument("--scale", nargs="+", default=["1x"], help="Data set sizes: 1x, 10x, 100x or plain multipliers")
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per endpoint")
+    parser.add_argument("--only", nargs="+", help="Endpoint names to run (see queryBudget.scenarios)")
+    parser.add_argument("--live", action="store_true", help="Use the COSMO_URI server instead of the in-process stand-in")
+    parser.add_argument("--database", help="Seeded benchmark database on the COSMO_URI server (required with --live)")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file")
+    args = parser.parse_args()
+    if args.live and not args.database:
+        parser.error("--live requires --database")
+
+    results = asyncio.run(run(args.scale, args.requests, args.concurrency, args.warmup, args.only, args.database if args.live else None))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
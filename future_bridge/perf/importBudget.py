@@ -0,0 +1,110 @@
+"""
+Cold-start harness: import the Azure Functions entry point in fresh interpreters
+under `python -X importtime` and fail when the import takes longer than the
+budget, or when an SDK that is meant to load lazily (on first use) is imported
+at startup.
+
+    python -m future_bridge.perf.importBudget [--budget-ms 2500] [--runs 5] [--top 15]
+
+The same check runs under pytest (tests/test_import_budget.py).
+
+The first run also compiles bytecode, so the fastest run is compared against
+the budget, which is what a warm-disk cold start on the consumption plan pays.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ENTRY_POINT = "future_bridge.wrapperFunction"
+# Directory the entry point is imported from (the Function App root)
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Import time of the entry point (ms, fastest of the runs)
+IMPORT_BUDGET_MS = 2500
+
+# Packages that must only be imported on first use, never while the app loads
+DEFERRED_MODULES = ["msal", "requests", "razorpay", "azure.storage.blob", "aiohttp", "pyinstrument"]
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    # The harness never talks to Azure AD or a database; these only satisfy configuration lookups
+    env.setdefault("Environment", "Development")
+    for name in ("CLIENT_ID", "CLIENT_SECRET", "TENANT_ID"):
+        env.setdefault(name, "import-budget-harness")
+    return env
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` output into (module, self us, cumulative us, depth) tuples.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the column header line
+        name = parts[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return modules
+
+
+def measure_once() -> List[Tuple[str, int, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {ENTRY_POINT}"],
+        capture_output=True,
+        text=True,
+        env=_environment(),
+        cwd=APP_ROOT,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {ENTRY_POINT} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def check(modules: List[Tuple[str, int, int, int]], budget_ms: float) -> List[str]:
+    """
+    Compare one import profile against the budget. Returns a list of violations.
+    """
+    violations = []
+    totals = {name: cumulative for name, _, cumulative, _ in modules}
+    total_ms = totals.get(ENTRY_POINT, 0) / 1000
+    if total_ms > budget_ms:
+        violations.append(f"importing {ENTRY_POINT} took {total_ms:.0f} ms, over the budget of {budget_ms:.0f} ms")
+    for deferred in DEFERRED_MODULES:
+        if deferred in totals:
+            violations.append(f"{deferred} is imported at startup ({totals[deferred] / 1000:.0f} ms); import it on first use instead")
+    return violations
+
+
+def run(budget_ms: float, runs: int, top: int) -> int:
+    profiles = [measure_once() for _ in range(max(1, runs))]
+    totals = [next((cumulative for name, _, cumulative, _ in profile if name == ENTRY_POINT), 0) for profile in profiles]
+    fastest = profiles[totals.index(min(totals))]
+
+    print(f"{ENTRY_POINT}: " + ", ".join(f"{total / 1000:.0f} ms" for total in totals) + f" (budget {budget_ms:.0f} ms)")
+    print(f"\n{'module':<60} {'self ms':>8} {'cumulative ms':>14}")
+    for name, self_us, cumulative_us, _ in sorted(fastest, key=lambda module: -module[1])[:top]:
+        print(f"{name:<60} {self_us / 1000:>8.1f} {cumulative_us / 1000:>14.1f}")
+
+    violations = check(fastest, budget_ms)
+    print()
+    for violation in violations:
+        print(f"FAIL {violation}")
+    if not violations:
+        print("Startup imports are within budget")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the cold-start import time of the Function App entry point")
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS, help="Maximum import time of the entry point")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure; the fastest run is checked")
+    parser.add_argument("--top", type=int, default=15, help="Modules with the highest self time to list")
+    args = parser.parse_args()
+    sys.exit(run(args.budget_ms, args.runs, args.top))
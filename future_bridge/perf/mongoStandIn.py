@@ -0,0 +1,148 @@
+import time
+from typing import Any
+
+from future_bridge.utils import db as db_module
+from future_bridge.utils.mongoMetrics import current_request_stats
+
+# Collection method -> wire command name, so the stand-in reports the same
+# op names as the pymongo CommandListener does against a real server.
+COMMAND_NAMES = {
+    "find": "find",
+    "find_one": "find",
+    "aggregate": "aggregate",
+    "count_documents": "aggregate",
+    "estimated_document_count": "count",
+    "distinct": "distinct",
+    "insert_one": "insert",
+    "insert_many": "insert",
+    "update_one": "update",
+    "update_many": "update",
+    "replace_one": "update",
+    "bulk_write": "update",
+    "delete_one": "delete",
+    "delete_many": "delete",
+    "find_one_and_update": "findAndModify",
+    "find_one_and_replace": "findAndModify",
+    "find_one_and_delete": "findAndModify",
+    "create_index": "createIndexes",
+    "index_information": "listIndexes",
+}
+CURSOR_METHODS = {"find", "aggregate"}
+
+
+def _record(collection: str, op: str, started: float, docs: int) -> None:
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.record(collection, op, (time.perf_counter() - started) * 1000, docs)
+
+
+class CountingCursor:
+    """
+    Cursor wrapper that records one command when the cursor is materialized.
+    """
+
+    def __init__(self, cursor, collection: str, op: str):
+        self._cursor = cursor
+        self._collection = collection
+        self._op = op
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._cursor, name)
+        if not callable(attr):
+            return attr
+
+        def wrapper(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # Chaining methods (sort/limit/skip...) keep returning the wrapper
+            return self if result is self._cursor else result
+        return wrapper
+
+    async def to_list(self, length=None):
+        started = time.perf_counter()
+        docs = await self._cursor.to_list(length)
+        _record(self._collection, self._op, started, len(docs))
+        return docs
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        started = time.perf_counter()
+        docs = 0
+        try:
+            async for doc in self._cursor:
+                docs += 1
+                yield doc
+        finally:
+            _record(self._collection, self._op, started, docs)
+
+
+class CountingCollection:
+    """
+    Collection wrapper that attributes every database call to the current request,
+    mirroring what `MongoCommandListener` does for a real Motor client.
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._collection, name)
+        op = COMMAND_NAMES.get(name)
+        if op is None:
+            return attr
+        collection_name = self._collection.name
+
+        if name in CURSOR_METHODS:
+            def cursor_wrapper(*args, **kwargs):
+                return CountingCursor(attr(*args, **kwargs), collection_name, op)
+            return cursor_wrapper
+
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = await attr(*args, **kwargs)
+            docs = len(result) if isinstance(result, list) else int(result is not None)
+            _record(collection_name, op, started, docs)
+            return result
+        return wrapper
+
+
+class CountingDatabase:
+    def __init__(self, database):
+        self._database = database
+
+    def __getitem__(self, name: str) -> CountingCollection:
+        return CountingCollection(self._database[name])
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._database, name)
+        return CountingCollection(attr) if hasattr(attr, "find_one") else attr
+
+
+class CountingClient:
+    def __init__(self, client):
+        self._client = client
+
+    def __getitem__(self, name: str) -> CountingDatabase:
+        return CountingDatabase(self._client[name])
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def install_mock_client() -> CountingClient:
+    """
+    Point `get_db()` / `get_cj_db()` at an in-process mongomock client wrapped
+    so that every call is counted against the request being served.
+
+    Requires the dev-only `mongomock-motor` package (pip install -r requirements-dev.txt).
+    """
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError as e:
+        raise RuntimeError("mongomock-motor is required for the in-process Mongo stand-in (pip install -r requirements-dev.txt)") from e
+
+    client = CountingClient(AsyncMongoMockClient())
+    db_module.client = client
+    db_module.cj_client = client
+    return client
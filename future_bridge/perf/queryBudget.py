@@ -0,0 +1,154 @@
+"""
+Query-budget harness: run the hot endpoints against an in-process Mongo stand-in
+seeded with synthetic catalogs and fail when an endpoint issues more database
+commands per request than its budget allows, or when its command count grows
+with the size of the data set (the signature of an N+1 query).
+
+    python -m future_bridge.perf.queryBudget [--scales 0.05 0.2]
+
+The same check runs under pytest (tests/test_query_budget.py).
+
+Needs the dev-only packages `mongomock-motor` and `httpx`:
+
+    pip install -r requirements-dev.txt
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+# The harness never talks to Azure AD, Google or a real database; these only
+# satisfy import-time configuration checks of the app.
+os.environ.setdefault("Environment", "Development")
+os.environ.setdefault("LMSTOKEN", "query-budget-harness")
+for _name in ("CLIENT_ID", "CLIENT_SECRET", "TENANT_ID"):
+    os.environ.setdefault(_name, "query-budget-harness")
+
+from future_bridge.config.config import settings
+from future_bridge.perf.mongoStandIn import install_mock_client
+from future_bridge.perf.syntheticData import seed
+from future_bridge.utils.JWTTokenGenrator import create_jwt
+from future_bridge.utils.configFlags import config_flags
+from future_bridge.utils.courseCatalog import course_catalog
+from future_bridge.utils.mongoMetrics import mongo_metrics
+
+HARNESS_EMAIL = "budget.user@example.com"
+
+# Maximum number of Mongo commands a single request may issue. Keyed by the
+# route name reported by MongoMetricsMiddleware ("METHOD /path/template").
+QUERY_BUDGETS: Dict[str, int] = {
+    "POST /api/v1/explore/Quick_College_Scan/": 5,
+    "GET /api/v1/explore/college/{id}": 4,
+    "POST /api/v1/explore/recommendation/college-list": 6,
+    "POST /api/v1/explore/generate/round-list": 8,
+    "POST /api/v1/explore/generate/diploma-round-list": 8,
+    "POST /api/v1/common/store/round_preferences_and_generate_recommendations": 12,
+}
+
+
+def scenarios(choice_code: int) -> List[Dict[str, Any]]:
+    """
+    Requests issued against the budgeted routes; `choice_code` is an existing
+    department of the seeded data used as the previous round's allotment.
+    """
+    return [
+        {"name": "search_by_course_city", "method": "POST", "path": "/api/v1/explore/Quick_College_Scan/", "json": {"course": ["Computer"], "city": ["Pune"]}},
+        {"name": "search_all", "method": "POST", "path": "/api/v1/explore/Quick_College_Scan/", "json": {}},
+        {"name": "college_report", "method": "GET", "path": "/api/v1/explore/college/1000"},
+        {"name": "college_recommendations", "method": "POST", "path": "/api/v1/explore/recommendation/college-list", "json": {"category": "GOPENS", "cet_percentile": 85.5, "cet_course": ["Computer", "IT"], "location": ["Pune", "Mumbai"]}},
+        {"name": "round_recommendations", "method": "POST", "path": "/api/v1/explore/generate/round-list", "json": {"category": "GOPENS", "cet_percentile": 85.5, "cet_course": ["Computer"], "location": ["ALL"], "round": 2, "last_round_college_choice_code": choice_code}},
+        {"name": "diploma_recommendations", "method": "POST", "path": "/api/v1/explore/generate/diploma-round-list", "json": {"category": "GOPENS", "cet_percentile": 78.0, "cet_course": ["Mechanical"], "location": ["ALL"], "round": 1}},
+        {"name": "common_recommendations", "method": "POST", "path": "/api/v1/common/store/round_preferences_and_generate_recommendations", "json": {"exam_type": "BCA_MCA_Int", "branches": ["BCA"], "locations": ["ALL"], "district": "Pune", "gender": "female", "round_no": 1, "category": "GOPENH", "score": 80}},
+    ]
+
+
+def auth_headers() -> Dict[str, str]:
+    token = create_jwt({"email": HARNESS_EMAIL, "exp": int(time.time()) + 3600})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def _run_scenarios(client, headers: Dict[str, str], requests: List[Dict[str, Any]]) -> None:
+    for scenario in requests:
+        response = await client.request(scenario["method"], scenario["path"], json=scenario.get("json"), headers=headers)
+        if response.status_code >= 500:
+            raise RuntimeError(f"{scenario['method']} {scenario['path']} failed with {response.status_code}: {response.text[:300]}")
+
+
+async def prepare_stand_in(scale: float, seed_value: int = 42) -> List[Dict[str, Any]]:
+    """
+    Install a freshly seeded in-process Mongo stand-in and return the scenario
+    requests that match its data.
+    """
+    client = install_mock_client()
+    db = client[settings.DATABASE]
+    await seed(db, scale=scale, seed=seed_value)
+    course_catalog.invalidate()
+    config_flags.invalidate()
+    # The lowest round 2 cutoff as last allotment, so the round list has results at every scale
+    allotment = await db[settings.COLLEGE_CUTOFF_COLLECTION].find_one({"Year": 2024, "Round": 2}, sort=[("GOPENS", 1)])
+    return scenarios(allotment["Choice_Code"])
+
+
+async def measure(scale: float, seed_value: int = 42) -> Dict[str, int]:
+    """
+    Seed a fresh stand-in database at `scale` and return the maximum number of
+    Mongo commands any single request of each budgeted route issued.
+    """
+    import httpx
+    from future_bridge.wrapperFunction import app
+
+    requests = await prepare_stand_in(scale, seed_value)
+    headers = auth_headers()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://budget.local") as http:
+        # Warm-up pass: one-off loads (course catalog, first recommendation upsert) are not per-request cost
+        await _run_scenarios(http, headers, requests)
+        mongo_metrics.reset()
+        await _run_scenarios(http, headers, requests)
+
+    routes = mongo_metrics.snapshot()["routes"]
+    return {
+        route: int(routes.get(route, {}).get("commands_per_request", {}).get("max") or 0)
+        for route in QUERY_BUDGETS
+    }
+
+
+def check(measurements: Dict[float, Dict[str, int]]) -> List[str]:
+    """
+    Compare measurements against QUERY_BUDGETS. Returns a list of violations.
+    """
+    violations = []
+    scales = sorted(measurements)
+    for route, budget in QUERY_BUDGETS.items():
+        counts = [measurements[scale][route] for scale in scales]
+        if not any(counts):
+            violations.append(f"{route}: no requests were recorded")
+            continue
+        if max(counts) > budget:
+            violations.append(f"{route}: {max(counts)} commands per request exceeds the budget of {budget}")
+        if len(set(counts)) > 1:
+            violations.append(f"{route}: command count grows with data size ({' -> '.join(map(str, counts))})")
+    return violations
+
+
+async def run(scales: List[float]) -> int:
+    measurements = {scale: await measure(scale) for scale in scales}
+    print(f"{'route':<80} {'budget':>6} " + " ".join(f"{f'x{scale}':>8}" for scale in sorted(measurements)))
+    for route, budget in QUERY_BUDGETS.items():
+        print(f"{route:<80} {budget:>6} " + " ".join(f"{measurements[scale][route]:>8}" for scale in sorted(measurements)))
+    violations = check(measurements)
+    for violation in violations:
+        print(f"FAIL {violation}")
+    if not violations:
+        print("All endpoints are within their query budget")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check per-endpoint MongoDB query budgets against synthetic data")
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.05, 0.2], help="Data set sizes to compare (1 ~ production size)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.scales)))
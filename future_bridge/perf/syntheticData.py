@@ -0,0 +1,240 @@
+import argparse
+import asyncio
+import random
+from typing import Any, Dict, Iterator, List, Tuple
+
+from future_bridge.config.config import settings
+from future_bridge.utils.courseCatalog import normalize_course_key
+
+# Roughly the shape of the Maharashtra CAP data set at scale 1: ~370 engineering
+# institutes with a handful of branches each, cutoffs for 3 years x 3 rounds.
+BASE_INSTITUTES = 370
+BASE_COMMON_COLLEGES = 150
+SCALES = {"1x": 1, "10x": 10, "100x": 100}
+YEARS = [2022, 2023, 2024]
+ROUNDS = [1, 2, 3]
+
+REGIONS = ["Pune", "Mumbai", "Nagpur", "Nashik", "Aurangabad", "Amravati", "Kolhapur"]
+UNIVERSITIES = {
+    "Savitribai Phule Pune University": ["Pune", "Ahmednagar", "Nashik"],
+    "University of Mumbai": ["Mumbai", "Thane", "Raigad"],
+    "RTM Nagpur University": ["Nagpur", "Wardha", "Bhandara"],
+    "Dr. Babasaheb Ambedkar Marathwada University": ["Aurangabad", "Jalna", "Beed"],
+    "Sant Gadge Baba Amravati University": ["Amravati", "Akola", "Yavatmal"],
+    "Shivaji University": ["Kolhapur", "Sangli", "Satara"],
+}
+ENGINEERING_COURSES = [
+    "Computer Engineering",
+    "Computer Science and Engineering",
+    "Information Technology",
+    "Electronics and Telecommunication Engineering",
+    "Artificial Intelligence and Data Science",
+    "Artificial Intelligence and Machine Learning",
+    "Mechanical Engineering",
+    "Civil Engineering",
+    "Electrical Engineering",
+    "Chemical Engineering",
+]
+COMMON_COURSES = {
+    settings.BCA_COLLEGE_CUTOFF_COLLECTION: ["BCA", "MCA Integrated"],
+    settings.BBA_COLLEGE_CUTOFF_COLLECTION: ["BBA", "BMS", "BBM", "MBA Integrated"],
+    settings.PHARMACY_COLLEGE_CUTOFF_COLLECTION: ["B. Pharmacy", "D. Pharmacy"],
+}
+CET_CATEGORIES = [
+    "GOPENS", "GSCS", "GSTS", "GVJS", "GNT1S", "GNT2S", "GNT3S", "GOBCS",
+    "LOPENS", "LSCS", "LNT2S", "LOBCS", "DEFOPENS", "TFWS", "DEFROBCS", "EWS",
+]
+COMMON_CATEGORY_ROOTS = ["OPEN", "SC", "ST", "OBC"]
+SEEDED_COLLECTIONS = [
+    settings.INSTIUTE_META_COLLECTION,
+    settings.DEPARTMENT_META_COLLECTION,
+    settings.COLLEGE_CUTOFF_COLLECTION,
+    settings.DIPLOMA_COLLEGE_CUTOFF_COLLECTION,
+    settings.PROVISIONAL_VACANT_SEAT_COLLECTION,
+    settings.UNIVERSITY_MAPPING,
+    settings.CONFIG_COLLECTION,
+    *COMMON_COURSES,
+]
+
+
+def _percentile(rng: random.Random, base: float) -> float:
+    return round(min(99.99, max(1.0, rng.gauss(base, 6))), 4)
+
+
+def _cet_categories(rng: random.Random, base: float) -> Dict[str, float]:
+    # Reserved categories close a little below the open cutoff
+    return {category: _percentile(rng, base - (0 if category in ("GOPENS", "TFWS") else rng.uniform(2, 15))) for category in CET_CATEGORIES}
+
+
+def institute_count(scale: float) -> int:
+    return max(1, int(BASE_INSTITUTES * scale))
+
+
+def iter_engineering(rng: random.Random, scale: float, diploma: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (collection name, document) pairs for institute_meta, department_meta,
+    the CET (or diploma) cutoffs and, for CET, the round 2 provisional vacant seats.
+    Diploma institute codes follow the CET ones so both can live in one database.
+    """
+    cutoff_collection = settings.DIPLOMA_COLLEGE_CUTOFF_COLLECTION if diploma else settings.COLLEGE_CUTOFF_COLLECTION
+    code_offset = 1000 + (institute_count(scale) if diploma else 0)
+    for i in range(institute_count(scale)):
+        sj_code = code_offset + i
+        region = REGIONS[i % len(REGIONS)]
+        college_name = f"{'Government Polytechnic' if diploma else 'Institute of Technology'} {region} {i}"
+        base = rng.uniform(40, 99)
+        yield settings.INSTIUTE_META_COLLECTION, {
+            "SJ_Institute_Code": sj_code,
+            "College_Code": sj_code,
+            "College_Name": college_name,
+            "College_Type": rng.choice(["Government", "Autonomous", "Private", "Government Aided"]),
+            "City": region,
+            "Region": region,
+            "College_Address": f"{i} Main Road, {region}",
+            "University_Affiliation": next(name for name, districts in UNIVERSITIES.items() if region in districts),
+            "Annual_Fees_(INR)": rng.randrange(40000, 250000, 1000),
+            "Student_Intake": rng.randrange(120, 1200, 60),
+            "College_Reviews_out_of_5": round(rng.uniform(2.5, 5), 1),
+            "Overall_College_Placement_Percentage": round(rng.uniform(30, 98), 1),
+            "Previous_Year_Highest_Package_Offered_LPA": round(rng.uniform(4, 45), 1),
+            "College_Hostel_Available": rng.choice(["Yes", "No"]),
+            "College_Bus_Facility_Available": rng.choice(["Yes", "No"]),
+            "Established_Year": rng.randint(1950, 2015),
+        }
+        for course_name in rng.sample(ENGINEERING_COURSES, rng.randint(3, 6)):
+            choice_code = sj_code * 100 + ENGINEERING_COURSES.index(course_name)
+            yield settings.DEPARTMENT_META_COLLECTION, {
+                "SJ_Institute_Code": sj_code,
+                "College_Name": college_name,
+                "Choice_Code": choice_code,
+                "Courses_Offered": course_name,
+                "Common_Name": course_name,
+                "NBA_Accredited": rng.choice(["Yes", "No"]),
+                "Placement_Percentage": round(rng.uniform(20, 99), 1),
+                "Student_Intake": rng.randrange(60, 240, 30),
+            }
+            if not diploma and rng.random() < 0.4:
+                yield settings.PROVISIONAL_VACANT_SEAT_COLLECTION, {"choice_code": choice_code, "round": 2}
+            for year in YEARS:
+                for round_no in ROUNDS:
+                    yield cutoff_collection, {
+                        "SJ_Institute_Code": sj_code,
+                        "College_Name": college_name,
+                        "Choice_Code": choice_code,
+                        "Course_Name": course_name,
+                        "course_key": normalize_course_key(course_name),
+                        "Region": region,
+                        "Year": year,
+                        "Round": round_no,
+                        **_cet_categories(rng, base - 2 * (round_no - 1)),
+                    }
+
+
+def iter_common(rng: random.Random, scale: float, collection_name: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield cutoff documents for one of the BCA / BBA / Pharmacy ("common") exam types.
+    """
+    districts = [district for district_list in UNIVERSITIES.values() for district in district_list]
+    for i in range(max(1, int(BASE_COMMON_COLLEGES * scale))):
+        district = districts[i % len(districts)]
+        college_code = f"{collection_name[:3].upper()}{i:05d}"
+        base = rng.uniform(30, 99)
+        for j, course_name in enumerate(COMMON_COURSES[collection_name]):
+            for round_no in ROUNDS:
+                doc = {
+                    "College Name": f"College of Management {district} {i}",
+                    "College Code": college_code,
+                    "Course Name": course_name,
+                    "Course Code": f"{college_code}{j:02d}",
+                    "City": district,
+                    "District": district,
+                    "Year": 2024,
+                    "Round": round_no,
+                }
+                for root in COMMON_CATEGORY_ROOTS:
+                    for level in ("H", "O", "S"):
+                        doc[f"G{root}{level}"] = _percentile(rng, base - 2 * (round_no - 1))
+                        doc[f"L{root}{level}"] = _percentile(rng, base - 2 * (round_no - 1) - 1)
+                yield collection_name, doc
+
+
+def iter_documents(scale: float = 1, seed: int = 42) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield the whole deterministic synthetic data set as (collection name, document) pairs,
+    so even the 100x data set can be loaded without materializing it in memory.
+
+    Args:
+        scale: Multiplier on the number of institutes / colleges (1 ~ current production size).
+        seed: Random seed; the same (scale, seed) always yields the same documents.
+    """
+    rng = random.Random(seed)
+    yield from iter_engineering(rng, scale)
+    yield from iter_engineering(rng, scale, diploma=True)
+    for university, districts in UNIVERSITIES.items():
+        for district in districts:
+            yield settings.UNIVERSITY_MAPPING, {"University": university, "District": district}
+    yield settings.CONFIG_COLLECTION, {"accept_payment": True}
+    for collection_name in COMMON_COURSES:
+        yield from iter_common(rng, scale, collection_name)
+
+
+def generate(scale: float = 1, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build the synthetic data set in memory, keyed by collection name.
+    """
+    data: Dict[str, List[Dict[str, Any]]] = {}
+    for collection_name, doc in iter_documents(scale, seed):
+        data.setdefault(collection_name, []).append(doc)
+    return data
+
+
+async def seed(db, scale: float = 1, seed: int = 42, drop: bool = True, batch_size: int = 5000) -> Dict[str, int]:
+    """
+    Load the synthetic data set into `db` (a Motor database or an in-process stand-in)
+    in `insert_many` batches. Returns the number of inserted documents per collection.
+    """
+    if drop:
+        for collection_name in SEEDED_COLLECTIONS:
+            await db[collection_name].delete_many({})
+
+    counts: Dict[str, int] = {}
+    batches: Dict[str, List[Dict[str, Any]]] = {}
+    for collection_name, doc in iter_documents(scale, seed):
+        batch = batches.setdefault(collection_name, [])
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await db[collection_name].insert_many(batch)
+            counts[collection_name] = counts.get(collection_name, 0) + len(batch)
+            batches[collection_name] = []
+    for collection_name, batch in batches.items():
+        if batch:
+            await db[collection_name].insert_many(batch)
+            counts[collection_name] = counts.get(collection_name, 0) + len(batch)
+    return counts
+
+
+def parse_scale(value: str) -> float:
+    """
+    Accept a named scale ("1x", "10x", "100x") or a plain multiplier ("0.5").
+    """
+    return SCALES[value] if value in SCALES else float(value.rstrip("x"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load the synthetic Maharashtra-scale data set into MongoDB")
+    parser.add_argument("--scale", default="1x", help="1x, 10x, 100x or a plain multiplier")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", required=True, help="Target database name; must not be the application database")
+    parser.add_argument("--keep", action="store_true", help="Append instead of clearing the seeded collections first")
+    args = parser.parse_args()
+    if args.database in (settings.DATABASE, settings.CJ_DATABASE):
+        parser.error("refusing to seed synthetic data into the application database")
+
+    async def _main():
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(settings.DATABASE_URL, serverSelectionTimeoutMS=5000)
+        counts = await seed(client[args.database], scale=parse_scale(args.scale), seed=args.seed, drop=not args.keep)
+        for collection_name, count in sorted(counts.items()):
+            print(f"{collection_name}: {count}")
+
+    asyncio.run(_main())
@@ -1,6 +1,5 @@
 from calendar import c
 import logging
-from this import d
 
 from fastapi import Query
 from future_bridge.utils.db import get_db,get_cj_db
@@ -8,9 +7,11 @@ from future_bridge.config.config import settings
 from future_bridge.models.commonModel import OTPValidator,CollegeConfigurationRequest,RoundPreferencesRequest,CollegeRoundPrefrence
 from future_bridge.schema.recommendationSchema import CollegeRecommendationGroupResponse
 from collections import defaultdict
+from future_bridge.utils.requestTiming import timed_methods
 
 
 
+@timed_methods("repository")
 class OTPValidatorRepo:
     """
     Used for performing operations on test_questionSet collection in the database.
@@ -65,6 +66,7 @@ class OTPValidatorRepo:
         }
 
 
+@timed_methods("repository")
 class CommonRepo:
     async def store_college_config(self, college_config: CollegeConfigurationRequest,email:str):
         db = await get_db()
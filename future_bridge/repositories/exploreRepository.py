@@ -8,13 +8,32 @@ import math  # Ensure math is imported for isnan and isinf functions
 from motor.motor_asyncio import AsyncIOMotorClient
 from typing import Dict, List, Optional, Any, final
 from future_bridge.models.userModel import DiplomaUserConfig
+from future_bridge.utils.courseCatalog import course_catalog, normalize_course_key
+from future_bridge.utils.requestTiming import timed_methods
 
+# CET category columns considered for a college's latest cutoff range
+CET_SCORE_FIELDS = [
+    "GOPENS", "GSCS", "GSTS", "GVJS",
+    "GNT1S", "GNT2S", "GNT3S", "GOBCS",
+    "LOPENS", "LSCS", "LNT2S", "LOBCS",
+    "DEFOPENS", "TFWS", "DEFROBCS", "EWS"
+]
+# department_meta fields used by the search summaries (course list, placement range, course filter)
+SEARCH_DEPARTMENT_PROJECTION = {"_id": 0, "SJ_Institute_Code": 1, "Common_Name": 1, "Courses_Offered": 1, "Placement_Percentage": 1}
+SEARCH_CUTOFF_PROJECTION = {"_id": 0, "SJ_Institute_Code": 1, "Year": 1, **{field: 1 for field in CET_SCORE_FIELDS}}
+
+
+@timed_methods("repository")
 class ExploreRepository:
 
-    async def search_colleges(self, college_names: Optional[List[str]] = None, courses: Optional[List[str]] = None, cities: Optional[List[str]] = None, sort_by: Optional[str] = None, order: Optional[str] = None, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def search_colleges(self, college_names: Optional[List[str]] = None, courses: Optional[List[str]] = None, cities: Optional[List[str]] = None, sort_by: Optional[str] = None, order: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, int]] = None, with_departments: bool = True, with_cutoffs: bool = True) -> Dict[str, Any]:
         """
         Searches for colleges based on search parameters and additional filters, supports multiple cities, colleges, and courses.
         Returns only the highest GOPENS CET cutoff for the latest year for each college.
+
+        `projection` limits the institute_meta fields read (the fields the search itself needs are
+        always included); departments and cutoffs are only fetched when the caller needs them
+        (departments always are when filtering by course).
         """
         try:
             db = await get_db()
@@ -66,7 +85,34 @@ class ExploreRepository:
             
             query = {"$and": query_conditions} if query_conditions else {}
             all_cities = await institute_collection.distinct("Region")
-            total_records = await institute_collection.count_documents(query)
+
+            # Build sort criteria for database-level sorting
+            sort_criteria = None
+            if sort_by:
+                sort_direction = 1 if order and order.lower() == "asc" else -1
+                sort_mapping = {
+                    "placement_percentage": "Overall_College_Placement_Percentage",
+                    "fees": "Annual_Fees_(INR)",
+                    "rating": "College_Reviews_out_of_5",
+                    "name": "College_Name"
+                }
+                
+                db_field = sort_mapping.get(sort_by.lower())
+                if db_field:
+                    sort_criteria = [(db_field, sort_direction)]
+            
+            if projection is not None:
+                projection = {**projection, "SJ_Institute_Code": 1, "College_Name": 1, "Region": 1}
+
+            # Execute query with database-level sorting
+            if sort_criteria:
+                colleges_cursor = institute_collection.find(query, projection).sort(sort_criteria)
+            else:
+                colleges_cursor = institute_collection.find(query, projection)
+            
+            # The full result set is fetched anyway, so its length is the total (no separate count round trip)
+            colleges_list = await colleges_cursor.to_list(length=None)
+            total_records = len(colleges_list)
             
             if total_records == 0:
                 logging.warning("No college data found for the given search criteria")
@@ -89,34 +135,30 @@ class ExploreRepository:
                     "error_type": "no_results"
                 }
             
-            # Build sort criteria for database-level sorting
-            sort_criteria = None
-            if sort_by:
-                sort_direction = 1 if order and order.lower() == "asc" else -1
-                sort_mapping = {
-                    "placement_percentage": "Overall_College_Placement_Percentage",
-                    "fees": "Annual_Fees_(INR)",
-                    "rating": "College_Reviews_out_of_5",
-                    "name": "College_Name"
-                }
-                
-                db_field = sort_mapping.get(sort_by.lower())
-                if db_field:
-                    sort_criteria = [(db_field, sort_direction)]
-            
-            # Execute query with database-level sorting
-            if sort_criteria:
-                colleges_cursor = institute_collection.find(query).sort(sort_criteria)
-            else:
-                colleges_cursor = institute_collection.find(query)
-            
-            colleges_list = await colleges_cursor.to_list(length=None)
             result_colleges = []
+
+            # Expand the requested courses into indexed course keys once for all colleges
+            course_keys = await course_catalog.expand(settings.COLLEGE_CUTOFF_COLLECTION, courses) if courses else []
+
+            # Fetch departments and cutoffs for all matched colleges in one query each
+            # instead of two queries per college, then group them in memory
+            sj_codes = list({college.get("SJ_Institute_Code") for college in colleges_list})
+            departments_by_college: Dict[Any, List[dict]] = {}
+            if with_departments or courses:
+                async for dept in department_collection.find({"SJ_Institute_Code": {"$in": sj_codes}}, SEARCH_DEPARTMENT_PROJECTION):
+                    departments_by_college.setdefault(dept.get("SJ_Institute_Code"), []).append(dept)
+
+            cutoff_query = {"SJ_Institute_Code": {"$in": sj_codes}}
+            if courses:
+                cutoff_query["course_key"] = {"$in": course_keys}
+            cutoffs_by_college: Dict[Any, List[dict]] = {}
+            if with_cutoffs:
+                async for doc in cutoff_collection.find(cutoff_query, SEARCH_CUTOFF_PROJECTION):
+                    cutoffs_by_college.setdefault(doc.get("SJ_Institute_Code"), []).append(doc)
             
             for college in colleges_list:
                 college_dict = dict(college)
-                department_query = {"SJ_Institute_Code":  college.get("SJ_Institute_Code")}
-                all_departments = await department_collection.find(department_query).to_list(length=None)
+                all_departments = departments_by_college.get(college.get("SJ_Institute_Code"), [])
                 
                 if courses:
                     course_departments = []
@@ -137,25 +179,12 @@ class ExploreRepository:
                 college_dict["Region"] = college.get('Region',None)
 
 
-                # Fetch all cutoff docs for this college, get latest year, then max GOPENS for that year
-                cutoff_query = {"SJ_Institute_Code": college.get("SJ_Institute_Code")}
-                if courses:
-                    cutoff_query["$or"] = [{"Course_Name": {"$regex": course, "$options": "i"}} for course in courses]
-
-                # Find all cutoffs for this college
-                cutoff_docs = await cutoff_collection.find(cutoff_query).to_list(length=None)
+                # All cutoff docs for this college, get latest year, then max GOPENS for that year
+                cutoff_docs = cutoffs_by_college.get(college.get("SJ_Institute_Code"), [])
                 latest_year = None
                 max_score = None
                 min_score = None
 
-                # Score fields to evaluate
-                score_fields = [
-                    "GOPENS", "GSCS", "GSTS", "GVJS",
-                    "GNT1S", "GNT2S", "GNT3S", "GOBCS",
-                    "LOPENS", "LSCS", "LNT2S", "LOBCS",
-                    "DEFOPENS", "TFWS", "DEFROBCS", "EWS"
-                ]
-
                 if cutoff_docs:
                     # Find the latest year
                     years = [doc.get("Year") for doc in cutoff_docs if doc.get("Year") is not None]
@@ -165,7 +194,7 @@ class ExploreRepository:
                         latest_year_docs = [doc for doc in cutoff_docs if doc.get("Year") == latest_year]
                         all_scores = []
                         for doc in latest_year_docs:
-                            for field in score_fields:
+                            for field in CET_SCORE_FIELDS:
                                 val = doc.get(field)
                                 try:
                                     score = float(val)
@@ -199,10 +228,10 @@ class ExploreRepository:
                 "total_records": 0
             }
 
-    async def get_institute_meta_by_sj_code(self, sj_code: int, locations: Optional[list[str]] = None) -> dict:
+    async def get_institute_meta_by_sj_code(self, sj_code: int, locations: Optional[list[str]] = None, projection: Optional[Dict[str, int]] = None) -> dict:
         """
         Fetch all data for institute_meta using SJ_Institute_Code and optionally filter by City if locations is provided and non-empty.
-        Returns the full document with {'_id': 0}.
+        Returns the full document with {'_id': 0}, or only the fields of `projection` when given.
         """
         try:
             db = await get_db()
@@ -217,7 +246,7 @@ class ExploreRepository:
                 }
             else:
                 query = {"SJ_Institute_Code": sj_code}
-            result = await institute_collection.find_one(query, {"_id": 0})
+            result = await institute_collection.find_one(query, projection or {"_id": 0})
             if not result:
                 raise LookupError(f"No institute found with SJ_Institute_Code: {sj_code}" + (f" and City in {locations}" if locations else ""))
             return result
@@ -228,6 +257,35 @@ class ExploreRepository:
             logging.error(f"Error fetching institute_meta by SJ_Institute_Code: {e}")
             raise Exception(f"Database error while fetching institute data: {str(e)}")
 
+    async def get_institute_meta_by_sj_codes(self, sj_codes: List[int], locations: Optional[list[str]] = None, projection: Optional[Dict[str, int]] = None) -> Dict[int, dict]:
+        """
+        Batch variant of `get_institute_meta_by_sj_code`: fetch institute_meta for many SJ_Institute_Codes in one query.
+        Returns a mapping of SJ_Institute_Code -> document (with {'_id': 0}, or only the fields of `projection`);
+        codes that do not match (or are outside the requested locations) are simply absent from the mapping.
+        """
+        try:
+            if not sj_codes:
+                return {}
+            db = await get_db()
+            institute_collection = db[settings.INSTIUTE_META_COLLECTION]
+            query = {"SJ_Institute_Code": {"$in": list(set(sj_codes))}}
+            if locations is not None and len(locations) > 0 and not "ALL" in locations:
+                query = {
+                    "$and": [
+                        query,
+                        {"$or": [{"Region": {"$regex": loc, "$options": "i"}} for loc in locations]}
+                    ]
+                }
+            result = {}
+            if projection is not None:
+                projection = {**projection, "SJ_Institute_Code": 1}
+            async for doc in institute_collection.find(query, projection or {"_id": 0}):
+                result.setdefault(doc.get("SJ_Institute_Code"), doc)
+            return result
+        except Exception as e:
+            logging.error(f"Error fetching institute_meta by SJ_Institute_Codes: {e}")
+            raise Exception(f"Database error while fetching institute data: {str(e)}")
+
     async def get_departments_by_college_name(self, sj_code: int) -> list:
         """
         Fetch all department_meta documents for a given college name.
@@ -252,9 +310,12 @@ class ExploreRepository:
             cutoff_collection = db[settings.COLLEGE_CUTOFF_COLLECTION]
             
             # Find cutoff data for the specific college and course
+            course_keys = await course_catalog.expand(settings.COLLEGE_CUTOFF_COLLECTION, [course_name])
+            if not course_keys:
+                raise LookupError(f"No cutoff data found for college '{sj_institute_id}' and course '{course_name}'")
             query = {
                 "SJ_Institute_Code": sj_institute_id,
-                "Course_Name": {"$regex": course_name, "$options": "i"}
+                "course_key": {"$in": course_keys}
             }
             
             # Get all cutoff data for this college and course, sorted by year descending
@@ -322,12 +383,13 @@ class ExploreRepository:
         try:
             db = await get_db()
 
-            # Escape course_name to make it regex-safe
-            safe_course_name = re.escape(course_name)
+            course_keys = await course_catalog.expand(settings.COLLEGE_CUTOFF_COLLECTION, [course_name])
+            if not course_keys:
+                return None
 
             query = {
                 "SJ_Institute_Code": sj_code,
-                "Course_Name": {"$regex": safe_course_name, "$options": "i"}
+                "course_key": {"$in": course_keys}
             }
 
             cursor = db[settings.COLLEGE_CUTOFF_COLLECTION].find(query, {"_id": 0}).sort("Year", -1).limit(1)
@@ -340,6 +402,35 @@ class ExploreRepository:
             logging.error(f"Error fetching cutoff by college and course: {e}")
             raise Exception(f"Database error while fetching cutoff: {str(e)}")
 
+    async def get_latest_cutoffs_by_courses(self, sj_code: int, course_names: List[str]) -> Dict[str, Optional[dict]]:
+        """
+        Batch variant of `get_cutoff_by_college_name_and_course` for a college report: fetch every cutoff
+        of the college once and pick, for each course name, the latest-year document whose course key matches.
+        Returns a mapping of course name -> full cutoff document (or None when there is no cutoff).
+        """
+        try:
+            db = await get_db()
+            keys_by_course = {}
+            for course_name in course_names:
+                keys_by_course[course_name] = set(await course_catalog.expand(settings.COLLEGE_CUTOFF_COLLECTION, [course_name]))
+            all_keys = set().union(*keys_by_course.values()) if keys_by_course else set()
+            if not all_keys:
+                return {course_name: None for course_name in course_names}
+
+            query = {
+                "SJ_Institute_Code": sj_code,
+                "course_key": {"$in": sorted(all_keys)}
+            }
+            cutoff_docs = await db[settings.COLLEGE_CUTOFF_COLLECTION].find(query, {"_id": 0}).sort("Year", -1).to_list(length=None)
+
+            result = {}
+            for course_name, course_keys in keys_by_course.items():
+                result[course_name] = next((doc for doc in cutoff_docs if doc.get("course_key") in course_keys), None)
+            return result
+        except Exception as e:
+            logging.error(f"Error fetching cutoffs by college and courses: {e}")
+            raise Exception(f"Database error while fetching cutoff: {str(e)}")
+
     async def get_all_cutoff_data(self) -> List[dict]:
         """
         For each college and each department (course), return only the cutoff data for the latest year for that department, excluding College_Name.
@@ -378,13 +469,16 @@ class ExploreRepository:
                 cutoff_collection = db[settings.DIPLOMA_COLLEGE_CUTOFF_COLLECTION]
             else:
                 cutoff_collection = db[settings.COLLEGE_CUTOFF_COLLECTION]
-            # For partial (substring) matches for each course, use $or with regex
+            # Partial (substring) course matches are expanded in memory into course keys
+            if courses and not "ALL" in courses:
+                course_keys = await course_catalog.expand(cutoff_collection.name, courses)
+                if not course_keys:
+                    return []
             if courses and locations and not "ALL" in courses and not "ALL" in locations:
-                course_regex_or = [{"Course_Name": {"$regex": course, "$options": "i"}} for course in courses]
                 location_regex_or = [{"Region": {"$regex": loc, "$options": "i"}} for loc in locations]
                 query = {
                     "$and": [
-                        {"$or": course_regex_or},
+                        {"course_key": {"$in": course_keys}},
                         {"$or": location_regex_or},
                         {"Year":2024},
                         {"Round":round_no},
@@ -392,10 +486,9 @@ class ExploreRepository:
                     ]
                 }
             elif courses and not "ALL" in courses:
-                course_regex_or = [{"Course_Name": {"$regex": course, "$options": "i"}} for course in courses]
                 query = {
                     "$and": [
-                        {"$or": course_regex_or},
+                        {"course_key": {"$in": course_keys}},
                         {"Year":2024},
                         {"Round":round_no},
                         {category: {"$ne": None}}
@@ -460,7 +553,7 @@ class ExploreRepository:
 
             cutoff_query = {
                 "SJ_Institute_Code": sj_code,
-                "Course_Name":  {"$in":[course_name,course_name.upper(),course_name.lower(),course_name.title()]},
+                "course_key": normalize_course_key(course_name),
                 "Year": 2024,
                 "Round": round
             }
@@ -490,16 +583,19 @@ class ExploreRepository:
                 cutoff_collection = db[settings.DIPLOMA_COLLEGE_CUTOFF_COLLECTION]
             else:
                 cutoff_collection = db[settings.COLLEGE_CUTOFF_COLLECTION]
-            # For partial (substring) matches for each course, use $or with regex         
+            # Partial (substring) course matches are expanded in memory into course keys
+            if courses and not "ALL" in courses:
+                course_keys = await course_catalog.expand(cutoff_collection.name, courses)
+                if not course_keys:
+                    return []
             if round_no==2 and not diploma:
                 provisional_vacant_seat= db[settings.PROVISIONAL_VACANT_SEAT_COLLECTION]
                 vacant_codes=await provisional_vacant_seat.distinct('choice_code', {'round': 2})
             if courses and locations and not "ALL" in courses and not "ALL" in locations:
-                course_regex_or = [{"Course_Name": {"$regex": course, "$options": "i"}} for course in courses]
                 location_regex_or = [{"Region": {"$regex": loc, "$options": "i"}} for loc in locations]
                 query = {
                     "$and": [
-                        {"$or": course_regex_or},
+                        {"course_key": {"$in": course_keys}},
                         {"$or": location_regex_or},
                         {"Year":2024},
                         {"Round":round_no},
@@ -509,10 +605,9 @@ class ExploreRepository:
                 if vacant_codes:
                     query["$and"].append({"Choice_Code": {"$in": vacant_codes}})
             elif courses and not "ALL" in courses:
-                course_regex_or = [{"Course_Name": {"$regex": course, "$options": "i"}} for course in courses]
                 query = {
                     "$and": [
-                        {"$or": course_regex_or},
+                        {"course_key": {"$in": course_keys}},
                         {"Year":2024},
                         {"Round":round_no},
                         {category: {"$gte": last_year_cutoff}}
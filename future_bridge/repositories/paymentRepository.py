@@ -2,7 +2,10 @@ import logging
 from future_bridge.utils.db import get_db
 from future_bridge.config.config import settings
 from future_bridge.models.razorPayModel import RazorPay
+from future_bridge.utils.configFlags import config_flags
+from future_bridge.utils.requestTiming import timed_methods
 
+@timed_methods("repository")
 class PaymentRepository:
     async def findUserPaymentOrOrderStatus(self, username: str):
         """
@@ -86,7 +89,7 @@ class PaymentRepository:
         """
         db = await get_db()
         document = await db[settings.USER_PAYMENT_COLLECTION].find_one({"order_id": order_id})
-        logging.info(document)
+        logging.debug(f"Payment document for order {order_id} found: {document is not None}")
         return document
     
     async def is_valid_order_id(self, order_id: str) -> bool:
@@ -139,8 +142,7 @@ class PaymentRepository:
 
     async def get_accept_payment_from_config(self) -> bool:
         """
-        Fetches the 'accept_payment' boolean from the config collection.
+        Fetches the 'accept_payment' boolean from the config collection
+        (served from the in-memory config flags, see utils/configFlags.py).
         """
-        db = await get_db()
-        config_doc = await db[settings.CONFIG_COLLECTION].find_one({"accept_payment": {"$exists": True}})
-        return bool(config_doc and config_doc.get("accept_payment"))
\ No newline at end of file
+        return bool(await config_flags.get("accept_payment"))
\ No newline at end of file
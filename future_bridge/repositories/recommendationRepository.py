@@ -5,7 +5,9 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional
 from future_bridge.schema.recommendationSchema import RecommendationRequest,CollegeRecommendationGroupResponse
 from typing import Optional, List, Dict, Any
+from future_bridge.utils.requestTiming import timed_methods
 
+@timed_methods("repository")
 class RecommendationRepository:
     
     
@@ -82,9 +84,10 @@ class RecommendationRepository:
             "acknowledged": result.acknowledged
         }
 
-    async def get_college_recommendations_by_email(self, email: str,round:int=1,diploma:bool=False) -> Optional[CollegeRecommendationGroupResponse]:
+    async def get_college_recommendations_by_email(self, email: str,round:int=1,diploma:bool=False,projection:Optional[Dict[str, int]]=None) -> Optional[CollegeRecommendationGroupResponse]:
         """
         Fetch college recommendations for a user by email.
+        With `projection`, only those fields of the stored document are read.
         """
         db = await get_db()
         if diploma:
@@ -93,7 +96,7 @@ class RecommendationRepository:
         else:
             collection = db[settings.RECOMMENDATIONS_COLLECTION]
             query = {"username": email}
-        doc = await collection.find_one(query)
+        doc = await collection.find_one(query, projection)
         if doc:
             return CollegeRecommendationGroupResponse(**doc)
         return None
\ No newline at end of file
@@ -2,15 +2,50 @@ import asyncio
 from datetime import datetime, timedelta, timezone
 import logging
 
-from pymongo import ReturnDocument
+from pymongo import DeleteMany, ReturnDocument, UpdateMany
+from pymongo.errors import DuplicateKeyError
 from future_bridge.models.supportModel import BulkAction, Support, TicketStatus
 from future_bridge.utils.db import get_db
 from future_bridge.config.config import settings
-from typing import Dict, Any, List, Optional
+from future_bridge.config.indexes import COMMENT_BUCKET_INDEX
+from future_bridge.utils.countCache import CachedCounts
+from future_bridge.utils.sequenceAllocator import BlockSequenceAllocator
+from future_bridge.utils.pagination import decode_cursor, encode_cursor, keyset_filter, parse_sort
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional
 from pydantic import EmailStr
+from future_bridge.utils.requestTiming import timed_methods
 
 # Define IST timezone (UTC +5:30)
 IST = timezone(timedelta(hours=5, minutes=30))
+
+# Sort fields backed by a (field, _id) index in config/indexes.py
+TICKET_SORT_FIELDS = ["created_at", "ticket_id"]
+
+# Documents fetched per round trip when streaming an export
+EXPORT_BATCH_SIZE = 500
+
+# Fields of the /my_tickets summary (comment_count is derived)
+USER_TICKET_SUMMARY_FIELDS = ["ticket_id", "status", "created_at", "last_activity_at", "last_comment_by", "product_type", "is_paid"]
+
+# Searchable ticket fields and their ranking weights (comment text weighs SEARCH_COMMENT_WEIGHT)
+SEARCH_FIELD_WEIGHTS = {"ticket_id": 4, "name": 2, "username": 2, "details": 1}
+SEARCH_COMMENT_WEIGHT = 1
+text_indexes_ready = False
+comment_bucket_index_ready = False
+
+# _id of the single counter document in SUPPORT_METRICS_COLLECTION
+SUPPORT_METRICS_ID = "support_tickets"
+
+# Process-wide ticket ID sequence (see SUPPORT_TICKET_ID_* settings)
+ticket_id_allocator = BlockSequenceAllocator(
+    "support_ticket",
+    block_size=settings.SUPPORT_TICKET_ID_BLOCK_SIZE if settings.SUPPORT_TICKET_ID_ALLOW_GAPS else 1,
+)
+
+# Process-wide ticket list totals, shared by every repository instance
+ticket_counts = CachedCounts()
+
+@timed_methods("repository")
 class SupportRepository:
     """
     Repository layer for interacting with MongoDB `support_issues` collection.
@@ -21,17 +56,11 @@ class SupportRepository:
     @staticmethod
     async def generate_ticket_id(db) -> str:
         """
-        Generate a unique, sequential ticket ID with prefix FB-XXXXX.
-        Uses an atomic counter in MongoDB to ensure uniqueness.
+        Generate a unique ticket ID with prefix FB-XXXXX.
+        IDs come from blocks reserved on an atomic counter in MongoDB, so only
+        one ticket per block touches the counter document.
         """
-        counter_collection = db["ticket_counters"]
-        result = await counter_collection.find_one_and_update(
-            {"_id": "support_ticket"},
-            {"$inc": {"seq": 1}},
-            upsert=True,
-            return_document=ReturnDocument.AFTER
-        )
-        seq_num = result.get("seq", 1)
+        seq_num = await ticket_id_allocator.next(db)
         return f"FB-{seq_num:05d}"
 
     async def store_user_tickets(self, user_ticket: Support) -> Dict[str, Any]:
@@ -88,6 +117,9 @@ class SupportRepository:
 
             # Convert model to dict for insertion
             user_ticket_dict = user_ticket.model_dump()
+            # New tickets never had embedded comments, so their sequence starts at 0
+            user_ticket_dict["comment_count"] = 0
+            user_ticket_dict["legacy_comment_count"] = 0
 
             support_collection = db[settings.SUPPORT_ISSUES_COLLECTION]
 
@@ -103,6 +135,13 @@ class SupportRepository:
                 # Convert ObjectId to string for JSON serialization
                 inserted_doc["_id"] = str(inserted_doc["_id"])
 
+            await self._inc_support_metrics(
+                db,
+                total=1,
+                paid=1 if user_ticket.is_paid else 0,
+                statuses={user_ticket.status.value: 1},
+            )
+            ticket_counts.expire()
             logging.info(f"User ticket {user_ticket.ticket_id} stored for {user_ticket.username}")
             return inserted_doc
             
@@ -112,27 +151,54 @@ class SupportRepository:
             logging.error(f"Error storing user ticket for {user_ticket.username}: {str(e)}", exc_info=True)
             raise Exception(f"Failed to store user ticket: {str(e)}")
         
-    async def get_all_tickets(self, status: Optional[str], sort: str, page: int, limit: int):
+    async def get_all_tickets(self, status: Optional[str], sort: str, page: int, limit: int, cursor: Optional[str] = None):
+        """
+        Fetch one page of tickets, sorted on (sort field, _id).
+
+        Pages are addressed with the opaque `cursor` returned as `next_cursor` by the
+        previous page (keyset pagination), so deep pages cost the same as the first.
+        `page` without a cursor is still honoured for older clients, using skip.
+        `total` is a cached count and may lag writes by up to the configured TTL.
+        Each ticket carries its whole comment thread, oldest first.
+        """
         db = await get_db()
         collection = db[settings.SUPPORT_ISSUES_COLLECTION]
         query = {}
         if status:
             query["status"] = status
 
-        # Sorting
-        sort_field, sort_dir = sort.split(":")
-        sort_order = -1 if sort_dir.lower() == "desc" else 1
-
-        cursor = collection.find(query).sort(sort_field, sort_order).skip((page - 1) * limit).limit(limit)
-        tickets = await cursor.to_list(length=limit)
+        sort_field, sort_order = parse_sort(sort, TICKET_SORT_FIELDS)
+        page_query = query
+        if cursor:
+            last_value, last_id = decode_cursor(cursor, sort_field, sort_order)
+            page_query = {"$and": [query, keyset_filter(sort_field, sort_order, last_value, last_id)]}
+
+        find_cursor = collection.find(page_query).sort([(sort_field, sort_order), ("_id", sort_order)])
+        if not cursor and page > 1:
+            find_cursor = find_cursor.skip((page - 1) * limit)
+        # One extra document tells whether another page exists without counting
+        tickets = await find_cursor.limit(limit + 1).to_list(length=limit + 1)
+        has_more = len(tickets) > limit
+        tickets = tickets[:limit]
+        next_cursor = encode_cursor(sort_field, sort_order, tickets[-1]) if has_more else None
         for t in tickets:
             t["_id"] = str(t["_id"])
-        total = await collection.count_documents(query)
-        return {"total": total, "page": page, "limit": limit, "tickets": tickets}
+        await self._attach_comments(db, tickets)
+
+        total = await ticket_counts.get(collection, query)
+        return {
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "tickets": tickets,
+            "next_cursor": next_cursor,
+            "has_more": has_more,
+        }
 
-    async def get_ticket_by_id(self, ticket_id: str):
+    async def get_ticket_by_id(self, ticket_id: str, with_comments: bool = True):
         """
-        Fetch a single support ticket by its unique ticket_id.
+        Fetch a single support ticket by its unique ticket_id, with its comments
+        oldest first (embedded and bucketed) unless `with_comments` is False.
         Ignore documents without ticket_id.
         """
         try:
@@ -142,141 +208,412 @@ class SupportRepository:
             # Fetch only tickets with a ticket_id
             ticket = await collection.find_one({
                 "ticket_id": ticket_id
-            })
+            }, None if with_comments else {"comments": 0})
             if ticket:
                 # Convert MongoDB ObjectId to string to avoid Pydantic serialization issues
                 ticket["_id"] = str(ticket["_id"])
+                if with_comments:
+                    await self._attach_comments(db, [ticket])
             return ticket
 
         except Exception as e:
             logging.error(f"Error fetching ticket by ticket_id {ticket_id}: {e}", exc_info=True)
             raise
 
-    async def get_tickets_for_export(self, status: Optional[str], ticket_ids: Optional[List[str]]) -> List[dict]:
-        """
-        Fetch support tickets from the database for CSV export using ticket_id.
-
-        Args:
-            status (Optional[str]): Filter by ticket status (case-insensitive).
-            ticket_ids (Optional[List[str]]): List of specific ticket IDs.
-
-        Returns:
-            list: List of ticket documents.
-        """
-        try:
-            db = await get_db()
-            collection = db[settings.SUPPORT_ISSUES_COLLECTION]
-            query = {}
-
-            # Status filter
-            if status:
-                query["status"] = {"$regex": f"^{status}$", "$options": "i"}
+    @staticmethod
+    def _export_query(status: Optional[str], ticket_ids: Optional[List[str]]) -> Dict[str, Any]:
+        query = {}
 
-            # Ticket IDs filter
-            if ticket_ids:
-                query["ticket_id"] = {"$in": ticket_ids}
+        # Status filter
+        if status:
+            query["status"] = {"$regex": f"^{status}$", "$options": "i"}
 
-            logging.info(f"Export query: {query}")
+        # Ticket IDs filter
+        if ticket_ids:
+            query["ticket_id"] = {"$in": ticket_ids}
+        return query
 
-            tickets = await collection.find(query).to_list(None)
-            return tickets or []
+    async def iter_tickets_for_export(self, status: Optional[str], ticket_ids: Optional[List[str]], fields: List[str]) -> AsyncIterator[dict]:
+        """
+        Stream the tickets matching the export filters, projected to `fields`.
 
-        except Exception as e:
-            logging.error(f"Error in SupportRepository.get_tickets_for_export: {e}", exc_info=True)
-            raise
+        Documents are pulled from the cursor in batches, so memory use does not
+        depend on how many tickets are exported.
+        """
+        db = await get_db()
+        collection = db[settings.SUPPORT_ISSUES_COLLECTION]
+        projection = {"_id": 0, **{field: 1 for field in fields}}
+        logging.info(f"Exporting tickets (status={status}, ticket_ids={len(ticket_ids) if ticket_ids else 'all'})")
+        cursor = collection.find(self._export_query(status, ticket_ids), projection).batch_size(EXPORT_BATCH_SIZE)
+        async for ticket in cursor:
+            yield ticket
 
-    async def perform_bulk_action(self, action: str, ticket_ids: List[str]):
+    async def perform_bulk_action(self, action: str, ticket_ids: List[str], on_chunk_applied: Optional[Callable[[List[str]], None]] = None):
         """
         Perform bulk actions (delete, close, mark_paid) on tickets using ticket_id.
         Ignores documents without a ticket_id.
+
+        The ticket IDs are split into chunks of SUPPORT_BULK_CHUNK_SIZE, each applied
+        with one unordered `bulk_write`, at most SUPPORT_BULK_CONCURRENCY at a time.
+        A failing chunk does not stop the others; the result lists every chunk.
+        `on_chunk_applied` is called with the ticket IDs of each successful chunk.
         """
+        if action not in (BulkAction.CLOSE, BulkAction.DELETE, BulkAction.MARK_PAID):
+            logging.warning(f"Invalid bulk action: {action}")
+            raise ValueError(f"Unsupported bulk action: {action}")
+
         try:
             db = await get_db()
             collection = db[settings.SUPPORT_ISSUES_COLLECTION]
 
-            # Filter only documents with ticket_id
-            filter_query = {
-                "ticket_id": {"$in": ticket_ids, "$exists": True, "$ne": ""}
+            # Skip empty IDs (documents without ticket_id) and duplicates
+            unique_ids = [ticket_id for ticket_id in dict.fromkeys(ticket_ids) if ticket_id]
+            chunk_size = settings.SUPPORT_BULK_CHUNK_SIZE
+            chunks = [unique_ids[i:i + chunk_size] for i in range(0, len(unique_ids), chunk_size)]
+            count_key = "deleted_count" if action == BulkAction.DELETE else "modified_count"
+            semaphore = asyncio.Semaphore(settings.SUPPORT_BULK_CONCURRENCY)
+            needs_reconcile = False
+
+            async def run_chunk(index: int, chunk: List[str]) -> Dict[str, Any]:
+                nonlocal needs_reconcile
+                async with semaphore:
+                    try:
+                        count, exact = await self._apply_bulk_chunk(db, collection, action, chunk)
+                    except Exception as e:
+                        # Part of the chunk may have been written; the counters are recomputed below
+                        needs_reconcile = True
+                        logging.error(f"Bulk action {action} failed for chunk {index} ({len(chunk)} tickets): {e}", exc_info=True)
+                        return {"chunk": index, "size": len(chunk), "success": False, count_key: 0, "error": str(e)}
+                needs_reconcile = needs_reconcile or not exact
+                if on_chunk_applied:
+                    on_chunk_applied(chunk)
+                return {"chunk": index, "size": len(chunk), "success": True, count_key: count}
+
+            results = await asyncio.gather(*(run_chunk(index, chunk) for index, chunk in enumerate(chunks)))
+
+            if needs_reconcile:
+                await self.reconcile_support_metrics()
+            ticket_counts.expire()
+            return {
+                count_key: sum(result[count_key] for result in results),
+                "failed_chunks": sum(1 for result in results if not result["success"]),
+                "chunks": results,
             }
 
-            if action == BulkAction.CLOSE:
-                update_data = {"$set": {"status": "Closed"}}
-            elif action == BulkAction.MARK_PAID:
-                update_data = {"$set": {"is_paid": True}}
-            elif action == BulkAction.DELETE:
-                result = await collection.delete_many(filter_query)
-                return {"deleted_count": result.deleted_count}
+        except Exception as e:
+            logging.error(f"Error performing bulk action {action}: {e}", exc_info=True)
+            raise
+
+    async def _apply_bulk_chunk(self, db, collection, action: str, chunk: List[str]) -> tuple:
+        """
+        Apply a bulk action to one chunk of ticket IDs and adjust the metrics counter.
+
+        Close and delete write one operation per (status, is_paid) group of the
+        chunk, so the counter deltas are known up front. If the write changed a
+        different number of tickets than were read (a ticket changed in between),
+        the deltas are not applied and the result is flagged as not exact, so
+        the caller reconciles the counter instead.
+
+        Returns (number of changed tickets, whether the counter was adjusted exactly).
+        """
+        if action == BulkAction.MARK_PAID:
+            result = await collection.bulk_write(
+                [UpdateMany({"ticket_id": {"$in": chunk}, "is_paid": {"$ne": True}}, {"$set": {"is_paid": True}})],
+                ordered=False
+            )
+            await self._inc_support_metrics(db, paid=result.modified_count)
+            return result.modified_count, True
+
+        groups: Dict[tuple, int] = {}
+        async for doc in collection.find({"ticket_id": {"$in": chunk}}, {"_id": 0, "status": 1, "is_paid": 1}):
+            key = (doc.get("status"), doc.get("is_paid"))
+            groups[key] = groups.get(key, 0) + 1
+
+        operations = []
+        expected = 0
+        total_delta, paid_delta, status_deltas = 0, 0, {}
+        for (status, is_paid), count in groups.items():
+            group_filter = {"ticket_id": {"$in": chunk}, "status": status, "is_paid": is_paid}
+            if action == BulkAction.DELETE:
+                operations.append(DeleteMany(group_filter))
+                total_delta -= count
+                paid_delta -= count if is_paid is True else 0
+                status_deltas[status] = status_deltas.get(status, 0) - count
             else:
-                raise ValueError(f"Unsupported bulk action: {action}")
+                if status == TicketStatus.CLOSED.value:
+                    continue
+                operations.append(UpdateMany(group_filter, {"$set": {"status": TicketStatus.CLOSED.value}}))
+                status_deltas[status] = status_deltas.get(status, 0) - count
+                status_deltas[TicketStatus.CLOSED.value] = status_deltas.get(TicketStatus.CLOSED.value, 0) + count
+            expected += count
+
+        if not operations:
+            return 0, True
+        result = await collection.bulk_write(operations, ordered=False)
+        changed = result.deleted_count if action == BulkAction.DELETE else result.modified_count
+        if changed != expected:
+            return changed, False
+        await self._inc_support_metrics(db, total=total_delta, paid=paid_delta, statuses=status_deltas)
+        return changed, True
 
-            result = await collection.update_many(filter_query, update_data)
-            return {"modified_count": result.modified_count}
+    @staticmethod
+    async def _inc_support_metrics(db, total: int = 0, paid: int = 0, statuses: Optional[Dict[str, int]] = None):
+        """
+        Atomically adjust the support metrics counter document.
 
-        except ValueError as ve:
-            logging.warning(f"Invalid bulk action: {ve}")
-            raise
+        Never upserts: a missing counter is rebuilt from scratch by
+        `reconcile_support_metrics` on the next read, so partial increments
+        must not create it.
+        """
+        inc = {"total": total, "paid": paid}
+        for status, delta in (statuses or {}).items():
+            if status is not None:
+                inc[f"status.{getattr(status, 'value', status)}"] = delta
+        inc = {field: delta for field, delta in inc.items() if delta}
+        if not inc:
+            return
+        try:
+            await db[settings.SUPPORT_METRICS_COLLECTION].update_one({"_id": SUPPORT_METRICS_ID}, {"$inc": inc})
         except Exception as e:
-            logging.error(f"Error performing bulk action {action}: {e}", exc_info=True)
-            raise
+            # The ticket write already happened; the periodic reconcile repairs the counter
+            logging.error(f"Failed to update support metrics counter {inc}: {e}")
 
-    async def get_support_metrics(self):
+    async def reconcile_support_metrics(self) -> Dict[str, Any]:
+        """
+        Recompute the support metrics counter from the tickets with a single
+        `$group` aggregation and overwrite the counter document, repairing any
+        drift left by failed or racing increments.
+        """
         db = await get_db()
         collection = db[settings.SUPPORT_ISSUES_COLLECTION]
-
-        # Tasks for concurrent execution
-        tasks = [
-            collection.count_documents({}),  # Total tickets
-            collection.count_documents({"is_paid": True})  # Paid tickets
+        pipeline = [
+            {"$group": {
+                "_id": "$status",
+                "count": {"$sum": 1},
+                "paid": {"$sum": {"$cond": [{"$eq": ["$is_paid", True]}, 1, 0]}},
+            }}
         ]
+        groups = await collection.aggregate(pipeline).to_list(None)
+        counter = {
+            "_id": SUPPORT_METRICS_ID,
+            "total": sum(group["count"] for group in groups),
+            "paid": sum(group["paid"] for group in groups),
+            "status": {group["_id"]: group["count"] for group in groups if group["_id"] is not None},
+            "reconciled_at": datetime.now(IST),
+        }
 
-        # Count per status from TicketStatus enum
-        for status in TicketStatus:
-            tasks.append(collection.count_documents({"status": status.value}))
+        metrics_collection = db[settings.SUPPORT_METRICS_COLLECTION]
+        previous = await metrics_collection.find_one_and_replace(
+            {"_id": SUPPORT_METRICS_ID}, counter, upsert=True
+        )
+        if previous and (previous.get("total"), previous.get("paid"), previous.get("status")) != (counter["total"], counter["paid"], counter["status"]):
+            logging.warning(
+                f"Support metrics drift corrected: total {previous.get('total')} -> {counter['total']}, "
+                f"paid {previous.get('paid')} -> {counter['paid']}, status {previous.get('status')} -> {counter['status']}"
+            )
+        return counter
 
-        results = await asyncio.gather(*tasks)
+    async def get_support_metrics(self):
+        """
+        Read the dashboard metrics from the counter document (a single point read).
+        The counter is built on first use if it does not exist yet.
+        """
+        db = await get_db()
+        counter = await db[settings.SUPPORT_METRICS_COLLECTION].find_one({"_id": SUPPORT_METRICS_ID})
+        if counter is None:
+            counter = await self.reconcile_support_metrics()
 
         metrics = {
-            "total_tickets": results[0],
-            "paid_tickets": results[1]
+            "total_tickets": counter.get("total", 0),
+            "paid_tickets": counter.get("paid", 0)
         }
 
         # Map status counts dynamically
-        for idx, status in enumerate(TicketStatus, start=2):
-            metrics[f"{status.name.lower()}_tickets"] = results[idx]
+        status_counts = counter.get("status", {})
+        for status in TicketStatus:
+            metrics[f"{status.name.lower()}_tickets"] = status_counts.get(status.value, 0)
 
         return metrics
     
 
-    # Connects to MongoDB using existing get_db().
-    # Finds all documents in support_issues where username == user_email.
-    # Sorts by created_at (latest first).
-    # Converts _id from ObjectId to string (for JSON safety).
-    # Returns list of tickets to the service layer.
-    
-    async def get_user_tickets(self, user_email: str):
+    async def get_user_tickets(self, user_email: str, limit: int, cursor: Optional[str] = None) -> Dict[str, Any]:
         """
-        Retrieve all support tickets for a given user from the database.
+        Retrieve one page of ticket summaries for a user, newest first.
+
+        Only the summary fields are returned (no details, attachments or
+        comments); the page is read along the {username, created_at, _id} index
+        and continued with the opaque `next_cursor` of the previous page.
         """
         try:
             db = await get_db()
             support_collection = db[settings.SUPPORT_ISSUES_COLLECTION]
 
-            # Fetch all tickets for this user
-            cursor = support_collection.find({"username": user_email},{"_id":0}).sort("created_at", -1)
-            tickets = await cursor.to_list(length=None)
-
-            # Convert ObjectIds to strings for JSON
-            # for ticket in tickets:
-            #     ticket["_id"] = str(ticket["_id"])
+            match: Dict[str, Any] = {"username": user_email}
+            if cursor:
+                last_value, last_id = decode_cursor(cursor, "created_at", -1)
+                match = {"$and": [match, keyset_filter("created_at", -1, last_value, last_id)]}
+
+            pipeline = [
+                {"$match": match},
+                {"$sort": {"created_at": -1, "_id": -1}},
+                # One extra document tells whether another page exists
+                {"$limit": limit + 1},
+                {"$project": {
+                    **{field: 1 for field in USER_TICKET_SUMMARY_FIELDS},
+                    # comment_count covers every comment once a ticket has its sequence; older tickets only have embedded ones
+                    "comment_count": {"$ifNull": ["$comment_count", {"$size": {"$ifNull": ["$comments", []]}}]},
+                }},
+            ]
+            tickets = await support_collection.aggregate(pipeline).to_list(length=limit + 1)
+            has_more = len(tickets) > limit
+            tickets = tickets[:limit]
+            next_cursor = encode_cursor("created_at", -1, tickets[-1]) if has_more else None
+            for ticket in tickets:
+                ticket.pop("_id", None)
+                ticket.setdefault("last_activity_at", ticket.get("created_at"))
 
             logging.info(f"Fetched {len(tickets)} ticket(s) for {user_email}")
+            return {"tickets": tickets, "limit": limit, "next_cursor": next_cursor, "has_more": has_more}
+
+        except ValueError:
+            raise
+        except Exception as e:
+            logging.error(f"Error fetching tickets for {user_email}: {str(e)}", exc_info=True)
+            raise Exception("Failed to fetch user tickets.")
+
+    async def list_user_tickets(self, user_email: str) -> List[dict]:
+        """
+        Retrieve all support tickets of a user, newest first, as full documents
+        with their comments inline (oldest first), which is what /my_tickets
+        returned before it was paginated.
+        """
+        try:
+            db = await get_db()
+            cursor = db[settings.SUPPORT_ISSUES_COLLECTION].find({"username": user_email}, {"_id": 0}).sort("created_at", -1)
+            tickets = await cursor.to_list(length=None)
+            await self._attach_comments(db, tickets)
+
+            logging.info(f"Fetched all {len(tickets)} ticket(s) for {user_email}")
             return tickets
 
         except Exception as e:
             logging.error(f"Error fetching tickets for {user_email}: {str(e)}", exc_info=True)
             raise Exception("Failed to fetch user tickets.")
-        
-    
+
+    async def get_user_ticket(self, user_email: str, ticket_id: str) -> Optional[dict]:
+        """
+        Fetch the full details of one of the user's tickets (comments are read separately).
+        """
+        try:
+            db = await get_db()
+            ticket = await db[settings.SUPPORT_ISSUES_COLLECTION].find_one(
+                {"ticket_id": ticket_id, "username": user_email},
+                {"_id": 0, "comments": 0}
+            )
+            return ticket
+        except Exception as e:
+            logging.error(f"Error fetching ticket {ticket_id} for {user_email}: {str(e)}", exc_info=True)
+            raise Exception("Failed to fetch user ticket.")
+
+    @staticmethod
+    async def _attach_comments(db, tickets: List[dict]) -> None:
+        """
+        Replace the `comments` of each ticket with its whole thread, oldest first:
+        the comments still embedded in the ticket followed by its bucketed ones.
+
+        Bucketed comments of all the tickets are fetched with a single query, so
+        the cost does not grow with the number of tickets.
+        """
+        bucketed: Dict[str, List[dict]] = {}
+        # Tickets without a comment_count only have embedded comments
+        ticket_ids = [ticket["ticket_id"] for ticket in tickets if ticket.get("comment_count")]
+        if ticket_ids:
+            buckets = db[settings.SUPPORT_COMMENTS_COLLECTION].find({"ticket_id": {"$in": ticket_ids}}, {"_id": 0, "ticket_id": 1, "comments": 1})
+            for bucket in await buckets.to_list(None):
+                bucketed.setdefault(bucket["ticket_id"], []).extend(bucket.get("comments", []))
+
+        for ticket in tickets:
+            embedded = sorted(ticket.get("comments") or [], key=lambda c: c.get("timestamp") or datetime.min)
+            comments = bucketed.get(ticket.get("ticket_id"), [])
+            if embedded:
+                # Embedded comments are still authoritative for the sequence numbers reserved for them
+                comments = [c for c in comments if c.get("seq", -1) >= ticket.get("legacy_comment_count", len(embedded))]
+            ticket["comments"] = embedded + sorted(comments, key=lambda c: c.get("seq", -1))
+
+    @staticmethod
+    async def _init_comment_sequence(support_collection, ticket_filter: Dict[str, Any]) -> bool:
+        """
+        Start the comment sequence of a ticket that predates comment buckets.
+
+        Its embedded comments keep sequence numbers 0..n-1 (oldest first), so
+        `comment_count` and `legacy_comment_count` both start at n and every
+        bucketed comment is numbered after them. Returns False if no ticket matched.
+        """
+        ticket = await support_collection.find_one(ticket_filter, {"comment_count": 1, "comments": 1})
+        if ticket is None:
+            return False
+        if "comment_count" not in ticket:
+            embedded = len(ticket.get("comments") or [])
+            # Only the first writer sets it; a racing one sees comment_count and just retries its $inc
+            await support_collection.update_one(
+                {"_id": ticket["_id"], "comment_count": {"$exists": False}},
+                {"$set": {"comment_count": embedded, "legacy_comment_count": embedded}}
+            )
+        return True
+
+    async def _append_comment(self, db, ticket_filter: Dict[str, Any], comment_obj: Dict[str, Any]) -> Optional[dict]:
+        """
+        Append a comment to the ticket's comment buckets in `support_comments`.
+
+        The ticket document only keeps a small summary (`comment_count`,
+        `last_activity_at`, `last_comment_by`), so a comment write is one small
+        update on the ticket plus one `$push` into a bucket of at most
+        SUPPORT_COMMENT_BUCKET_SIZE comments, whatever the length of the thread.
+        The incremented `comment_count` gives the comment its sequence number,
+        which decides its bucket.
+
+        Returns the ticket (without any embedded comments) or None if no ticket matched.
+        """
+        support_collection = db[settings.SUPPORT_ISSUES_COLLECTION]
+        comments_collection = db[settings.SUPPORT_COMMENTS_COLLECTION]
+
+        async def claim_seq():
+            return await support_collection.find_one_and_update(
+                {**ticket_filter, "comment_count": {"$exists": True}},
+                {
+                    "$inc": {"comment_count": 1},
+                    "$set": {"last_activity_at": comment_obj["timestamp"], "last_comment_by": comment_obj["user_type"]},
+                },
+                projection={"comments": 0},
+                return_document=ReturnDocument.AFTER
+            )
+
+        ticket = await claim_seq()
+        if ticket is None and await self._init_comment_sequence(support_collection, ticket_filter):
+            ticket = await claim_seq()
+        if not ticket:
+            return None
+
+        try:
+            await self._ensure_comment_bucket_index(db)
+        except Exception as e:
+            logging.error(f"Error creating the unique comment bucket index: {e}", exc_info=True)
+
+        comment_obj["seq"] = ticket["comment_count"] - 1
+        bucket_filter = {"ticket_id": ticket["ticket_id"], "bucket": comment_obj["seq"] // settings.SUPPORT_COMMENT_BUCKET_SIZE}
+        bucket_update = {
+            "$push": {"comments": comment_obj},
+            "$inc": {"count": 1},
+            "$min": {"first_at": comment_obj["timestamp"]},
+            "$max": {"last_at": comment_obj["timestamp"]},
+        }
+        try:
+            await comments_collection.update_one(bucket_filter, bucket_update, upsert=True)
+        except DuplicateKeyError:
+            # Two comments raced to create the same bucket; it exists now
+            await comments_collection.update_one(bucket_filter, bucket_update)
+        return ticket
+
     # Adding a Comment to the Ticket
     async def add_comment_to_ticket(self, user_email: EmailStr, ticket_id: str, comment: str, attachments: Optional[List[str]] = None):
         """
@@ -285,8 +622,7 @@ class SupportRepository:
         """
         try:
             db = await get_db()
-            support_collection = db[settings.SUPPORT_ISSUES_COLLECTION]
-            
+
             filter_query = {"ticket_id": ticket_id, "username": user_email}
             
             comment_obj = {
@@ -297,11 +633,7 @@ class SupportRepository:
                 "attachments": attachments or [],
             }
             
-            updated_ticket = await support_collection.find_one_and_update(
-                filter_query,
-                {"$push": {"comments": comment_obj}},
-                return_document=ReturnDocument.AFTER
-            )
+            updated_ticket = await self._append_comment(db, filter_query, comment_obj)
 
             if not updated_ticket:
                 # No document matched — same error semantics as before
@@ -336,7 +668,6 @@ class SupportRepository:
         """
         try:
             db = await get_db()
-            support_collection = db[settings.SUPPORT_ISSUES_COLLECTION]
             
             filter_query = {"ticket_id": ticket_id}
             
@@ -348,11 +679,7 @@ class SupportRepository:
             }
             
             # Admin can update any ticket regardless of username
-            updated_ticket = await support_collection.find_one_and_update(
-                filter_query,
-                {"$push": {"comments": comment_obj}},
-                return_document=ReturnDocument.AFTER
-            )
+            updated_ticket = await self._append_comment(db, filter_query, comment_obj)
 
             if not updated_ticket:
                 raise ValueError("Ticket not found. Admin cannot add comment.")
@@ -375,6 +702,194 @@ class SupportRepository:
         except Exception as e:
             logging.error(f"Error adding admin comment to ticket {ticket_id}: {str(e)}", exc_info=True)
             raise Exception("Failed to add admin comment to ticket.")
-    
+
+    async def get_ticket_comments(self, ticket_id: str, page: int, limit: int) -> Optional[Dict[str, Any]]:
+        """
+        Fetch one page of a ticket's comments, newest first (descending `seq`).
+
+        Comment sequence numbers map directly onto buckets, so a page reads only
+        the one or two buckets that hold it. Comments from before the buckets
+        hold the lowest sequence numbers (0..legacy_comment_count-1, oldest first);
+        until `migrate_embedded_comments` has moved them they are read from the
+        ticket itself.
+
+        Returns None if the ticket does not exist.
+        """
+        try:
+            db = await get_db()
+            ticket = await db[settings.SUPPORT_ISSUES_COLLECTION].find_one(
+                {"ticket_id": ticket_id},
+                {"_id": 0, "comment_count": 1, "legacy_comment_count": 1, "last_activity_at": 1, "comments": 1}
+            )
+            if ticket is None:
+                return None
+
+            embedded = sorted(ticket.get("comments") or [], key=lambda c: c.get("timestamp") or datetime.min)
+            total = ticket.get("comment_count", len(embedded))
+            legacy_total = ticket.get("legacy_comment_count", len(embedded))
+            start = (page - 1) * limit
+            hi_seq = total - 1 - start
+            lo_seq = max(0, total - start - limit)
+
+            comments: List[dict] = []
+            # Sequence numbers still held by embedded comments are not read from the buckets
+            bucket_lo_seq = max(lo_seq, legacy_total) if embedded else lo_seq
+            if hi_seq >= bucket_lo_seq:
+                bucket_size = settings.SUPPORT_COMMENT_BUCKET_SIZE
+                buckets = await db[settings.SUPPORT_COMMENTS_COLLECTION].find(
+                    {"ticket_id": ticket_id, "bucket": {"$gte": bucket_lo_seq // bucket_size, "$lte": hi_seq // bucket_size}},
+                    {"_id": 0, "comments": 1}
+                ).to_list(None)
+                comments = sorted(
+                    (c for bucket in buckets for c in bucket.get("comments", []) if bucket_lo_seq <= c.get("seq", -1) <= hi_seq),
+                    key=lambda c: c["seq"],
+                    reverse=True
+                )
+            if embedded:
+                for seq in range(min(hi_seq, legacy_total - 1, len(embedded) - 1), lo_seq - 1, -1):
+                    comments.append({**embedded[seq], "seq": seq})
+
+            return {
+                "ticket_id": ticket_id,
+                "total": total,
+                "page": page,
+                "limit": limit,
+                "last_activity_at": ticket.get("last_activity_at"),
+                "comments": comments,
+            }
+
+        except Exception as e:
+            logging.error(f"Error fetching comments for ticket {ticket_id}: {e}", exc_info=True)
+            raise
+
+    async def iter_tickets_for_search(self) -> AsyncIterator[dict]:
+        """
+        Stream the searchable fields of every ticket (including comments that are
+        still embedded) for building the in-process search index.
+        """
+        db = await get_db()
+        projection = {"_id": 0, **{field: 1 for field in SEARCH_FIELD_WEIGHTS}, "comments.comment": 1}
+        cursor = db[settings.SUPPORT_ISSUES_COLLECTION].find({"ticket_id": {"$exists": True, "$ne": ""}}, projection)
+        async for ticket in cursor.batch_size(EXPORT_BATCH_SIZE):
+            yield ticket
+
+    async def iter_comment_buckets_for_search(self) -> AsyncIterator[dict]:
+        """
+        Stream the comment text of every comment bucket.
+        """
+        db = await get_db()
+        cursor = db[settings.SUPPORT_COMMENTS_COLLECTION].find({}, {"_id": 0, "ticket_id": 1, "comments.comment": 1})
+        async for bucket in cursor.batch_size(EXPORT_BATCH_SIZE):
+            yield bucket
+
+    async def get_tickets_by_ids(self, ticket_ids: List[str]) -> Dict[str, dict]:
+        """
+        Fetch tickets (without embedded comments) by ticket_id, keyed by ticket_id.
+        """
+        db = await get_db()
+        cursor = db[settings.SUPPORT_ISSUES_COLLECTION].find({"ticket_id": {"$in": ticket_ids}}, {"comments": 0})
+        tickets = {}
+        for ticket in await cursor.to_list(None):
+            ticket["_id"] = str(ticket["_id"])
+            tickets[ticket["ticket_id"]] = ticket
+        return tickets
+
+    async def text_search_ticket_ids(self, query: str, limit: int) -> List[tuple]:
+        """
+        Rank tickets for `query` with MongoDB text indexes on the tickets and on
+        the comment buckets (whole words only, no prefix matching).
+        Returns (ticket_id, score) pairs, best first.
+        """
+        db = await get_db()
+        await self._ensure_text_indexes(db)
+        scores: Dict[str, float] = {}
+        text_filter = {"$text": {"$search": query}}
+        score_projection = {"_id": 0, "ticket_id": 1, "score": {"$meta": "textScore"}}
+
+        tickets = db[settings.SUPPORT_ISSUES_COLLECTION].find(text_filter, score_projection).sort([("score", {"$meta": "textScore"})]).limit(limit)
+        buckets = db[settings.SUPPORT_COMMENTS_COLLECTION].find(text_filter, score_projection).sort([("score", {"$meta": "textScore"})]).limit(limit)
+        for doc in await tickets.to_list(limit) + await buckets.to_list(limit):
+            scores[doc["ticket_id"]] = scores.get(doc["ticket_id"], 0.0) + doc["score"]
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(ticket_id, round(score, 4)) for ticket_id, score in ranked[:limit]]
+
+    @staticmethod
+    async def _ensure_text_indexes(db):
+        # A collection can only have one text index, so these are not part of the
+        # declarative INDEX_SPECS; they are created the first time the Mongo search
+        # backend is used (create_index is a no-op once they exist).
+        global text_indexes_ready
+        if text_indexes_ready:
+            return
+        await db[settings.SUPPORT_ISSUES_COLLECTION].create_index(
+            [(field, "text") for field in SEARCH_FIELD_WEIGHTS] + [("comments.comment", "text")],
+            name="support_search_text",
+            weights={**SEARCH_FIELD_WEIGHTS, "comments.comment": SEARCH_COMMENT_WEIGHT},
+        )
+        await db[settings.SUPPORT_COMMENTS_COLLECTION].create_index([("comments.comment", "text")], name="support_comments_text")
+        text_indexes_ready = True
+
+    @staticmethod
+    async def _ensure_comment_bucket_index(db):
+        # Bucket upserts rely on the unique (ticket_id, bucket) index to turn a race
+        # into a DuplicateKeyError instead of a second bucket, so it is created once
+        # per process before the first bucket write, whatever ENSURE_INDEXES_ON_STARTUP says.
+        global comment_bucket_index_ready
+        if comment_bucket_index_ready:
+            return
+        await db[settings.SUPPORT_COMMENTS_COLLECTION].create_index(COMMENT_BUCKET_INDEX["keys"], **COMMENT_BUCKET_INDEX["options"])
+        comment_bucket_index_ready = True
+
+    async def migrate_embedded_comments(self) -> int:
+        """
+        Move comments still embedded in ticket documents into comment buckets.
+
+        The embedded comments keep the sequence numbers reserved for them
+        (0..legacy_comment_count-1, oldest first), so they stay the oldest
+        comments of the thread whatever was written to the buckets since.
+        Readers keep using the embedded copies until they are removed, which
+        only happens once every one of them is in its bucket. Bucket writes skip
+        comments that are already there, so an interrupted run can simply be
+        repeated. Returns the number of migrated tickets.
+        """
+        db = await get_db()
+        support_collection = db[settings.SUPPORT_ISSUES_COLLECTION]
+        comments_collection = db[settings.SUPPORT_COMMENTS_COLLECTION]
+        # Without the unique index a repeated run would add a second bucket instead of skipping
+        await self._ensure_comment_bucket_index(db)
+
+        migrated = 0
+        async for ticket in support_collection.find({"comments.0": {"$exists": True}}, {"ticket_id": 1, "comments": 1, "legacy_comment_count": 1}):
+            legacy = sorted(ticket["comments"], key=lambda c: c.get("timestamp") or datetime.min)
+            await self._init_comment_sequence(support_collection, {"_id": ticket["_id"]})
+            legacy_total = ticket.get("legacy_comment_count", len(legacy))
+            if legacy_total != len(legacy):
+                logging.warning(f"Ticket {ticket['ticket_id']} has {len(legacy)} embedded comment(s) but {legacy_total} reserved sequence numbers; skipped")
+                continue
+
+            for seq, comment_obj in enumerate(legacy):
+                comment_obj["seq"] = seq
+                try:
+                    await comments_collection.update_one(
+                        {"ticket_id": ticket["ticket_id"], "bucket": seq // settings.SUPPORT_COMMENT_BUCKET_SIZE, "comments.seq": {"$ne": seq}},
+                        {
+                            "$push": {"comments": comment_obj},
+                            "$inc": {"count": 1},
+                            "$min": {"first_at": comment_obj.get("timestamp")},
+                            "$max": {"last_at": comment_obj.get("timestamp")},
+                        },
+                        upsert=True
+                    )
+                except DuplicateKeyError:
+                    # The bucket already holds this comment (from an interrupted run)
+                    pass
+            await support_collection.update_one(
+                {"_id": ticket["_id"], "comments": {"$size": len(legacy)}},
+                {"$unset": {"comments": ""}, "$max": {"last_activity_at": legacy[-1].get("timestamp") or datetime.min}}
+            )
+            migrated += 1
+            logging.info(f"Moved {len(legacy)} embedded comment(s) of ticket {ticket['ticket_id']} into {settings.SUPPORT_COMMENTS_COLLECTION}")
+        return migrated
+
 def get_support_repository() -> SupportRepository:
     return SupportRepository() 
@@ -6,7 +6,9 @@ from datetime import datetime, timezone, timedelta
 import logging
 from future_bridge.models.userModel import User,Feedback,RoundPreferences
 from future_bridge.schema.recommendationSchema import CollegeDetails
+from future_bridge.utils.requestTiming import timed_methods
 
+@timed_methods("repository")
 class UserRepository:
 
     async def read_user(self, user: User) -> User | None:
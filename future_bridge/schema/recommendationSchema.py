@@ -92,6 +92,9 @@ class CollegeRecommendationGroupResponse(BaseModel):
     Reach: list[dict]
     Match: list[dict]
     Safety: list[dict]
+    colleges: dict[str, dict] = Field(default_factory=dict, description="College summaries keyed by sj_code, shared by the Dream/Reach/Match/Safety items")
+    cet_percentile: Optional[float] = None
+    category: Optional[str] = None
     Round:int = Field(default=1)
     is_payment: bool
     accept_payment: bool
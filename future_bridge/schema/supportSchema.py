@@ -43,9 +43,10 @@ class TicketFilterRequest(BaseModel):
     Schema for filtering tickets in pagination API.
     """
     status: Optional[TicketStatus] = None
-    sort: Optional[str] = "created_at:desc"
-    page: int = 1
-    limit: int = 10
+    sort: Optional[str] = Field("created_at:desc", description="Sort field and direction; field is created_at or ticket_id")
+    page: int = Field(1, ge=1, description="Page number; only used when no cursor is given")
+    limit: int = Field(10, ge=1, le=100)
+    cursor: Optional[str] = Field(None, description="Continuation token (next_cursor) from the previous page")
 
 
 class CommentRequest(BaseModel):
@@ -9,7 +9,9 @@ from future_bridge.repositories.paymentRepository import PaymentRepository
 
 
 from future_bridge.utils.JWTTokenGenrator import create_jwt  
+from future_bridge.utils.requestTiming import timed_methods
 
+@timed_methods("service")
 class OTPService:
     """
     Service layer for handling operations related to counsellor scheduling.
@@ -44,6 +46,7 @@ def get_otp_service()->OTPService:
     return OTPService()
 
 
+@timed_methods("service")
 class CommonService:
     def __init__(self):
         self.common_repo = CommonRepo()
@@ -12,8 +12,52 @@ from future_bridge.config.config import settings
 from future_bridge.repositories.paymentRepository import PaymentRepository
 from future_bridge.repositories.recommendationRepository import RecommendationRepository
 from future_bridge.schema.recommendationSchema import SearchByChoiceCode , SearchByCollegeName ,SearchByCollegeCode
-
-
+from future_bridge.utils.fieldSelection import projection, prune, wants
+from future_bridge.utils.requestTiming import timed_methods
+
+RECOMMENDATION_GROUPS = ["Dream", "Reach", "Match", "Safety"]
+# institute_meta fields kept in the per-response `colleges` dictionary; expand=college returns the full document
+RECOMMENDATION_COLLEGE_FIELDS = ["SJ_Institute_Code", "College_Code", "College_Name", "College_Type", "City", "Region", "College_Logo"]
+RECOMMENDATION_ITEM_FIELDS = ["sj_code", "choice_code", "course", "cutoff", "admission_probability", "probability_message", "college"]
+# Top-level fields of a stored recommendation document that are always read
+RECOMMENDATION_DOCUMENT_FIELDS = ["username", "Round", "is_payment", "accept_payment", "colleges", "cet_percentile", "category"]
+
+# Sparse fieldsets (`fields=`): each response field -> the institute_meta fields it is built from
+SEARCH_FIELD_SOURCES = {
+    "college_name": ["College_Name"],
+    "college_type": ["College_Type"],
+    "institute_id": ["College_Code"],
+    "sj_institute_id": ["SJ_Institute_Code"],
+    "city": ["Region"],
+    "Region": ["City"],
+    "logo": ["College_Logo"],
+    "rating": ["College_Reviews_out_of_5"],
+    "courses_count": [],
+    "total_intake": ["Student_Intake", "Total_Intake"],
+    "fees": ["Annual_Fees_INR", "Annual_Fees_(INR)"],
+    "placement_range": ["Overall_College_Placement_Percentage"],
+    "cet_cutoff_range": [],
+    "courses": [],
+    "course_not_found": [],
+    "course_not_found_message": [],
+}
+REPORT_FIELD_SOURCES = {
+    **{field: [field] for field in [
+        "College_Name", "College_Website", "College_Address", "City", "College_Type", "NAAC_Acrredition",
+        "University_Affiliation", "Annual_Fees_(INR)", "Previous_Year_Highest_Package_Offered_(LPA)",
+        "Student_Intake", "College_Reviews_out_of_5", "Faculty_Student_Ratio", "NIRF_Rank_Min", "NIRF_Rank_Max",
+        "College_Code", "SJ_Institute_Code", "College_Logo", "Established_Year"
+    ]},
+    "Average_Placement_Percentage": [],
+    "Engineering_Streams": [],
+    "Facilities": ["College_Hostel_Available", "Lab_Facilities", "Sports_Facilities", "College_Bus_Facility_Available"],
+    "Placement_Details": ["Overall_College_Placement_Percentage", "Previous_Year_Highest_Package_Offered_LPA", "Top_Recruiters"],
+    "Admission_Process": [],
+    "Location": ["College_Address", "City", "Nearest_Railway_Station", "Distance_from_Railway_Station", "Nearest_Airport", "Distance_from_Airport"],
+    "Departments": [],
+}
+
+@timed_methods("service")
 class ExploreService:
 
     def __init__(self):
@@ -31,9 +75,10 @@ class ExploreService:
         except Exception:
             return None
 
-    async def search_colleges(self, college_names: Optional[List[str]] = None, courses: Optional[List[str]] = None, cities: Optional[List[str]] = None, sort_by: Optional[str] = None, order: Optional[str] = None, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def search_colleges(self, college_names: Optional[List[str]] = None, courses: Optional[List[str]] = None, cities: Optional[List[str]] = None, sort_by: Optional[str] = None, order: Optional[str] = None, filters: Optional[Dict[str, Any]] = None, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Searches for colleges and returns a structured response with data and filtering options. Supports multiple cities, colleges, and courses.
+        With `fields`, only those college summary fields are read and returned.
         """
         logging.info('Searching for colleges with provided filters')
         
@@ -44,7 +89,10 @@ class ExploreService:
                 cities=cities,
                 sort_by=sort_by,
                 order=order,
-                filters=filters
+                filters=filters,
+                projection=projection(fields, SEARCH_FIELD_SOURCES),
+                with_departments=wants(fields, "courses", "courses_count", "placement_range"),
+                with_cutoffs=wants(fields, "cet_cutoff_range")
             )
 
             colleges = result.get("colleges", [])
@@ -100,6 +148,8 @@ class ExploreService:
                 if college.get("course_not_found") and college.get("course_not_found_message"):
                     college_summary["course_not_found"] = True
                     college_summary["course_not_found_message"] = college.get("course_not_found_message")
+                if fields is not None:
+                    college_summary = prune(college_summary, fields + ["course_not_found", "course_not_found_message"])
                 colleges_data.append(college_summary)
 
             return {
@@ -115,6 +165,114 @@ class ExploreService:
             logging.error(f"Unexpected error in search_colleges: {str(e)}", exc_info=True)
             raise Exception(f"Failed to search colleges: {str(e)}")
     
+    def _sj_codes(self, cutoff_docs: List[dict]) -> List[int]:
+        """Helper method to collect the distinct integer SJ_Institute_Codes of cutoff documents"""
+        sj_codes = set()
+        for doc in cutoff_docs:
+            try:
+                sj_codes.add(int(doc.get("SJ_Institute_Code")))
+            except (ValueError, TypeError):
+                continue
+        return list(sj_codes)
+
+    def _recommendation_item(self, doc: dict, sj_code: int, course_name: Optional[str], cutoff: float, admission_probability: int, probability_message: str) -> dict:
+        """Helper method to build one compact Dream/Reach/Match/Safety entry; the college is referenced by sj_code"""
+        return {
+            "sj_code": sj_code,
+            "choice_code": doc.get("Choice_Code"),
+            "course": course_name,
+            "cutoff": round(float(cutoff), 2) if cutoff is not None else None,
+            "admission_probability": admission_probability,
+            "probability_message": probability_message
+        }
+
+    def _recommendation_colleges(self, items: List[dict], metas: Dict[int, dict]) -> Dict[str, dict]:
+        """Helper method to collect one summary per college referenced by the items, keyed by str(sj_code)"""
+        colleges = {}
+        for item in items:
+            key = str(item["sj_code"])
+            if key not in colleges and item["sj_code"] in metas:
+                meta = metas[item["sj_code"]]
+                colleges[key] = {field: meta.get(field) for field in RECOMMENDATION_COLLEGE_FIELDS}
+        return colleges
+
+    def _compact_recommendations(self, response: Optional[CollegeRecommendationGroupResponse]) -> Optional[CollegeRecommendationGroupResponse]:
+        """
+        Convert recommendations stored before the compact format (every item embedding the full
+        institute_meta under "college") into compact items plus the `colleges` dictionary.
+        """
+        if response is None:
+            return None
+        for group in RECOMMENDATION_GROUPS:
+            items = getattr(response, group)
+            if not any("college" in item for item in items):
+                continue
+            compact = []
+            for item in items:
+                college = item.get("college")
+                if not college:
+                    compact.append(item)
+                    continue
+                sj_code = college.get("SJ_Institute_Code")
+                response.colleges.setdefault(str(sj_code), {field: college.get(field) for field in RECOMMENDATION_COLLEGE_FIELDS})
+                if response.cet_percentile is None:
+                    response.cet_percentile = item.get("cet_percentile")
+                    response.category = item.get("category")
+                compact.append(self._recommendation_item(item, sj_code, item.get("course"), item.get("cutoff"), item.get("admission_probability"), item.get("probability_message")))
+            setattr(response, group, compact)
+        return response
+
+    async def _expand_recommendations(self, response: Optional[CollegeRecommendationGroupResponse], expand: Optional[str], fields: Optional[List[str]] = None) -> Optional[CollegeRecommendationGroupResponse]:
+        """
+        With expand=college, hydrate every item with its full institute_meta document from the
+        catalog (one batched lookup) under "college", and repeat the request's cet_percentile
+        and category on it, as the list was shaped before.
+        "college.<field>" entries in `fields` limit the institute_meta fields that are read.
+        """
+        if response is None or expand != "college" or not wants(fields, "college"):
+            return response
+        college_projection = None
+        if fields is not None and "college" not in fields:
+            college_projection = {"_id": 0, **{field.split(".", 1)[1]: 1 for field in fields if field.startswith("college.")}}
+        sj_codes = [item["sj_code"] for group in RECOMMENDATION_GROUPS for item in getattr(response, group)]
+        metas = await self.explore_repository.get_institute_meta_by_sj_codes(sj_codes, projection=college_projection)
+        for group in RECOMMENDATION_GROUPS:
+            setattr(response, group, [
+                {**item, "college": metas.get(item["sj_code"]), "cet_percentile": response.cet_percentile, "category": response.category}
+                for item in getattr(response, group)
+            ])
+        return response
+
+    def _recommendation_projection(self, fields: Optional[List[str]]) -> Optional[Dict[str, int]]:
+        """
+        Projection of a stored recommendation document for the requested item fields. sj_code is
+        always read (colleges are looked up by it) and so are the parts of old-format items
+        that `_compact_recommendations` converts.
+        """
+        if fields is None:
+            return None
+        item_fields = {"sj_code", "cet_percentile", "category"}
+        item_fields.update(field.split(".", 1)[0] for field in fields if not field.startswith("college"))
+        item_fields.update(f"college.{field}" for field in RECOMMENDATION_COLLEGE_FIELDS)
+        result = {"_id": 0, **{field: 1 for field in RECOMMENDATION_DOCUMENT_FIELDS}}
+        for group in RECOMMENDATION_GROUPS:
+            result.update({f"{group}.{field}": 1 for field in item_fields})
+        return result
+
+    def _select_recommendation_fields(self, response: Optional[CollegeRecommendationGroupResponse], fields: Optional[List[str]]) -> Optional[CollegeRecommendationGroupResponse]:
+        """
+        Prune every Dream/Reach/Match/Safety item to `fields`; "college.<field>" entries also
+        prune the summaries in the `colleges` dictionary.
+        """
+        if response is None or fields is None:
+            return response
+        for group in RECOMMENDATION_GROUPS:
+            setattr(response, group, prune(getattr(response, group), fields))
+        college_fields = [field.split(".", 1)[1] for field in fields if field.startswith("college.")]
+        if college_fields:
+            response.colleges = {sj_code: prune(college, college_fields) for sj_code, college in response.colleges.items()}
+        return response
+
     def _get_placement_range(self, college: Dict[str, Any]) -> Dict[str, Optional[float]]:
         """Helper method to extract placement range from college data"""
         placement_min = None
@@ -275,27 +433,32 @@ class ExploreService:
         else:
             return 10, "Extremely low chances - Your score is more than 10 points below the cutoff"
 
-    async def get_college_report_by_college_name(self, id: int) -> dict:
+    async def get_college_report_by_college_name(self, id: int, fields: Optional[List[str]] = None) -> dict:
         """
         Generate a detailed college report by college_name, including meta, departments, and cutoffs.
         The response merges all institute_meta fields at the top level, along with custom blocks.
+        With `fields`, only the institute_meta fields behind them are read, departments and cutoffs
+        only when Departments / Engineering_Streams are requested, and the report is pruned to them.
         """
         try:
             # Fetch meta
-            meta = await self.explore_repository.get_institute_meta_by_sj_code(id)
+            meta = await self.explore_repository.get_institute_meta_by_sj_code(id, projection=projection(fields, REPORT_FIELD_SOURCES, always=["SJ_Institute_Code"]))
             if not meta:
                 raise LookupError(f"No college found with id: {id}")
 
             # Fetch departments
-            departments = await self.explore_repository.get_departments_by_college_name(id)
+            departments = []
+            if wants(fields, "Departments", "Engineering_Streams"):
+                departments = await self.explore_repository.get_departments_by_college_name(id)
 
             # Build Departments list as per schema
             departments_out = []
             placement_percentages = []
+            # Latest cutoff for every department's course in one query (always a dict or None per course)
+            cutoffs_by_course = await self.explore_repository.get_latest_cutoffs_by_courses(id, [dept.get("Courses_Offered") for dept in departments])
             for dept in departments:
                 course_name = dept.get("Courses_Offered")
-                # Fetch latest cutoff for this course (always a dict or None)
-                cut_cet = await self.explore_repository.get_cutoff_by_college_name_and_course(id, course_name)
+                cut_cet = cutoffs_by_course.get(course_name)
                 # CET block
                 gopens_cutoff = None
                 if cut_cet:
@@ -365,7 +528,7 @@ class ExploreService:
                 "Location": location,
                 "Departments": departments_out
             }
-            return response
+            return prune(response, fields)
         except Exception as e:
             logging.error(f"Error generating college report for {id}: {e}")
             raise
@@ -383,7 +546,7 @@ class ExploreService:
             logging.error(f"Error in service while fetching all cutoff data: {e}")
             raise
 
-    async def generate_college_recommendations(self, payload: CollegeRecommendationRequest, email: str) -> CollegeRecommendationGroupResponse:
+    async def generate_college_recommendations(self, payload: CollegeRecommendationRequest, email: str, expand: Optional[str] = None, fields: Optional[List[str]] = None) -> CollegeRecommendationGroupResponse:
         """
         Generate college recommendations based on category, courses, percentile, and location.
         Returns grouped arrays: Dream, Reach, Match, Safety.
@@ -411,6 +574,7 @@ class ExploreService:
         results = []
         is_payment = await self.payment_repository.is_user_payment_successful(email)
         accept_payment = await self.payment_repository.get_accept_payment_from_config() 
+        metas = await self.explore_repository.get_institute_meta_by_sj_codes(self._sj_codes(cutoff_data), locations)
         for doc in cutoff_data:
             try:
                 sj_code = doc.get("SJ_Institute_Code")
@@ -428,18 +592,12 @@ class ExploreService:
                     continue
                 percentile_diff = cet_percentile - last_year_cutoff
                 admission_probability, probability_message = self._calculate_probability(percentile_diff, cet_percentile)
-                # Fetch college meta with optional location filtering
-                meta = await self.explore_repository.get_institute_meta_by_sj_code(sj_code_int, locations)
-
-                result = {
-                    "college": meta,
-                    "course": course_name,
-                    "admission_probability": admission_probability,
-                    "probability_message": probability_message,
-                    "cet_percentile": cet_percentile,
-                    "category": category,
-                    "cutoff": round(float(last_year_cutoff), 2)
-                }
+                # College meta (with optional location filtering) was fetched in one batch above
+                meta = metas.get(sj_code_int)
+                if meta is None:
+                    continue
+
+                result = self._recommendation_item(doc, sj_code_int, course_name, last_year_cutoff, admission_probability, probability_message)
                 results.append(result)
             except Exception as e:
                 continue
@@ -477,13 +635,16 @@ class ExploreService:
             Reach=reach,
             Match=match,
             Safety=safety,
+            colleges=self._recommendation_colleges(dream + reach + match + safety, metas),
+            cet_percentile=cet_percentile,
+            category=category,
             is_payment=is_payment,
             accept_payment=accept_payment
         )
         await self.recommendation_repository.store_college_recommendations(college_recommendation)   
-        return college_recommendation
+        return self._select_recommendation_fields(await self._expand_recommendations(college_recommendation, expand, fields), fields)
 
-    async def generate_college_recommendations_round(self, payload: CollegeRecommendationRequest, email: str) -> CollegeRecommendationGroupResponse:
+    async def generate_college_recommendations_round(self, payload: CollegeRecommendationRequest, email: str, expand: Optional[str] = None, fields: Optional[List[str]] = None) -> CollegeRecommendationGroupResponse:
         """
         Generate college recommendations for round 2 based on the previous round's choice.
         """
@@ -513,6 +674,7 @@ class ExploreService:
             cet_cutoff_data = await self.explore_repository.get_courses_cutoff(cet_courses,round_no,last_year_round_cutoff,category,location)
         # meta = await self.explore_repository.get_institute_meta_by_sj_code(sj_code_int, locations)
         results = []
+        metas = await self.explore_repository.get_institute_meta_by_sj_codes(self._sj_codes(cet_cutoff_data), location)
 
         for doc in cet_cutoff_data:
             try:
@@ -531,18 +693,12 @@ class ExploreService:
                     continue
                 percentile_diff = cet_percentile - last_year_cutoff
                 admission_probability, probability_message = self._calculate_probability(percentile_diff, cet_percentile)
-                # Fetch college meta with optional location filtering
-                meta = await self.explore_repository.get_institute_meta_by_sj_code(sj_code_int, location)
-
-                result = {
-                    "college": meta,
-                    "course": course_name,
-                    "admission_probability": admission_probability,
-                    "probability_message": probability_message,
-                    "cet_percentile": cet_percentile,
-                    "category": category,
-                    "cutoff": round(float(last_year_cutoff),2)
-                }
+                # College meta (with optional location filtering) was fetched in one batch above
+                meta = metas.get(sj_code_int)
+                if meta is None:
+                    continue
+
+                result = self._recommendation_item(doc, sj_code_int, course_name, last_year_cutoff, admission_probability, probability_message)
                 results.append(result)
             except Exception as e:
                 continue
@@ -580,13 +736,16 @@ class ExploreService:
             Reach=reach,
             Match=match,
             Safety=safety,
+            colleges=self._recommendation_colleges(dream + reach + match + safety, metas),
+            cet_percentile=cet_percentile,
+            category=category,
             is_payment=is_payment,
             accept_payment=accept_payment
         )
         await self.recommendation_repository.store_college_recommendations(college_recommendation,round_no)   
-        return college_recommendation
+        return self._select_recommendation_fields(await self._expand_recommendations(college_recommendation, expand, fields), fields)
 
-    async def generate_college_recommendations_diploma(self, payload: CollegeRecommendationRequest, email: str) -> CollegeRecommendationGroupResponse:
+    async def generate_college_recommendations_diploma(self, payload: CollegeRecommendationRequest, email: str, expand: Optional[str] = None, fields: Optional[List[str]] = None) -> CollegeRecommendationGroupResponse:
         """
         Generate college recommendations for diploma based on the previous round's choice.
         """
@@ -634,6 +793,7 @@ class ExploreService:
         else:
             cet_cutoff_data = await self.explore_repository.get_cutoff_by_category_course_location(str(category), cet_courses,location,round_no=round_no,diploma=True)
         results = []
+        metas = await self.explore_repository.get_institute_meta_by_sj_codes(self._sj_codes(cet_cutoff_data), location)
         for doc in cet_cutoff_data:
             try:
                 sj_code = doc.get("SJ_Institute_Code")
@@ -651,18 +811,12 @@ class ExploreService:
                     continue
                 percentile_diff = cet_percentile - last_year_cutoff
                 admission_probability, probability_message = self._calculate_probability(percentile_diff, cet_percentile)
-                # Fetch college meta with optional location filtering
-                meta = await self.explore_repository.get_institute_meta_by_sj_code(sj_code_int, location)
-
-                result = {
-                    "college": meta,
-                    "course": course_name,
-                    "admission_probability": admission_probability,
-                    "probability_message": probability_message,
-                    "cet_percentile": cet_percentile,
-                    "category": category,
-                    "cutoff": round(float(last_year_cutoff),2)
-                }
+                # College meta (with optional location filtering) was fetched in one batch above
+                meta = metas.get(sj_code_int)
+                if meta is None:
+                    continue
+
+                result = self._recommendation_item(doc, sj_code_int, course_name, last_year_cutoff, admission_probability, probability_message)
                 results.append(result)
             except Exception as e:
                 continue
@@ -700,23 +854,26 @@ class ExploreService:
             Reach=reach,
             Match=match,
             Safety=safety,
+            colleges=self._recommendation_colleges(dream + reach + match + safety, metas),
+            cet_percentile=cet_percentile,
+            category=category,
             is_payment=is_payment,
             accept_payment=accept_payment
         )
         await self.recommendation_repository.store_college_recommendations(college_recommendation,round_no,diploma=True)   
 
-        return college_recommendation    
+        return self._select_recommendation_fields(await self._expand_recommendations(college_recommendation, expand, fields), fields)    
     
-    async def get_college_recommendation_list_diploma(self, round_no: int, email: str) -> CollegeRecommendationGroupResponse:
+    async def get_college_recommendation_list_diploma(self, round_no: int, email: str, expand: Optional[str] = None, fields: Optional[List[str]] = None) -> CollegeRecommendationGroupResponse:
         """
         Fetch college recommendations for a user by email.
         """
         try:
             is_payment = await self.payment_repository.is_user_payment_successful(email)
 
-            response = await self.recommendation_repository.get_college_recommendations_by_email(email,round_no,diploma=True)
+            response = await self.recommendation_repository.get_college_recommendations_by_email(email,round_no,diploma=True,projection=self._recommendation_projection(fields))
             response.is_payment = is_payment
-            return response
+            return self._select_recommendation_fields(await self._expand_recommendations(self._compact_recommendations(response), expand, fields), fields)
         except Exception as e:
             logging.error(f"Error in service while fetching college recommendations: {e}")
             raise
@@ -768,16 +925,16 @@ class ExploreService:
             logging.error(f"Error in service while searching college by code: {e}")
             raise
 
-    async def get_college_recommendation_list(self, email: str) -> CollegeRecommendationGroupResponse:
+    async def get_college_recommendation_list(self, email: str, expand: Optional[str] = None, fields: Optional[List[str]] = None) -> CollegeRecommendationGroupResponse:
         """
         Fetch college recommendations for a user by email.
         """
         try:
             is_payment = await self.payment_repository.is_user_payment_successful(email)
 
-            response = await self.recommendation_repository.get_college_recommendations_by_email(email)
+            response = await self.recommendation_repository.get_college_recommendations_by_email(email,projection=self._recommendation_projection(fields))
             response.is_payment = is_payment
-            return response
+            return self._select_recommendation_fields(await self._expand_recommendations(self._compact_recommendations(response), expand, fields), fields)
         except Exception as e:
             logging.error(f"Error in service while fetching college recommendations: {e}")
             raise
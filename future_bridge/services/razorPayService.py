@@ -1,14 +1,15 @@
 import logging
 import os
 from future_bridge.repositories.paymentRepository import PaymentRepository
-import razorpay
 from future_bridge.models.razorPayModel import RazorPay
-from future_bridge.utils.PaymentProcessor import PaymentProcessor 
+from future_bridge.utils.PaymentProcessor import PaymentProcessor, get_razorpay_client
 from future_bridge.schema.paymentSchema import PaymentRequestbody
+from future_bridge.utils.requestTiming import timed_methods
 
 KEY = os.getenv('RAZOR_PAY_KEY')
 SECRET = os.getenv('RAZOR_PAY_SECRET')
 
+@timed_methods("service")
 class PaymentService:
     
     def __init__(self) -> None:
@@ -75,7 +76,7 @@ class PaymentService:
         email = user.email
         
         if payment is None:
-            client = razorpay.Client(auth=(KEY, SECRET))
+            client = get_razorpay_client()
             DATA = {"amount": amount*100, "currency": "INR"}
             response = client.order.create(data=DATA)
             payment = self.processPayment({
@@ -101,7 +102,7 @@ class PaymentService:
         
     def verifyPaymentDetails(self, req_body: dict):
         logging.info('Verifying payment details')
-        client = razorpay.Client(auth=(KEY, SECRET))
+        client = get_razorpay_client()
 
         return client.utility.verify_payment_signature({
             'razorpay_order_id': req_body.get('order_id'),
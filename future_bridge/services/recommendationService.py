@@ -1,6 +1,8 @@
 from future_bridge.repositories.recommendationRepository import RecommendationRepository
 from future_bridge.schema.recommendationSchema import RecommendationRequest
+from future_bridge.utils.requestTiming import timed_methods
 
+@timed_methods("service")
 class RecommendationService:
     def __init__(self):
         self.recommendation_repository = RecommendationRepository()
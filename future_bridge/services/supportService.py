@@ -1,22 +1,37 @@
+import asyncio
+import base64
 import csv
 import io
 import logging
 import os
 import uuid
+import zlib
 from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, UploadFile
-from future_bridge.config.config import Settings
-from future_bridge.models.supportModel import Support, TicketStatus
+from future_bridge.config.config import Settings, settings
+from future_bridge.models.supportModel import BulkAction, Support, TicketStatus
 from future_bridge.repositories.supportRepository import SupportRepository, get_support_repository
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Any, List, Optional
 from future_bridge.schema.supportSchema import SupportRequest
-from azure.storage.blob.aio import BlobServiceClient
 
-from future_bridge.utils.sendEmail import MicrosoftEmailService
+from future_bridge.utils.blobStorage import get_blob_service_client
+from future_bridge.utils.sendEmail import MicrosoftEmailService, get_microsoft_email_service
+from future_bridge.utils.ticketSearch import ticket_search
+from future_bridge.utils.requestTiming import timed_methods
+
+if TYPE_CHECKING:
+    from azure.storage.blob.aio import BlobServiceClient
 
 # Define IST timezone (UTC +5:30)
 IST = timezone(timedelta(hours=5, minutes=30))
 
+# Exported ticket fields (also the Mongo projection) and their CSV column titles
+EXPORT_FIELDS = ["ticket_id", "username", "name", "status", "created_at", "is_paid", "product_type"]
+EXPORT_HEADERS = ["Ticket ID", "Username", "Name", "Status", "Created At", "Is Paid", "Product Type"]
+# CSV bytes buffered before a chunk is handed to the response
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+@timed_methods("service")
 class SupportService:
     """
     Service layer for handling support ticket operations.
@@ -26,20 +41,62 @@ class SupportService:
     """
     def __init__(self, support_repository: SupportRepository):
         self.support_repository = support_repository
-        self.blob_service_client = BlobServiceClient.from_connection_string(Settings.CONNECTION_STRING)
         self.container_name = Settings.AZURE_BLOB_CONTAINER
-        self.email_service = MicrosoftEmailService()
 
-    async def upload_to_blob(self, filesuname: str, data: bytes) -> str:
+    @property
+    def blob_service_client(self) -> "BlobServiceClient":
+        # Process-wide client, only created once an endpoint actually touches blob storage
+        return get_blob_service_client()
+
+    @property
+    def email_service(self) -> "MicrosoftEmailService":
+        # Process-wide mail client; the AAD token is fetched lazily and cached
+        return get_microsoft_email_service()
+
+    async def upload_stream_to_blob(self, file: UploadFile, max_size_bytes: int) -> str:
         """
-        Upload a file to Azure Blob Storage and return the blob URL.
+        Stream an uploaded file to Azure Blob Storage as a block blob and return the blob URL.
+
+        The file is read in `BLOB_UPLOAD_BLOCK_SIZE` chunks and each chunk is staged as
+        a block right away, so at most one chunk per attachment is held in memory.
+        The size limit is checked as the chunks arrive: an oversized file is rejected
+        before the block list is committed, and the staged blocks are never turned
+        into a blob (Azure discards uncommitted blocks on its own).
         """
-        ext = os.path.splitext(filename)[1]
+        from azure.storage.blob import BlobBlock, ContentSettings
+
+        ext = os.path.splitext(file.filename)[1]
         unique_name = f"{uuid.uuid4().hex}{ext}"
         blob_client = self.blob_service_client.get_blob_client(container=self.container_name, blob=unique_name)
-        await blob_client.upload_blob(data, overwrite=True)
+
+        block_list = []
+        total_size = 0
+        while True:
+            chunk = await file.read(settings.BLOB_UPLOAD_BLOCK_SIZE)
+            if not chunk:
+                break
+            total_size += len(chunk)
+            if total_size > max_size_bytes:
+                raise ValueError(f"{file.filename} exceeds {max_size_bytes // (1024 * 1024)}MB limit.")
+            # Block IDs must be base64 strings of equal length within a blob
+            block_id = base64.b64encode(f"{len(block_list):08d}".encode()).decode()
+            await blob_client.stage_block(block_id=block_id, data=chunk, length=len(chunk))
+            block_list.append(BlobBlock(block_id=block_id))
+
+        content_settings = ContentSettings(content_type=file.content_type) if file.content_type else None
+        await blob_client.commit_block_list(block_list, content_settings=content_settings)
         return blob_client.url
 
+    async def delete_blob_by_url(self, blob_url: str) -> None:
+        """
+        Best-effort removal of an uploaded attachment (used when a sibling upload fails).
+        """
+        try:
+            blob_name = blob_url.rsplit("/", 1)[-1]
+            await self.blob_service_client.get_blob_client(container=self.container_name, blob=blob_name).delete_blob()
+        except Exception as e:
+            logging.warning(f"Failed to delete orphaned attachment {blob_url}: {e}")
+
     async def store_user_tickets(self, support_request: SupportRequest, browser_info: str, files: list) -> Dict[str, Any]:
         """
         Store user tickets in the database
@@ -56,6 +113,8 @@ class SupportService:
         
         # Store new feedback
         inserted_ticket = await self.support_repository.store_user_tickets(user_ticket)
+        if inserted_ticket:
+            ticket_search.on_ticket_created(inserted_ticket)
 
         # Send confirmation email
         await self.send_ticket_copy(user_ticket)
@@ -101,88 +160,133 @@ class SupportService:
         }
 
         logging.info(f"Sending ticket email to {ticket_data.username} and support...")
-        response = MicrosoftEmailService().process_request(send_user_ticket_payload)
+        response = self.email_service.process_request(send_user_ticket_payload)
         logging.info(f"Email response: {response}")
 
-    async def get_all_tickets(self, status: Optional[str], sort: str, page: int, limit: int):
+    async def get_all_tickets(self, status: Optional[str], sort: str, page: int, limit: int, cursor: Optional[str] = None):
         """
         Retrieve all support tickets with optional filters, sorting, and pagination.
 
         Args:
             status (str, optional): Ticket status filter.
             sort (str): Sorting field and direction (e.g., "created_at:desc").
-            page (int): Current page number.
+            page (int): Current page number, used only when no cursor is given.
             limit (int): Number of tickets per page.
+            cursor (str, optional): `next_cursor` of the previous page.
 
         Returns:
             dict: Paginated ticket list and metadata.
         """
-        return await self.support_repository.get_all_tickets(status, sort, page, limit)
+        return await self.support_repository.get_all_tickets(status, sort, page, limit, cursor)
     
     async def get_ticket_by_id(self, ticket_id: str):
         """
-        Service layer to fetch a single ticket by ticket_id.
+        Service layer to fetch a single ticket by ticket_id with all of its comments, oldest first.
         """
         return await self.support_repository.get_ticket_by_id(ticket_id)
 
-    async def export_tickets_as_csv(self, status: Optional[str], ticket_ids: Optional[List[str]]):
+    async def export_tickets_as_csv(self, status: Optional[str], ticket_ids: Optional[List[str]], compress: bool = False) -> AsyncIterator[bytes]:
         """
-        Generate a CSV output for support tickets based on filters.
+        Stream support tickets matching the filters as CSV.
+
+        The first ticket is fetched before returning so an empty export can still
+        be answered with a 404; everything after that is produced lazily while the
+        response is being sent.
 
         Args:
             status (Optional[str]): Filter tickets by status.
             ticket_ids (Optional[List[str]]): Specific ticket IDs to export.
+            compress (bool): Gzip the CSV on the fly.
 
         Returns:
-            io.StringIO: In-memory CSV file stream.
+            AsyncIterator[bytes]: CSV (or gzip) chunks for a StreamingResponse.
         """
         try:
-            tickets = await self.support_repository.get_tickets_for_export(status, ticket_ids)
-
-            if not tickets:
-                raise HTTPException(status_code=404, detail="No tickets found for export")
-
-            # Prepare CSV in memory
-            output = io.StringIO()
-            writer = csv.writer(output)
-            writer.writerow(["Ticket ID", "Username", "Name", "Status", "Created At", "Is Paid", "Product Type"])
-
-            for t in tickets:
-                writer.writerow([
-                    t.get("ticket_id", ""),
-                    t.get("username", ""),
-                    t.get("name", ""),
-                    t.get("status", ""),
-                    t.get("created_at", ""),
-                    t.get("is_paid", ""),
-                    t.get("product_type", "")
-                ])
-
-            output.seek(0)
-            return output
-
-        except HTTPException:
-            raise
+            tickets = self.support_repository.iter_tickets_for_export(status, ticket_ids, EXPORT_FIELDS)
+            first_ticket = await tickets.__anext__()
+        except StopAsyncIteration:
+            raise HTTPException(status_code=404, detail="No tickets found for export")
         except Exception as e:
             logging.error(f"Error generating CSV in SupportService: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Error generating CSV: {e}")
 
+        chunks = self._csv_chunks(first_ticket, tickets)
+        return self._gzip_chunks(chunks) if compress else chunks
 
-    async def get_tickets_for_export(self, status: Optional[str], ticket_ids: Optional[List[str]]):
+    @staticmethod
+    async def _csv_chunks(first_ticket: dict, tickets: AsyncIterator[dict]) -> AsyncIterator[bytes]:
         """
-        Fetch support tickets for CSV export (internal use).
+        Encode tickets as CSV rows, yielding roughly EXPORT_CHUNK_SIZE bytes at a time.
         """
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(EXPORT_HEADERS)
+
+        async def all_tickets():
+            yield first_ticket
+            async for ticket in tickets:
+                yield ticket
+
         try:
-            return await self.support_repository.get_tickets_for_export(status, ticket_ids)
+            async for t in all_tickets():
+                writer.writerow([t.get(field, "") for field in EXPORT_FIELDS])
+                if output.tell() >= EXPORT_CHUNK_SIZE:
+                    yield output.getvalue().encode("utf-8")
+                    output.seek(0)
+                    output.truncate()
+            if output.tell():
+                yield output.getvalue().encode("utf-8")
         except Exception as e:
-            logging.error(f"Error in SupportService.get_tickets_for_export: {e}", exc_info=True)
+            # Headers are already sent; the client sees a truncated download
+            logging.error(f"Error while streaming CSV export: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    async def _gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Gzip a byte stream incrementally.
+        """
+        compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+        async for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
     async def perform_bulk_action(self, action: str, ticket_ids: List[str]):
-        return await self.support_repository.perform_bulk_action(action, ticket_ids)
+        # Deleted tickets leave the search index chunk by chunk, as each chunk succeeds
+        on_chunk_applied = ticket_search.on_tickets_deleted if action == BulkAction.DELETE else None
+        return await self.support_repository.perform_bulk_action(action, ticket_ids, on_chunk_applied)
+
+    async def search_tickets(self, query: str, limit: int = 20) -> Dict[str, Any]:
+        """
+        Full-text search over ticket ID, name, username, details and comments.
+
+        Args:
+            query (str): Search terms; each term also matches as a prefix with the in-process index.
+            limit (int): Maximum number of tickets to return.
+
+        Returns:
+            dict: Matching tickets (without comments) best first, each with its `score`.
+        """
+        ranked = await ticket_search.search(query, limit)
+        tickets = await self.support_repository.get_tickets_by_ids([ticket_id for ticket_id, _ in ranked])
+        results = []
+        for ticket_id, score in ranked:
+            ticket = tickets.get(ticket_id)
+            # Deleted by another worker since the index was built
+            if ticket:
+                results.append({**ticket, "score": score})
+        return {"query": query, "count": len(results), "tickets": results}
 
     async def get_support_metrics(self):
         return await self.support_repository.get_support_metrics()
+
+    async def get_ticket_comments(self, ticket_id: str, page: int, limit: int):
+        """
+        Fetch one page of a ticket's comments (newest first).
+        """
+        return await self.support_repository.get_ticket_comments(ticket_id, page, limit)
         
 
     
@@ -193,6 +297,7 @@ class SupportService:
         """
         # Call repository function
         updated_ticket = await self.support_repository.add_comment_to_ticket(user_email, ticket_id, comment, attachments)
+        ticket_search.on_comment_added(ticket_id, comment)
 
         # Send email to admin about user's comment
         # await self.send_email_to_admin(Support(**updated_ticket["ticket"]), subject_prefix="Comment Added", comment=comment)
@@ -209,6 +314,7 @@ class SupportService:
         """
         # Call repository function for admin comment
         updated_ticket = await self.support_repository.add_comment_to_ticket_by_admin(admin_email, ticket_id, comment)
+        ticket_search.on_comment_added(ticket_id, comment)
 
 
         await self._notify_after_comment(updated_ticket.get("ticket"), subject_prefix="Support Comment", comment=comment, actor="support", actor_email=admin_email)
@@ -241,7 +347,7 @@ class SupportService:
                 ticket_id = ticket.get("ticket_id") or ticket.get("_id")
                 if ticket_id:
                     try:
-                        full_ticket = await self.get_ticket_by_id(ticket_id)
+                        full_ticket = await self.support_repository.get_ticket_by_id(ticket_id, with_comments=False)
                         if full_ticket:
                             try:
                                 ticket_model = Support(**full_ticket)
@@ -372,12 +478,28 @@ class SupportService:
     # Simple service layer function
     # It calls the repository (supportRepository.py) to interact with MongoDB.
     # Keeps business logic clean and reusable.
-    async def get_user_tickets(self, user_email: str):
+    async def get_user_tickets(self, user_email: str, limit: int = 20, cursor: Optional[str] = None):
         """
-        Retrieve all tickets for a given user.
+        Retrieve one page of ticket summaries for a given user.
+        """
+        return await self.support_repository.get_user_tickets(user_email, limit, cursor)
+
+    async def list_user_tickets(self, user_email: str):
+        """
+        Retrieve every ticket of a given user with its comments (unpaginated /my_tickets).
+        """
+        return await self.support_repository.list_user_tickets(user_email)
+
+    async def get_user_ticket(self, user_email: str, ticket_id: str, comments_limit: int = 20):
         """
-        tickets = await self.support_repository.get_user_tickets(user_email)
-        return tickets
+        Retrieve one of the user's tickets with the newest page of its comments.
+        Returns None if the ticket does not exist or belongs to another user.
+        """
+        ticket = await self.support_repository.get_user_ticket(user_email, ticket_id)
+        if ticket is None:
+            return None
+        ticket["comments"] = await self.support_repository.get_ticket_comments(ticket_id, 1, comments_limit)
+        return ticket
     
 
 
@@ -385,26 +507,74 @@ class SupportService:
         """
         Validate file extensions, size, and upload to Azure Blob Storage.
         Returns a list of blob IDs.
+
+        Extensions are checked for every file before anything is uploaded. The files are
+        then streamed concurrently; if one of them fails (e.g. exceeds the size limit) the
+        other uploads are cancelled and any attachment already stored is removed again.
         """
         ALLOWED_EXTENSIONS = {"jpeg", "jpg", "png", "mp4", "mov", "avi"}
 
         if files and len(files) > max_files:
             raise ValueError(f"Max {max_files} attachments allowed.")
 
-        blob_ids = []
         for file in files:
             ext = file.filename.split(".")[-1].lower()
             if ext not in ALLOWED_EXTENSIONS:
                 raise ValueError(f"Invalid file type: {file.filename}. Allowed: {ALLOWED_EXTENSIONS}")
 
-            contents = await file.read()
-            if len(contents) > max_size_mb * 1024 * 1024:
-                raise ValueError(f"{file.filename} exceeds {max_size_mb}MB limit.")
-
-            blob_id = await self.upload_to_blob(file.filename, contents)
-            blob_ids.append(blob_id)
-
-        return blob_ids
+        max_size_bytes = max_size_mb * 1024 * 1024
+        tasks = [asyncio.create_task(self.upload_stream_to_blob(file, max_size_bytes)) for file in files]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        failed = next((task for task in tasks if task in done and task.exception()), None)
+        if failed is None:
+            return [task.result() for task in tasks]
+
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        uploaded = [task.result() for task in done if not task.exception()]
+        await asyncio.gather(*(self.delete_blob_by_url(url) for url in uploaded))
+        raise failed.exception()
 
 def get_support_service(support_repository: SupportRepository = Depends(get_support_repository)) -> SupportService:
     return SupportService(support_repository) 
+
+
+metrics_reconcile_task: Optional[asyncio.Task] = None
+
+
+async def _reconcile_support_metrics_periodically(interval_seconds: int):
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await SupportRepository().reconcile_support_metrics()
+        except Exception as e:
+            logging.error(f"Support metrics reconcile failed: {e}", exc_info=True)
+
+
+def start_support_metrics_reconciler():
+    """
+    Start the background task that periodically reconciles the support metrics
+    counter (called on application startup).
+    """
+    global metrics_reconcile_task
+    if settings.SUPPORT_METRICS_RECONCILE_SECONDS > 0 and metrics_reconcile_task is None:
+        metrics_reconcile_task = asyncio.create_task(
+            _reconcile_support_metrics_periodically(settings.SUPPORT_METRICS_RECONCILE_SECONDS)
+        )
+
+
+async def stop_support_metrics_reconciler():
+    """
+    Cancel the reconcile task (called on application shutdown).
+    """
+    global metrics_reconcile_task
+    if metrics_reconcile_task is not None:
+        metrics_reconcile_task.cancel()
+        try:
+            await metrics_reconcile_task
+        except asyncio.CancelledError:
+            pass
+        metrics_reconcile_task = None
@@ -5,7 +5,9 @@ from future_bridge.services.errorService import UserAlreadyExistsError
 from future_bridge.models.userModel import User,Feedback
 from future_bridge.schema.userSchema import UserRequest,FeedBack,RoundPreferences
 from future_bridge.schema.recommendationSchema import CollegeDetails
+from future_bridge.utils.requestTiming import timed_methods
 
+@timed_methods("service")
 class UserService:
     def __init__(self, user_repository: UserRepository):
         self.user_repository = user_repository
@@ -21,7 +21,6 @@ def decode_jwt(token):
         
         # Decode the JWT token to get the payload (without verification, or with verification)
         payload = jwt.decode(token, api_token, algorithms=['HS256'], options={"verify_exp": True})
-        print(payload)
         return payload
     except jwt.ExpiredSignatureError:
         return None
@@ -2,13 +2,25 @@ from datetime import datetime
 import time
 import logging
 import os
-import razorpay
-
-from future_bridge.utils.sendEmail import MicrosoftEmailService
 
 KEY = os.getenv('RAZOR_PAY_KEY')
 SECRET = os.getenv('RAZOR_PAY_SECRET')
 
+_razorpay_client = None
+
+
+def get_razorpay_client():
+    """
+    Return the process-wide Razorpay client. The SDK is imported and the client
+    (with its HTTP session) built on first use instead of at import time.
+    """
+    global _razorpay_client
+    if _razorpay_client is None:
+        import razorpay
+        _razorpay_client = razorpay.Client(auth=(KEY, SECRET))
+    return _razorpay_client
+
+
 class PaymentProcessor:
     def __init__(self, timeout=10*60, interval=5):
         self.timeout = timeout
@@ -17,20 +29,20 @@ class PaymentProcessor:
     def get_payment_details_by_order_id(self, order_id: str):
         logging.info(f'fetching payment details for {order_id}')
         try:
-            client = razorpay.Client(auth=(KEY, SECRET))
+            client = get_razorpay_client()
             return client.order.payments(order_id)
         except Exception as e:
-            print(e)
+            logging.error(f"Error fetching payments of order {order_id}: {e}")
             return None
         
     def get_payment_details_by_payment_id(self,payment_id:str):
         logging.info('fetching payment details')
         try:
-            client = razorpay.Client(auth=(KEY, SECRET))
+            client = get_razorpay_client()
 
             return client.payment.fetch(payment_id)
         except Exception as e:
-            print(e)
+            logging.error(f"Error fetching payment {payment_id}: {e}")
             return None
 
 
@@ -81,7 +93,8 @@ def sendBypassEmail(username):
         "body_type": "HTML",
         "bcc_recipients": ["admin@skilljourney.in"]
         }
-        email_response=MicrosoftEmailService().process_request(premium_journey_template)
+        from future_bridge.utils.sendEmail import get_microsoft_email_service
+        email_response=get_microsoft_email_service().process_request(premium_journey_template)
         logging.info(f"Email Send to user- {username}- Response {(email_response)}")
     except Exception as e:
         logging.error(f"Email notification for Payment Response Failed {e}")
@@ -96,7 +109,8 @@ def sendEmail(username):
         "body_type": "HTML",
         "bcc_recipients": ["admin@skilljourney.in"]
         }
-        email_response=MicrosoftEmailService().process_request(premium_journey_template)
+        from future_bridge.utils.sendEmail import get_microsoft_email_service
+        email_response=get_microsoft_email_service().process_request(premium_journey_template)
         logging.info(f"Email Send to user- {username}- Response {(email_response)}")
     except Exception as e:
         logging.error(f"Email notification for Payment Response Failed {e}")
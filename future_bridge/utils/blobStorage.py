@@ -0,0 +1,41 @@
+import logging
+from typing import TYPE_CHECKING
+
+from future_bridge.config.config import settings
+
+if TYPE_CHECKING:
+    from azure.storage.blob.aio import BlobServiceClient
+
+blob_service_client = None
+
+
+def get_blob_service_client() -> "BlobServiceClient":
+    """
+    Return the process-wide Azure BlobServiceClient, created on first use.
+
+    The client owns an aiohttp connection pool, so sharing it lets every upload
+    reuse connections instead of building a new client (and pool) per request.
+    The Azure SDK (and aiohttp) is imported here rather than at module import,
+    keeping it off the cold-start path of workers that never upload.
+    """
+    global blob_service_client
+    if blob_service_client is None:
+        if not settings.CONNECTION_STRING:
+            logging.error("Blob storage connection string is not configured. Please check your environment variables.")
+            raise ValueError("Blob storage connection string is not configured. Please check your environment variables.")
+        from azure.storage.blob.aio import BlobServiceClient
+        blob_service_client = BlobServiceClient.from_connection_string(settings.CONNECTION_STRING)
+    return blob_service_client
+
+
+async def close_blob_service_client():
+    """
+    Close the shared client and its connection pool (called on application shutdown).
+    """
+    global blob_service_client
+    if blob_service_client is not None:
+        try:
+            await blob_service_client.close()
+        except Exception as e:
+            logging.warning(f"Error closing BlobServiceClient: {e}")
+        blob_service_client = None
@@ -0,0 +1,10 @@
+import asyncio
+
+from future_bridge.repositories.supportRepository import SupportRepository
+
+# One-off move of comments embedded in support_issues documents into the
+# bucketed support_comments collection:
+#   python -m future_bridge.utils.commentMigration
+if __name__ == "__main__":
+    migrated = asyncio.run(SupportRepository().migrate_embedded_comments())
+    print(f"Migrated comments of {migrated} ticket(s)")
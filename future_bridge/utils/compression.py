@@ -0,0 +1,170 @@
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from future_bridge.config.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "application/problem+json")
+
+
+def skip_compression(endpoint: Callable) -> Callable:
+    """
+    Route decorator opting a single endpoint out of response compression, e.g. for
+    small payloads or bodies that are already compressed. Apply it below the
+    router decorator so the registered endpoint carries the marker.
+    """
+    endpoint.skip_compression = True
+    return endpoint
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header (honouring q-values, brotli
+    first when both are equally acceptable); None when neither is accepted.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    candidates: List[Tuple[float, int, str]] = []
+    if brotli is not None:
+        candidates.append((accepted.get("br", wildcard), 1, "br"))
+    candidates.append((accepted.get("gzip", wildcard), 0, "gzip"))
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+
+class _Compressor:
+    """
+    Incremental gzip / brotli encoder. `compress` flushes after every chunk so a
+    streamed response reaches the client as it is produced.
+    """
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._gzip.flush()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with brotli or gzip, negotiated by the
+    request's Accept-Encoding.
+
+    Complete responses below `minimum_size` bytes are sent as they are, since the
+    encoding overhead outweighs the savings. Streaming responses are compressed
+    chunk by chunk without buffering. Responses that already carry a
+    Content-Encoding, non-text media types and endpoints decorated with
+    `skip_compression` pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                passthrough = not self._should_compress(scope, message)
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=list(start_message.get("headers", [])))
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send({**start_message, "headers": headers.raw})
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    # Streaming: the compressed length is not known up front
+                    del headers["Content-Length"]
+                    await send({**start_message, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": compressor.compress(body), "more_body": True})
+                    return
+                compressed = compressor.compress(body) + compressor.finish()
+                headers["Content-Length"] = str(len(compressed))
+                await send({**start_message, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            if more_body:
+                chunk = compressor.compress(body)
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.compress(body) + compressor.finish()})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _should_compress(scope, message) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        route = scope.get("route")
+        if getattr(getattr(route, "endpoint", None), "skip_compression", False):
+            return False
+        headers = Headers(raw=message.get("headers", []))
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return False
+        return True
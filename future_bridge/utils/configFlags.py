@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from future_bridge.config.config import settings
+from future_bridge.utils.db import get_db
+
+
+class ConfigFlags:
+    """
+    In-memory copy of the feature flags kept in the config collection (e.g.
+    `accept_payment`).
+
+    The flags used to be read from Mongo on every recommendation request. They
+    change rarely, so the collection is loaded once, refreshed after
+    CONFIG_FLAGS_TTL_SECONDS, and can be preloaded when the instance warms up.
+    """
+
+    def __init__(self, ttl_seconds: int = settings.CONFIG_FLAGS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._flags: Dict[str, Any] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def load(self) -> Dict[str, Any]:
+        """
+        Read every flag from the config collection. The first document that
+        carries a flag wins, like the `find_one` lookups this replaces.
+        """
+        async with self._lock:
+            if self._fresh():
+                return self._flags
+            db = await get_db()
+            flags: Dict[str, Any] = {}
+            async for document in db[settings.CONFIG_COLLECTION].find({}, {"_id": 0}):
+                for name, value in document.items():
+                    flags.setdefault(name, value)
+            self._flags = flags
+            self._loaded_at = time.monotonic()
+            logging.info(f"Loaded {len(flags)} config flags")
+            return flags
+
+    async def get(self, name: str, default: Any = None) -> Any:
+        """
+        Return a flag, loading the collection on first use or once the cached copy has expired.
+        """
+        flags = self._flags if self._fresh() else await self.load()
+        return flags.get(name, default)
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached flags so they are reloaded on next use (e.g. after a flag is changed).
+        """
+        self._loaded_at = None
+
+
+config_flags = ConfigFlags()
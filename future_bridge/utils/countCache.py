@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from future_bridge.config.config import settings
+
+
+class CachedCounts:
+    """
+    Stale-while-revalidate cache of document counts per filter.
+
+    An exact `count_documents` walks every matching index entry, which is too
+    expensive to repeat on every page load of a polled list. Counts are served
+    from memory; once older than the TTL the cached value is still returned and
+    a background task refreshes it. Only the very first request for a filter
+    waits for the database. The unfiltered total uses the collection metadata
+    (`estimated_document_count`) and never scans.
+    """
+
+    def __init__(self, ttl_seconds: int = settings.SUPPORT_TICKET_COUNT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._counts: Dict[str, int] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _key(query: Dict[str, Any]) -> str:
+        return repr(sorted(query.items()))
+
+    @staticmethod
+    async def _count(collection, query: Dict[str, Any]) -> int:
+        if not query:
+            return await collection.estimated_document_count()
+        return await collection.count_documents(query)
+
+    async def _refresh(self, key: str, collection, query: Dict[str, Any]) -> Optional[int]:
+        try:
+            count = await self._count(collection, query)
+        except Exception as e:
+            logging.error(f"Failed to refresh cached count for {query}: {e}")
+            return None
+        self._counts[key] = count
+        self._loaded_at[key] = time.monotonic()
+        return count
+
+    async def get(self, collection, query: Dict[str, Any]) -> int:
+        """
+        Return the (possibly slightly stale) number of documents matching `query`.
+        """
+        key = self._key(query)
+        if key not in self._counts:
+            count = await self._refresh(key, collection, query)
+            return count if count is not None else 0
+
+        if time.monotonic() - self._loaded_at[key] >= self.ttl_seconds and key not in self._refreshing:
+            task = asyncio.create_task(self._refresh(key, collection, query))
+            self._refreshing[key] = task
+            task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return self._counts[key]
+
+    def expire(self):
+        """
+        Mark every cached count as stale after a write, so the next read triggers
+        a background refresh while still answering from the previous value.
+        """
+        self._loaded_at = {key: 0.0 for key in self._loaded_at}
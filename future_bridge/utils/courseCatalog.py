@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from future_bridge.config.config import settings
+from future_bridge.utils.configFlags import config_flags
+from future_bridge.utils.db import get_db
+
+# User-facing branch names / abbreviations mapped to the canonical course key
+# fragment they stand for. Terms are looked up after normalization, so the keys
+# here must already be normalized (lower case, single spaces, no punctuation).
+COURSE_ALIASES: Dict[str, List[str]] = {
+    "cse": ["computer science and engineering", "computer engineering"],
+    "cs": ["computer science"],
+    "it": ["information technology"],
+    "entc": ["electronics and telecommunication"],
+    "extc": ["electronics and telecommunication"],
+    "aids": ["artificial intelligence and data science"],
+    "aiml": ["artificial intelligence and machine learning"],
+    "mech": ["mechanical engineering"],
+    "civil": ["civil engineering"],
+    "eee": ["electrical and electronics engineering"],
+}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Config flag bumped by the post-ingestion backfill; every instance reloads its
+# catalog once it sees a new value (within CONFIG_FLAGS_TTL_SECONDS)
+CATALOG_VERSION_FLAG = "course_catalog_version"
+
+
+def normalize_course_key(course_name: Optional[str]) -> str:
+    """
+    Normalize a course/branch name into the `course_key` stored on cutoff documents.
+
+    Lower-cases the name, spells out "&" as "and" and collapses any run of
+    punctuation or whitespace into a single space, e.g.
+    "Electronics & Telecommunication Engg." -> "electronics and telecommunication engg".
+    """
+    if not course_name:
+        return ""
+    key = str(course_name).lower().replace("&", " and ")
+    return _NON_ALNUM.sub(" ", key).strip()
+
+
+class CourseCatalog:
+    """
+    In-memory dictionary of the course keys present in each cutoff collection.
+
+    Course filters used to be case-insensitive `$regex` matches on `Course_Name`,
+    which cannot use an index. The catalog keeps the (small) set of distinct
+    course keys per collection so a user supplied branch name can be expanded,
+    with the same substring semantics, into an indexed `course_key` `$in` lookup.
+    """
+
+    def __init__(self, ttl_seconds: int = settings.COURSE_CATALOG_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._keys: Dict[str, Set[str]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        self._versions: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    def _fresh(self, collection_name: str, version: Any) -> bool:
+        loaded_at = self._loaded_at.get(collection_name)
+        return (
+            loaded_at is not None
+            and time.monotonic() - loaded_at < self.ttl_seconds
+            and self._versions.get(collection_name) == version
+        )
+
+    async def get_keys(self, collection_name: str) -> Set[str]:
+        """
+        Return the known course keys for a collection, loading them on first use,
+        once the cached copy is older than the configured TTL, or once new cutoff
+        data has been ingested (the catalog version flag changed).
+
+        Read-only: `course_key` is set at ingestion by `backfill_course_keys`
+        (`python -m future_bridge.utils.courseCatalog`), never on the request path.
+        """
+        version = await config_flags.get(CATALOG_VERSION_FLAG)
+        if self._fresh(collection_name, version):
+            return self._keys[collection_name]
+
+        async with self._lock:
+            if self._fresh(collection_name, version):
+                return self._keys[collection_name]
+
+            db = await get_db()
+            # Answered from the course_key index (config/indexes.py) without reading documents
+            keys = {key for key in await db[collection_name].distinct("course_key") if key}
+            self._keys[collection_name] = keys
+            self._loaded_at[collection_name] = time.monotonic()
+            self._versions[collection_name] = version
+            logging.info(f"Loaded {len(keys)} course keys for {collection_name}")
+            return keys
+
+    async def expand(self, collection_name: str, courses: Iterable[str]) -> List[str]:
+        """
+        Expand user supplied course names into the matching course keys.
+
+        A key matches when the normalized course name (or one of its aliases)
+        is a substring of it, mirroring the old case-insensitive regex match.
+        """
+        known_keys = await self.get_keys(collection_name)
+        matched: Set[str] = set()
+        for course in courses:
+            term = normalize_course_key(course)
+            if not term:
+                continue
+            fragments = [term] + COURSE_ALIASES.get(term, [])
+            for key in known_keys:
+                if any(fragment in key for fragment in fragments):
+                    matched.add(key)
+        return sorted(matched)
+
+    def invalidate(self, collection_name: Optional[str] = None) -> None:
+        """
+        Drop cached keys so they are reloaded on next use (e.g. after new cutoff data is ingested).
+        Only affects this instance; `mark_ingested` reaches every instance.
+        """
+        if collection_name is None:
+            self._keys.clear()
+            self._loaded_at.clear()
+            self._versions.clear()
+        else:
+            self._keys.pop(collection_name, None)
+            self._loaded_at.pop(collection_name, None)
+            self._versions.pop(collection_name, None)
+
+
+async def backfill_course_keys(collection) -> int:
+    """
+    Set `course_key` on every document of a cutoff collection from its `Course_Name`.
+
+    Runs one `update_many` per distinct course name, so it is cheap to repeat and
+    safe to run after every ingestion. Documents left without a `course_key`
+    (no `Course_Name`) are reported, since course filters never match them.
+    Returns the number of modified documents.
+    """
+    modified = 0
+    for course_name in await collection.distinct("Course_Name"):
+        if not course_name:
+            continue
+        result = await collection.update_many(
+            {"Course_Name": course_name, "course_key": {"$ne": normalize_course_key(course_name)}},
+            {"$set": {"course_key": normalize_course_key(course_name)}}
+        )
+        modified += result.modified_count
+    logging.info(f"Backfilled course_key on {modified} document(s) in {collection.name}")
+    missing = await collection.count_documents({"course_key": {"$exists": False}})
+    if missing:
+        logging.warning(f"{missing} document(s) in {collection.name} have no Course_Name and no course_key; course filters skip them")
+    return modified
+
+
+async def mark_ingested(db) -> None:
+    """
+    Bump the catalog version flag so every instance reloads its course keys,
+    and drop this instance's cached catalog and flags right away.
+    """
+    await db[settings.CONFIG_COLLECTION].update_one(
+        {CATALOG_VERSION_FLAG: {"$exists": True}},
+        {"$set": {CATALOG_VERSION_FLAG: time.time()}},
+        upsert=True
+    )
+    config_flags.invalidate()
+    course_catalog.invalidate()
+
+
+course_catalog = CourseCatalog()
+
+
+if __name__ == "__main__":
+    # Post-ingestion step: run after loading new cutoff data (and on deploy).
+    # Sets course_key on documents ingested without it and makes every instance
+    # reload its catalog.
+    async def _backfill_all():
+        db = await get_db()
+        for collection_name in (settings.COLLEGE_CUTOFF_COLLECTION, settings.DIPLOMA_COLLEGE_CUTOFF_COLLECTION):
+            await backfill_course_keys(db[collection_name])
+        await mark_ingested(db)
+
+    asyncio.run(_backfill_all())
@@ -2,6 +2,7 @@ from future_bridge.config.config import settings
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 import logging
+from future_bridge.utils.mongoMetrics import mongo_command_listener
 from future_bridge.config.config import settings
 
 client = None
@@ -14,9 +15,9 @@ async def get_db():
                 logging.error("Database URL is not configured. Please check your environment variables.")
                 raise ValueError("Database URL is not configured. Please check your environment variables.")
             
-            logging.info(f"Connecting to MongoDB at {settings.DATABASE_URL}")
+            logging.info("Connecting to MongoDB")
             try:
-                client = AsyncIOMotorClient(settings.DATABASE_URL, serverSelectionTimeoutMS=5000)
+                client = AsyncIOMotorClient(settings.DATABASE_URL, serverSelectionTimeoutMS=5000, event_listeners=[mongo_command_listener])
                 
                 # Verify the connection
                 await client.admin.command('ping')
@@ -43,9 +44,9 @@ async def get_cj_db():
                 logging.error("Database URL is not configured. Please check your environment variables.")
                 raise ValueError("Database URL is not configured. Please check your environment variables.")
             
-            logging.info(f"Connecting to MongoDB at {settings.DATABASE_URL}")
+            logging.info("Connecting to MongoDB")
             try:
-                cj_client = AsyncIOMotorClient(settings.DATABASE_URL, serverSelectionTimeoutMS=5000)
+                cj_client = AsyncIOMotorClient(settings.DATABASE_URL, serverSelectionTimeoutMS=5000, event_listeners=[mongo_command_listener])
                 
                 # Verify the connection
                 await cj_client.admin.command('ping')
@@ -0,0 +1,52 @@
+from decimal import Decimal
+from typing import Any, Type
+
+import orjson
+from bson import Decimal128, ObjectId
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from future_bridge.utils.requestTiming import span
+
+
+def _orjson_default(obj: Any) -> Any:
+    """
+    Serialize the types orjson does not know natively (datetime, date, UUID and
+    Enum are handled by orjson itself).
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        # Models built with model_construct hold raw (already JSON-shaped) values
+        return obj.__dict__
+    if isinstance(obj, Decimal128):
+        return float(obj.to_decimal())
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(ORJSONResponse):
+    """
+    JSON response rendered with orjson, with Mongo types (ObjectId, Decimal128)
+    and Pydantic models handled in the encoder instead of a Python pre-pass.
+    Non-string dict keys are converted like the stdlib encoder does.
+    """
+
+    def render(self, content: Any) -> bytes:
+        with span("encode"):
+            return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def fast_response(model: Type[BaseModel], status_code: int = 200, **fields: Any) -> FastJSONResponse:
+    """
+    Build a response model from data the service layer produced itself and render
+    it straight to JSON.
+
+    `model_construct` fills defaults without validating, and returning a Response
+    makes FastAPI skip its response_model validation and jsonable_encoder pass;
+    the route's response_model still documents the shape in OpenAPI.
+    """
+    return FastJSONResponse(model.model_construct(**fields), status_code=status_code)
@@ -0,0 +1,93 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, Query
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a sparse fieldset such as "college_name,fees,Location.City" into a list
+    of field paths. Returns None when no fields were requested (full response).
+    Raises ValueError when a top-level field is not one of `allowed`.
+    """
+    if fields is None or not fields.strip():
+        return None
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    allowed = list(allowed)
+    unknown = [field for field in requested if field.split(".", 1)[0] not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed)}")
+    return requested
+
+
+def sparse_fields(allowed: Iterable[str]):
+    """
+    FastAPI dependency factory for the `fields` query parameter of a route;
+    unknown fields are rejected with 400 before the route runs.
+    """
+    allowed = list(allowed)
+
+    def dependency(fields: Optional[str] = Query(None, description=f"Comma separated fields to return, any of: {', '.join(allowed)}")) -> Optional[List[str]]:
+        try:
+            return parse_fields(fields, allowed)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail={"error": str(e), "technicalError": "Invalid fields parameter"})
+
+    return dependency
+
+
+def top_level(fields: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    The distinct top-level names of the requested field paths.
+    """
+    if fields is None:
+        return None
+    return list(dict.fromkeys(field.split(".", 1)[0] for field in fields))
+
+
+def projection(fields: Optional[List[str]], sources: Dict[str, List[str]], always: Iterable[str] = ()) -> Optional[Dict[str, int]]:
+    """
+    Mongo projection for the document fields behind the requested response fields.
+    `sources` maps each response field to the document fields it is built from;
+    `always` lists document fields the caller needs regardless (keys, sort fields).
+    Returns None when every field was requested.
+    """
+    if fields is None:
+        return None
+    result = {"_id": 0}
+    for field in always:
+        result[field] = 1
+    for field in top_level(fields):
+        for source in sources.get(field, []):
+            result[source] = 1
+    return result
+
+
+def wants(fields: Optional[List[str]], *names: str) -> bool:
+    """
+    Whether any of `names` is part of the response (always true without a fieldset).
+    """
+    if fields is None:
+        return True
+    requested = top_level(fields)
+    return any(name in requested for name in names)
+
+
+def prune(document: Any, fields: Optional[List[str]]) -> Any:
+    """
+    Keep only the requested field paths of a response dict (or of every dict in a
+    list). "Location.City" keeps just City inside Location; "Location" keeps it whole.
+    """
+    if fields is None:
+        return document
+    if isinstance(document, list):
+        return [prune(item, fields) for item in document]
+    if not isinstance(document, dict):
+        return document
+    nested: Dict[str, Optional[List[str]]] = {}
+    for field in fields:
+        head, _, rest = field.partition(".")
+        if not rest or nested.get(head, []) is None:
+            nested[head] = None
+        else:
+            nested.setdefault(head, []).append(rest)
+    return {key: prune(document[key], rest) for key, rest in nested.items() if key in document}
@@ -1,5 +1,4 @@
 import os
-import requests
 
 from future_bridge.utils.JWTTokenGenrator import decode_jwt
 
@@ -18,6 +17,9 @@ def validate_google_token(token):
         params = {"access_token": token} # new security for access toke
         params2 = {"id_token": token} # depricated
 
+        # requests is only needed for Google tokens; imported here to keep it off the cold-start path
+        import requests
+
         # Send a GET request to Google's token validation endpoint
         response = requests.get(accessTokeninfo_url, params=params) # new security for access toke
         response2 = requests.get(idTokeninfo_url, params=params2) # depricated
@@ -46,6 +48,8 @@ def validate_google_token(token):
 
 
 def getUserProfileData(token):
+    import requests
+
     url="https://www.googleapis.com/oauth2/v3/userinfo"
     headers = { 'Authorization': f"Bearer {token}" }
     response=requests.request("GET", url, headers=headers)
@@ -5,11 +5,13 @@ from functools import wraps
 
 from future_bridge.utils.google.token_validation import validate_google_token
 from future_bridge.config.messages import ErrorMessages
+from future_bridge.utils.requestTiming import timed
 
 class jwtBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
         super(jwtBearer, self).__init__(auto_error=auto_error)
 
+    @timed("auth")
     async def __call__(self, request: Request):
         credentials : HTTPAuthorizationCredentials = await super(jwtBearer,self).__call__(request)
         if credentials:
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import OperationFailure
+
+from future_bridge.config.indexes import INDEX_SPECS
+from future_bridge.utils.db import get_db
+
+
+def _key_tuple(keys) -> tuple:
+    """
+    Normalize an index key pattern (list of pairs or SON/dict) into a comparable tuple.
+    """
+    items = keys.items() if hasattr(keys, "items") else keys
+    return tuple((field, int(direction) if isinstance(direction, (int, float)) else direction) for field, direction in items)
+
+
+async def diff_indexes(db=None, specs: Optional[Dict[str, List[dict]]] = None) -> Dict[str, List[dict]]:
+    """
+    Compare the declared index spec with what exists in the database.
+
+    Returns a mapping of collection name -> list of declared specs that are missing.
+    Indexes are matched on their key pattern, so an index created by hand under a
+    different name still counts as present.
+    """
+    db = db if db is not None else await get_db()
+    specs = specs if specs is not None else INDEX_SPECS
+    missing: Dict[str, List[dict]] = {}
+    for collection_name, collection_specs in specs.items():
+        existing = await db[collection_name].index_information()
+        existing_keys = {_key_tuple(info["key"]) for info in existing.values()}
+        for spec in collection_specs:
+            if _key_tuple(spec["keys"]) not in existing_keys:
+                missing.setdefault(collection_name, []).append(spec)
+    return missing
+
+
+async def ensure_indexes(db=None, dry_run: bool = False, specs: Optional[Dict[str, List[dict]]] = None) -> Dict[str, List[str]]:
+    """
+    Create every declared index that does not exist yet. Safe to run repeatedly.
+
+    Args:
+        db: Database handle, defaults to the main application database.
+        dry_run: Only report what would be created.
+        specs: Index spec to apply, defaults to `INDEX_SPECS`.
+
+    Returns:
+        Dict[str, List[str]]: Collection name -> names of the created (or to-be-created) indexes.
+    """
+    db = db if db is not None else await get_db()
+    missing = await diff_indexes(db, specs)
+    created: Dict[str, List[str]] = {}
+    for collection_name, collection_specs in missing.items():
+        for spec in collection_specs:
+            keys = list(spec["keys"])
+            name = "_".join(f"{field}_{direction}" for field, direction in keys)
+            if dry_run:
+                logging.info(f"[dry-run] Would create index {name} on {collection_name}")
+            else:
+                name = await db[collection_name].create_index(keys, **spec.get("options", {}))
+                logging.info(f"Created index {name} on {collection_name}")
+            created.setdefault(collection_name, []).append(name)
+    if not created:
+        logging.info("All declared indexes are present")
+    return created
+
+
+async def report_unused_indexes(db=None, specs: Optional[Dict[str, List[dict]]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Report indexes that no query uses.
+
+    An index is reported when it is not part of the declared spec (nobody owns it)
+    or when `$indexStats` shows zero accesses since the server last restarted.
+    `$indexStats` is not available on every backend (e.g. Cosmos); in that case only
+    the undeclared indexes are reported.
+    """
+    db = db if db is not None else await get_db()
+    specs = specs if specs is not None else INDEX_SPECS
+    report: Dict[str, List[Dict[str, Any]]] = {}
+    for collection_name, collection_specs in specs.items():
+        collection = db[collection_name]
+        declared = {_key_tuple(spec["keys"]) for spec in collection_specs}
+        existing = await collection.index_information()
+
+        usage: Dict[str, int] = {}
+        try:
+            async for stat in collection.aggregate([{"$indexStats": {}}]):
+                usage[stat["name"]] = stat.get("accesses", {}).get("ops", 0)
+        except OperationFailure as e:
+            logging.debug(f"$indexStats not supported for {collection_name}: {e}")
+
+        for name, info in existing.items():
+            if name == "_id_":
+                continue
+            reasons = []
+            if _key_tuple(info["key"]) not in declared:
+                reasons.append("undeclared")
+            if name in usage and usage[name] == 0:
+                reasons.append("no accesses")
+            if reasons:
+                report.setdefault(collection_name, []).append({"name": name, "key": dict(info["key"]), "reasons": reasons})
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create missing MongoDB indexes declared in future_bridge.config.indexes")
+    parser.add_argument("--dry-run", action="store_true", help="Only print the indexes that would be created")
+    parser.add_argument("--report-unused", action="store_true", help="Only list undeclared or unused indexes (creates nothing)")
+    args = parser.parse_args()
+
+    async def _main():
+        if args.report_unused:
+            for collection_name, entries in (await report_unused_indexes()).items():
+                for entry in entries:
+                    print(f"{collection_name}: {entry['name']} {entry['key']} ({', '.join(entry['reasons'])})")
+            return
+        created = await ensure_indexes(dry_run=args.dry_run)
+        for collection_name, names in created.items():
+            print(f"{collection_name}: {', '.join(names)}")
+
+    asyncio.run(_main())
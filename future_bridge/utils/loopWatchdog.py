@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from future_bridge.config.config import settings
+from future_bridge.utils.mongoMetrics import LATENCY_BUCKETS_MS, Histogram
+
+# Frames from these files are the project's own code; the innermost one names the call site
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+# Project middleware and instrumentation wrap every request, so they are never the call site
+WRAPPER_FILES = {
+    os.path.join(PROJECT_DIR, "utils", name)
+    for name in ("loopWatchdog.py", "compression.py", "profiling.py", "mongoMetrics.py", "requestTiming.py")
+}
+STACK_LIMIT = 25
+
+
+def _call_site(stack: traceback.StackSummary) -> Tuple[str, str]:
+    """
+    (site, leaf) of a captured stack: the innermost project frame, which is the
+    line to fix, and the innermost frame overall, which is what actually blocked
+    (e.g. a socket read inside requests).
+    """
+    leaf = stack[-1]
+    site = next((frame for frame in reversed(stack) if frame.filename.startswith(PROJECT_DIR) and frame.filename not in WRAPPER_FILES), leaf)
+
+    def describe(frame: traceback.FrameSummary) -> str:
+        filename = frame.filename[len(PROJECT_DIR):] if frame.filename.startswith(PROJECT_DIR) else frame.filename
+        return f"{filename}:{frame.lineno} in {frame.name}"
+
+    return describe(site), describe(leaf)
+
+
+class BlockingSite:
+    """
+    Event-loop stalls attributed to one call site.
+    """
+
+    def __init__(self, leaf: str, stack: List[str]):
+        self.leaf = leaf
+        self.stack = stack
+        self.count = 0
+        self.blocked_ms = 0.0
+        self.max_ms = 0.0
+        self.last_seen: Optional[float] = None
+
+    def add(self, blocked_ms: float) -> None:
+        self.count += 1
+        self.blocked_ms += blocked_ms
+        self.max_ms = max(self.max_ms, blocked_ms)
+        self.last_seen = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "leaf": self.leaf,
+            "count": self.count,
+            "blocked_ms": round(self.blocked_ms, 1),
+            "max_ms": round(self.max_ms, 1),
+            "last_seen": self.last_seen,
+            "stack": self.stack,
+        }
+
+
+class LoopWatchdog:
+    """
+    Debug-mode detector for synchronous calls that block the event loop.
+
+    A heartbeat task on the loop sleeps for `interval_ms` and measures how late
+    it wakes up (the loop lag, kept as a histogram). A watchdog thread checks the
+    heartbeat; once it has been silent for `threshold_ms`, the loop thread is
+    stuck in a callback and its stack is captured from sys._current_frames().
+    When the heartbeat resumes, the stall's full duration is attributed to the
+    innermost project frame of that stack (or "unknown" if the stall ended
+    before it could be captured), logged, and aggregated for /internal/blocking.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = settings.LOOP_WATCHDOG_THRESHOLD_MS,
+        interval_ms: float = settings.LOOP_WATCHDOG_INTERVAL_MS,
+    ):
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.lag_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.stalls = 0
+        self.sites: Dict[str, BlockingSite] = {}
+        self.started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # (beat number, monotonic time) of the last heartbeat, written by the loop thread
+        self._last_beat: Tuple[int, float] = (0, time.monotonic())
+        self._captured: Dict[int, traceback.StackSummary] = {}
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat_task is not None
+
+    def start(self) -> None:
+        """
+        Start the heartbeat and the watchdog thread (called on application startup).
+        """
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = (0, time.monotonic())
+        self._stop.clear()
+        self.started_at = time.time()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logging.info(f"Event loop watchdog started (threshold {self.threshold_ms:.0f} ms)")
+
+    async def stop(self) -> None:
+        """
+        Stop the heartbeat and the watchdog thread (called on application shutdown).
+        """
+        if not self.running:
+            return
+        self._stop.set()
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+        self._heartbeat_task = None
+        self._thread.join(timeout=1)
+        self._thread = None
+
+    async def _heartbeat(self) -> None:
+        interval = self.interval_ms / 1000
+        beat = 0
+        while True:
+            beat += 1
+            expected = time.monotonic() + interval
+            self._last_beat = (beat, expected - interval)
+            await asyncio.sleep(interval)
+            lag_ms = max(time.monotonic() - expected, 0.0) * 1000
+            with self._lock:
+                self.lag_ms.observe(lag_ms)
+            stack = self._captured.pop(beat, None)
+            if lag_ms >= self.threshold_ms:
+                self._record(lag_ms, stack)
+
+    def _watch(self) -> None:
+        interval = self.interval_ms / 1000
+        while not self._stop.wait(interval):
+            beat, beat_at = self._last_beat
+            if beat in self._captured or (time.monotonic() - beat_at) * 1000 < self.threshold_ms:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self._captured[beat] = traceback.extract_stack(frame, limit=STACK_LIMIT)
+
+    def _record(self, blocked_ms: float, stack: Optional[traceback.StackSummary]) -> None:
+        if stack:
+            site, leaf = _call_site(stack)
+            lines = [line.rstrip() for line in traceback.format_list(stack)]
+        else:
+            site, leaf, lines = "unknown", "unknown", []
+        with self._lock:
+            self.stalls += 1
+            first_seen = site not in self.sites
+            entry = self.sites.setdefault(site, BlockingSite(leaf, lines))
+            entry.add(blocked_ms)
+        if first_seen and lines:
+            logging.warning(f"Event loop blocked for {blocked_ms:.0f} ms at {site} (blocking in {leaf}):\n" + "\n".join(lines))
+        else:
+            logging.warning(f"Event loop blocked for {blocked_ms:.0f} ms at {site} (blocking in {leaf}, seen {entry.count} times)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "since": self.started_at,
+                "threshold_ms": self.threshold_ms,
+                "stalls": self.stalls,
+                "lag_ms": self.lag_ms.to_dict(),
+                "sites": {
+                    site: entry.to_dict()
+                    for site, entry in sorted(self.sites.items(), key=lambda item: -item[1].blocked_ms)
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.lag_ms = Histogram(LATENCY_BUCKETS_MS)
+            self.stalls = 0
+            self.sites.clear()
+
+
+loop_watchdog = LoopWatchdog()
+
+
+def start_loop_watchdog():
+    """
+    Start the watchdog when LOOP_WATCHDOG_ENABLED is set (called on application startup).
+    """
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+
+
+async def stop_loop_watchdog():
+    await loop_watchdog.stop()
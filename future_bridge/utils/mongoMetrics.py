@@ -0,0 +1,236 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+from future_bridge.config.config import settings
+
+# Upper bounds of the histogram buckets; the last bucket is unbounded.
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+COMMAND_COUNT_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
+
+# Commands that are part of connection setup/auth rather than application queries
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "saslStart", "saslContinue", "endSessions", "buildInfo"}
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; `counts[i]` holds observations <= `buckets[i]`,
+    the final slot holds everything above the last bucket.
+    """
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.observations = 0
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.observations += 1
+        self.max = value if self.max is None else max(self.max, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.observations,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.observations, 3) if self.observations else None,
+            "max": round(self.max, 3) if self.max is not None else None,
+        }
+
+
+class RequestCommandStats:
+    """
+    Mongo commands issued while serving a single HTTP request.
+    """
+
+    def __init__(self):
+        self.commands: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, collection: Optional[str], op: str, duration_ms: float, docs: int, failed: bool = False) -> None:
+        with self._lock:
+            self.commands.append({"collection": collection, "op": op, "duration_ms": duration_ms, "docs": docs, "failed": failed})
+
+    @property
+    def count(self) -> int:
+        return len(self.commands)
+
+    @property
+    def duration_ms(self) -> float:
+        return sum(c["duration_ms"] for c in self.commands)
+
+
+class RouteMetrics:
+    """
+    Aggregated Mongo usage of one route across all requests served by this worker.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.commands = 0
+        self.docs_returned = 0
+        self.commands_per_request = Histogram(COMMAND_COUNT_BUCKETS)
+        self.mongo_ms_per_request = Histogram(LATENCY_BUCKETS_MS)
+        self.collections: Dict[Tuple[Optional[str], str], Dict[str, float]] = {}
+
+    def add(self, stats: RequestCommandStats) -> None:
+        self.requests += 1
+        self.commands += stats.count
+        self.commands_per_request.observe(stats.count)
+        self.mongo_ms_per_request.observe(stats.duration_ms)
+        for command in stats.commands:
+            self.docs_returned += command["docs"]
+            entry = self.collections.setdefault((command["collection"], command["op"]), {"count": 0, "duration_ms": 0.0, "docs": 0, "failed": 0})
+            entry["count"] += 1
+            entry["duration_ms"] += command["duration_ms"]
+            entry["docs"] += command["docs"]
+            entry["failed"] += int(command["failed"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "commands": self.commands,
+            "docs_returned": self.docs_returned,
+            "commands_per_request": self.commands_per_request.to_dict(),
+            "mongo_ms_per_request": self.mongo_ms_per_request.to_dict(),
+            "by_collection": [
+                {"collection": collection, "op": op, **{k: round(v, 3) for k, v in entry.items()}}
+                for (collection, op), entry in sorted(self.collections.items(), key=lambda item: -item[1]["duration_ms"])
+            ],
+        }
+
+
+class MongoMetricsRegistry:
+    """
+    Process-wide store of per-route Mongo metrics.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, RouteMetrics] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def add(self, route: str, stats: RequestCommandStats) -> None:
+        with self._lock:
+            self._routes.setdefault(route, RouteMetrics()).add(stats)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "routes": {route: metrics.to_dict() for route, metrics in sorted(self._routes.items())},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self.started_at = time.time()
+
+
+# Stats of the request currently being served. Motor runs pymongo on executor
+# threads with a copy of the calling context, so the listener below sees the
+# same (mutable) stats object as the request that issued the command.
+current_request_stats: contextvars.ContextVar[Optional[RequestCommandStats]] = contextvars.ContextVar("current_request_stats", default=None)
+
+mongo_metrics = MongoMetricsRegistry()
+
+
+def _docs_in_reply(reply: Dict[str, Any]) -> int:
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if "values" in reply:
+        return len(reply["values"])
+    if "value" in reply:
+        return 1 if reply["value"] else 0
+    n = reply.get("n")
+    return n if isinstance(n, int) else 0
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """
+    pymongo command listener attributing every command to the current request.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Tuple[Optional[RequestCommandStats], Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        collection = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = (
+                current_request_stats.get(),
+                collection if isinstance(collection, str) else None,
+            )
+
+    def _finish(self, event, docs: int, failed: bool) -> None:
+        with self._lock:
+            pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if not pending:
+            return
+        stats, collection = pending
+        if stats is not None:
+            stats.record(collection, event.command_name, event.duration_micros / 1000, docs, failed)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, _docs_in_reply(event.reply or {}), failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, 0, failed=True)
+
+
+mongo_command_listener = MongoCommandListener()
+
+
+def route_name(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "unmatched"
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+class MongoMetricsMiddleware:
+    """
+    ASGI middleware that scopes Mongo command stats to each HTTP request,
+    folds them into the per-route registry and optionally reports them in
+    a `Server-Timing` response header.
+    """
+
+    def __init__(self, app, server_timing: bool = settings.MONGO_SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestCommandStats()
+        token = current_request_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", f'mongo;dur={stats.duration_ms:.1f};desc="{stats.count} cmds"'.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_stats.reset(token)
+            try:
+                mongo_metrics.add(route_name(scope), stats)
+            except Exception as e:
+                logging.warning(f"Failed to record Mongo metrics: {e}")
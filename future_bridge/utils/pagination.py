@@ -0,0 +1,64 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+
+
+def parse_sort(sort: Optional[str], allowed_fields: List[str], default: str = "created_at:desc") -> Tuple[str, int]:
+    """
+    Parse a "field:direction" sort parameter into (field, pymongo direction).
+
+    Only fields with a supporting index may be used for keyset pagination, so
+    anything outside `allowed_fields` is rejected with a ValueError.
+    """
+    field, _, direction = (sort or default).partition(":")
+    if field not in allowed_fields:
+        raise ValueError(f"Unsupported sort field '{field}'. Allowed: {', '.join(allowed_fields)}")
+    return field, -1 if direction.lower() == "desc" else 1
+
+
+def encode_cursor(sort_field: str, sort_order: int, last_doc: Dict[str, Any]) -> str:
+    """
+    Build the opaque continuation token pointing just past `last_doc`.
+
+    The token carries the sort key and `_id` of the last returned document (as
+    extended JSON, so datetimes and ObjectIds survive the round trip).
+    """
+    payload = json_util.dumps({"f": sort_field, "d": sort_order, "v": last_doc.get(sort_field), "id": last_doc["_id"]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str, sort_order: int) -> Tuple[Any, Any]:
+    """
+    Decode a continuation token into (last sort value, last _id).
+
+    Raises ValueError if the token is malformed or was issued for a different sort.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        last_value, last_id = payload["v"], payload["id"]
+        issued_for = (payload["f"], payload["d"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if issued_for != (sort_field, sort_order):
+        raise ValueError("Pagination cursor does not match the requested sort order")
+    return last_value, last_id
+
+
+def keyset_filter(sort_field: str, sort_order: int, last_value: Any, last_id: Any) -> Dict[str, Any]:
+    """
+    Mongo filter selecting the documents that come after (last_value, last_id)
+    when sorting on [(sort_field, sort_order), ("_id", sort_order)].
+
+    Null/missing sort values sort before everything else in Mongo, so they need
+    their own branch: range operators never match across BSON types.
+    """
+    op = "$lt" if sort_order == -1 else "$gt"
+    same_value_after_id = {sort_field: last_value, "_id": {op: last_id}}
+    if last_value is None:
+        if sort_order == -1:
+            return same_value_after_id
+        return {"$or": [{sort_field: {"$ne": None}}, same_value_after_id]}
+    return {"$or": [{sort_field: {op: last_value}}, same_value_after_id]}
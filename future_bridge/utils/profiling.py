@@ -0,0 +1,150 @@
+import importlib.util
+import logging
+import os
+import re
+import time
+import uuid
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers
+
+from future_bridge.config.config import settings
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "__profile"
+# "html" replaces the response with the pyinstrument report; "store" serves the
+# response as usual and saves the report under PROFILING_OUTPUT_DIR
+PROFILE_MODES = ("html", "store")
+
+_UNSAFE_FILENAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def profiling_available() -> bool:
+    """
+    Profiling is only offered outside production, and only when pyinstrument is
+    installed (it is optional; without it profiling requests are served unprofiled).
+    """
+    return settings.ENVIRONMENT != "Production" and importlib.util.find_spec("pyinstrument") is not None
+
+
+def _requested_mode(scope) -> Optional[str]:
+    mode = Headers(scope=scope).get(PROFILE_HEADER)
+    if mode is None:
+        for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True):
+            if name == PROFILE_QUERY_PARAM:
+                mode = value or "html"
+    if mode is None:
+        return None
+    mode = mode.strip().lower()
+    return mode if mode in PROFILE_MODES else "html"
+
+
+def _without_profile_param(query_string: bytes) -> bytes:
+    params = [(name, value) for name, value in parse_qsl(query_string.decode("latin-1"), keep_blank_values=True) if name != PROFILE_QUERY_PARAM]
+    return urlencode(params).encode("latin-1")
+
+
+def report_path(name: str) -> Optional[str]:
+    """
+    Path of a stored report, or None when `name` is not a report in PROFILING_OUTPUT_DIR.
+    """
+    if _UNSAFE_FILENAME.sub("", name) != name or not name.endswith(".html"):
+        return None
+    path = os.path.join(settings.PROFILING_OUTPUT_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def list_reports() -> List[str]:
+    """
+    Stored reports, newest first.
+    """
+    if not os.path.isdir(settings.PROFILING_OUTPUT_DIR):
+        return []
+    names = [name for name in os.listdir(settings.PROFILING_OUTPUT_DIR) if name.endswith(".html")]
+    return sorted(names, reverse=True)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware running pyinstrument around a single request when it asks
+    for it, with an `X-Profile: html|store` header or a `__profile=html|store`
+    query parameter (which is removed before the route sees the query string).
+
+    "html" discards the route's response and returns the pyinstrument HTML report
+    instead (the route's status code is kept in `X-Profiled-Status`). "store"
+    returns the normal response and saves the report to PROFILING_OUTPUT_DIR;
+    its file name is sent in `X-Profile-Report` and it can be fetched from
+    /internal/profiles. Only installed when Environment is not Production.
+    """
+
+    def __init__(self, app, interval: float = settings.PROFILING_INTERVAL_SECONDS):
+        self.app = app
+        self.interval = interval
+
+    async def __call__(self, scope, receive, send):
+        mode = _requested_mode(scope) if scope["type"] == "http" else None
+        if mode is None or not profiling_available():
+            await self.app(scope, receive, send)
+            return
+
+        # Imported on first use so pyinstrument stays off the cold-start path
+        from pyinstrument import Profiler
+
+        scope = {**scope, "query_string": _without_profile_param(scope.get("query_string", b""))}
+        profiler = Profiler(interval=self.interval, async_mode="enabled")
+        if mode == "html":
+            await self._profile_to_response(profiler, scope, receive, send)
+        else:
+            await self._profile_to_file(profiler, scope, receive, send)
+
+    async def _profile_to_response(self, profiler, scope, receive, send):
+        status_code = 500
+
+        async def discard(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, discard)
+        except Exception as e:
+            # The report of a failing request is what is being debugged, so it is still returned
+            logging.error(f"Profiled request {scope.get('method')} {scope.get('path')} failed: {e}", exc_info=True)
+        finally:
+            profiler.stop()
+        body = profiler.output_html().encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/html; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profiled-status", str(status_code).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _profile_to_file(self, profiler, scope, receive, send):
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{_UNSAFE_FILENAME.sub('_', scope.get('path', '')).strip('_')}-{uuid.uuid4().hex[:8]}.html"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-report", name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            try:
+                os.makedirs(settings.PROFILING_OUTPUT_DIR, exist_ok=True)
+                with open(os.path.join(settings.PROFILING_OUTPUT_DIR, name), "w", encoding="utf-8") as report:
+                    report.write(profiler.output_html())
+                logging.info(f"Stored profile of {scope.get('method')} {scope.get('path')} as {name}")
+            except Exception as e:
+                logging.error(f"Failed to store profile report {name}: {e}", exc_info=True)
@@ -0,0 +1,285 @@
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from fastapi.routing import APIRoute
+
+from future_bridge.config.config import settings
+from future_bridge.utils.mongoMetrics import LATENCY_BUCKETS_MS, Histogram, route_name, current_request_stats
+
+# Layers reported for every sampled request, in Server-Timing order. Spans
+# record self time: a service span excludes the repository calls it awaited,
+# so the layers of one request add up to (about) its total.
+LAYERS = ["auth", "repository", "service", "endpoint", "encode", "fastapi"]
+LAYER_DESCRIPTIONS = {
+    "auth": "token validation",
+    "repository": "repository calls",
+    "service": "service compute",
+    "endpoint": "route handler",
+    "encode": "response rendering",
+    "fastapi": "request parsing, validation, serialization",
+}
+
+
+class RequestTiming:
+    """
+    Time spent per layer while serving one sampled request.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.layers: Dict[str, List[float]] = {}  # layer -> [self ms, calls]
+        self.calls: Dict[str, float] = {}  # Class.method -> self ms
+
+    def add(self, layer: str, call: Optional[str], self_ms: float) -> None:
+        entry = self.layers.setdefault(layer, [0.0, 0])
+        entry[0] += self_ms
+        entry[1] += 1
+        if call is not None:
+            self.calls[call] = self.calls.get(call, 0.0) + self_ms
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+class _OpenSpan:
+    __slots__ = ("child_ms",)
+
+    def __init__(self):
+        self.child_ms = 0.0
+
+
+# Timing of the current request; None unless the request was sampled, which is
+# the only thing span() and @timed check on the unsampled path
+current_timing: contextvars.ContextVar[Optional[RequestTiming]] = contextvars.ContextVar("current_timing", default=None)
+# Innermost open span, so a finished span can hand its duration to its parent.
+# Tasks started with asyncio.gather get their own copy, keeping concurrent spans apart.
+_current_span: contextvars.ContextVar[Optional[_OpenSpan]] = contextvars.ContextVar("current_span", default=None)
+
+
+@contextmanager
+def span(layer: str, call: Optional[str] = None) -> Iterator[None]:
+    """
+    Attribute the time spent in the block to `layer` (and to `call`, e.g.
+    "ExploreRepository.search_colleges") when the current request is sampled.
+    """
+    timing = current_timing.get()
+    if timing is None:
+        yield
+        return
+    parent = _current_span.get()
+    open_span = _OpenSpan()
+    token = _current_span.set(open_span)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _current_span.reset(token)
+        timing.add(layer, call, max(elapsed_ms - open_span.child_ms, 0.0))
+        if parent is not None:
+            parent.child_ms += elapsed_ms
+
+
+def timed(layer: str, call: Optional[str] = None) -> Callable:
+    """
+    Decorator recording every await of a coroutine function as a `layer` span.
+    Unsampled requests only pay for one context variable lookup.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        name = call or fn.__qualname__
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if current_timing.get() is None:
+                return await fn(*args, **kwargs)
+            with span(layer, name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def timed_methods(layer: str) -> Callable:
+    """
+    Class decorator applying @timed(layer) to every coroutine method of a
+    repository or service class (async generators and sync helpers are left as they are).
+    """
+
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("__"):
+                continue
+            if isinstance(value, staticmethod) and inspect.iscoroutinefunction(value.__func__):
+                setattr(cls, attr, staticmethod(timed(layer, f"{cls.__name__}.{attr}")(value.__func__)))
+            elif inspect.iscoroutinefunction(value):
+                setattr(cls, attr, timed(layer, f"{cls.__name__}.{attr}")(value))
+        return cls
+
+    return decorate
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute recording the endpoint function as the "endpoint" span and the rest
+    of FastAPI's request handling (body parsing, dependency resolution, request
+    validation, response validation and serialization) as the "fastapi" span.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if inspect.iscoroutinefunction(self.dependant.call):
+            self.dependant.call = timed("endpoint", f"route.{self.name}")(self.dependant.call)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            if current_timing.get() is None:
+                return await handler(request)
+            with span("fastapi"):
+                return await handler(request)
+
+        return timed_handler
+
+
+class RouteTimings:
+    """
+    Aggregated per-layer timings of one route across its sampled requests.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.total_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.layers: Dict[str, Histogram] = {}
+
+    def add(self, total_ms: float, timing: RequestTiming) -> None:
+        self.requests += 1
+        self.total_ms.observe(total_ms)
+        for layer, (self_ms, _) in timing.layers.items():
+            self.layers.setdefault(layer, Histogram(LATENCY_BUCKETS_MS)).observe(self_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sampled_requests": self.requests,
+            "total_ms": self.total_ms.to_dict(),
+            "layers_ms": {layer: histogram.to_dict() for layer, histogram in sorted(self.layers.items())},
+        }
+
+
+class RequestTimingRegistry:
+    """
+    Process-wide store of per-route request timings.
+    """
+
+    def __init__(self):
+        self._routes: Dict[str, RouteTimings] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def add(self, route: str, total_ms: float, timing: RequestTiming) -> None:
+        with self._lock:
+            self._routes.setdefault(route, RouteTimings()).add(total_ms, timing)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "sample_rate": settings.REQUEST_TIMING_SAMPLE_RATE,
+                "routes": {route: timings.to_dict() for route, timings in sorted(self._routes.items())},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self.started_at = time.time()
+
+
+request_timings = RequestTimingRegistry()
+
+
+def _server_timing(timing: RequestTiming, total_ms: float) -> str:
+    entries = []
+    for layer in LAYERS + sorted(set(timing.layers) - set(LAYERS)):
+        if layer in timing.layers:
+            self_ms, calls = timing.layers[layer]
+            desc = LAYER_DESCRIPTIONS.get(layer, layer)
+            entries.append(f'{layer};dur={self_ms:.1f};desc="{desc} ({calls})"')
+    entries.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(entries)
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware sampling REQUEST_TIMING_SAMPLE_RATE of requests for a per-layer
+    timing breakdown (auth, repository, service, endpoint, encode, fastapi).
+
+    A sampled request gets a `Server-Timing` header (unless REQUEST_TIMING_HEADER
+    is off), one `request_timing` JSON log line and is folded into the per-route
+    histograms served at /internal/timings. Add it inside MongoMetricsMiddleware
+    so the Mongo command totals of the request are included.
+    """
+
+    def __init__(
+        self,
+        app,
+        sample_rate: float = settings.REQUEST_TIMING_SAMPLE_RATE,
+        server_timing: bool = settings.REQUEST_TIMING_HEADER,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(timing, timing.elapsed_ms()).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_timing.reset(token)
+            total_ms = timing.elapsed_ms()
+            try:
+                self._record(scope, status_code, total_ms, timing)
+            except Exception as e:
+                logging.warning(f"Failed to record request timing: {e}")
+
+    @staticmethod
+    def _record(scope, status_code: int, total_ms: float, timing: RequestTiming) -> None:
+        route = route_name(scope)
+        request_timings.add(route, total_ms, timing)
+        record = {
+            "route": route,
+            "status": status_code,
+            "total_ms": round(total_ms, 1),
+            "layers_ms": {layer: round(self_ms, 1) for layer, (self_ms, _) in timing.layers.items()},
+            "calls_ms": {call: round(ms, 1) for call, ms in sorted(timing.calls.items(), key=lambda item: -item[1])[:10]},
+        }
+        mongo_stats = current_request_stats.get()
+        if mongo_stats is not None:
+            record["mongo"] = {"commands": mongo_stats.count, "ms": round(mongo_stats.duration_ms, 1)}
+        logging.info(f"request_timing {json.dumps(record, separators=(',', ':'))}")
@@ -0,0 +1,104 @@
+import bisect
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Split text into lower-case alphanumeric tokens, e.g.
+    "Payment failed (FB-00042)" -> ["payment", "failed", "fb", "00042"].
+    """
+    if not text:
+        return []
+    return _TOKEN.findall(str(text).lower())
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index: token -> {document id: weighted term frequency}.
+
+    Documents are indexed field by field with a per-field weight, and more text
+    can be appended to a document later (e.g. comments). A sorted vocabulary
+    makes prefix lookups a binary search instead of a scan. Results are ranked
+    by the sum over query terms of weighted term frequency x inverse document
+    frequency; every query term has to match.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocabulary: List[str] = []
+        self._documents: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: str, text: Optional[str], weight: float = 1.0):
+        """
+        Index `text` as part of document `doc_id` with the given field weight.
+        """
+        tokens = tokenize(text)
+        doc_tokens = self._documents.setdefault(doc_id, set())
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                bisect.insort(self._vocabulary, token)
+            postings[doc_id] = postings.get(doc_id, 0.0) + weight
+            doc_tokens.add(token)
+
+    def remove(self, doc_id: str):
+        """
+        Drop a document and all of its postings.
+        """
+        for token in self._documents.pop(doc_id, ()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+                index = bisect.bisect_left(self._vocabulary, token)
+                if index < len(self._vocabulary) and self._vocabulary[index] == token:
+                    self._vocabulary.pop(index)
+
+    def _expand(self, term: str, prefix: bool) -> Iterable[str]:
+        if not prefix:
+            return [term] if term in self._postings else []
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+        return self._vocabulary[start:end]
+
+    def search(self, query: str, limit: int = 20, prefix: bool = True) -> List[Tuple[str, float]]:
+        """
+        Return up to `limit` (document id, score) pairs, best first.
+
+        With `prefix`, every query term also matches the tokens it starts
+        ("pay" finds "payment"); a term matched only as a prefix scores a little
+        lower than an exact match.
+        """
+        terms = tokenize(query)
+        if not terms or not self._documents:
+            return []
+
+        total_documents = len(self._documents)
+        scores: Optional[Dict[str, float]] = None
+        for term in dict.fromkeys(terms):
+            term_scores: Dict[str, float] = {}
+            for token in self._expand(term, prefix):
+                postings = self._postings[token]
+                idf = math.log(1 + total_documents / len(postings))
+                boost = 1.0 if token == term else 0.8
+                for doc_id, tf in postings.items():
+                    term_scores[doc_id] = term_scores.get(doc_id, 0.0) + boost * tf * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return []
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [(doc_id, round(score, 4)) for doc_id, score in ranked[:limit]]
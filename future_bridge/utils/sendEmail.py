@@ -1,13 +1,15 @@
-import msal
-import requests
 from pydantic import BaseModel, ValidationError
 import logging
 import os
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 import random
 from future_bridge.repositories.commonRepository import OTPValidatorRepo
 from future_bridge.models.commonModel import OTPValidator
 
+if TYPE_CHECKING:
+    import msal
+    import requests
+
 otp_validator=OTPValidatorRepo()
 # Microsoft Graph API endpoint
 GRAPH_API_ENDPOINT = "https://graph.microsoft.com/v1.0"
@@ -21,11 +23,6 @@ EMAIL_SERVICE = os.getenv('EMAIL_SERVICE')
 # Define the scope for Microsoft Graph API access
 SCOPES = ['https://graph.microsoft.com/.default']
  
-# Ensure required environment variables are set
-if not all([client_id, client_secret, tenant_id]):
-    logging.error("Missing Azure AD credentials. Check environment variables CLIENT_ID, CLIENT_SECRET, and TENANT_ID.")
-    raise EnvironmentError("Azure AD credentials are not set.")
- 
 class EmailRequest(BaseModel):
     to_recipients: List[str]
     subject: str
@@ -35,22 +32,55 @@ class EmailRequest(BaseModel):
     bcc_recipients: Optional[List[str]] = None
     attachments: Optional[List[dict]] = None  # Attachment payloads if needed
  
+# Process-wide MSAL application and HTTP session. MSAL keeps the client-credentials
+# token in its in-memory cache until shortly before expiry, so sharing the app means
+# AAD is only contacted when the token actually needs renewing, and the session
+# reuses connections to Graph across emails. msal and requests are imported when the
+# first email is sent, not when this module is imported (cold start).
+_msal_app = None
+_http_session = None
+email_service = None
+
+
+def _get_msal_app() -> "msal.ConfidentialClientApplication":
+    global _msal_app
+    if _msal_app is None:
+        # Ensure required environment variables are set
+        if not all([client_id, client_secret, tenant_id]):
+            logging.error("Missing Azure AD credentials. Check environment variables CLIENT_ID, CLIENT_SECRET, and TENANT_ID.")
+            raise EnvironmentError("Azure AD credentials are not set.")
+        import msal
+        authority = f'https://login.microsoftonline.com/{tenant_id}'
+        _msal_app = msal.ConfidentialClientApplication(
+            client_id, authority=authority, client_credential=client_secret
+        )
+    return _msal_app
+
+
+def _get_http_session() -> "requests.Session":
+    global _http_session
+    if _http_session is None:
+        import requests
+        _http_session = requests.Session()
+    return _http_session
+
+
 class MicrosoftEmailService:
     def __init__(self):
-        self.access_token = self.get_access_token()
-    print(client_id,client_secret,tenant_id)
+        # The token is acquired lazily on first send, not when the service is built
+        pass
+
+    @property
+    def access_token(self) -> str:
+        return self.get_access_token()
     
     def get_access_token(self) -> str:
         """
         Acquires an access token from Azure AD using client credentials (Client ID, Secret, and Tenant ID).
+        Served from the shared MSAL token cache while the token is valid.
         """
         try:
-            authority = f'https://login.microsoftonline.com/{tenant_id}'
-            app = msal.ConfidentialClientApplication(
-                client_id, authority=authority, client_credential=client_secret
-            )
-            token_response = app.acquire_token_for_client(SCOPES)
-            print(token_response)
+            token_response = _get_msal_app().acquire_token_for_client(SCOPES)
 
             if 'access_token' in token_response:
                 return token_response['access_token']
@@ -124,6 +154,8 @@ class MicrosoftEmailService:
             email_request (EmailRequest): The validated email request data.
             sender_email (str): The dynamic sender email address.
         """
+        import requests
+
         url = f"{GRAPH_API_ENDPOINT}/users/{sender_email}/sendMail"
         headers = {
             "Authorization": f"Bearer {self.access_token}",
@@ -133,7 +165,7 @@ class MicrosoftEmailService:
         email_payload = self.create_email_payload(email_request)
  
         try:
-            response = requests.post(url, headers=headers, json=email_payload)
+            response = _get_http_session().post(url, headers=headers, json=email_payload)
             response.raise_for_status()  # Raises an HTTPError for bad responses (4xx, 5xx)
             logging.info(f"Email sent successfully to: {', '.join(email_request.to_recipients)}")
             return {"success": True, "message": f"Successfully sent email to {', '.join(email_request.to_recipients)}"}
@@ -197,7 +229,24 @@ class MicrosoftEmailService:
         logging.info(f"Email Response {email_response}")
         return email_response
 def get_microsoft_email_service() -> MicrosoftEmailService:
-    return MicrosoftEmailService()
+    """
+    Return the process-wide email service, created on first use.
+    """
+    global email_service
+    if email_service is None:
+        email_service = MicrosoftEmailService()
+    return email_service
+
+
+async def close_email_service():
+    """
+    Release the shared Graph HTTP session (called on application shutdown).
+    """
+    global _http_session, email_service
+    if _http_session is not None:
+        _http_session.close()
+        _http_session = None
+    email_service = None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Optional
+
+from pymongo import ReturnDocument
+
+
+class BlockSequenceAllocator:
+    """
+    Hands out unique sequence numbers from blocks reserved in a counter document.
+
+    Incrementing a single counter document per number makes every writer
+    serialize on that document (a hot partition on Cosmos). Instead each worker
+    reserves `block_size` numbers with one `$inc` and serves them from memory,
+    touching the counter again only once its block is used up.
+
+    Numbers stay unique across workers, but they are no longer handed out in
+    strict creation order, and the unused rest of a block is skipped when the
+    worker restarts. With `block_size=1` this is the plain per-number counter.
+    """
+
+    def __init__(self, counter_id: str, block_size: int = 1, collection_name: str = "ticket_counters"):
+        self.counter_id = counter_id
+        self.block_size = max(1, block_size)
+        self.collection_name = collection_name
+        self._next: Optional[int] = None
+        self._end: Optional[int] = None  # inclusive upper bound of the reserved block
+        self._lock = asyncio.Lock()
+
+    async def _reserve_block(self, db):
+        result = await db[self.collection_name].find_one_and_update(
+            {"_id": self.counter_id},
+            {"$inc": {"seq": self.block_size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._end = result.get("seq", self.block_size)
+        self._next = self._end - self.block_size + 1
+
+    async def next(self, db) -> int:
+        """
+        Return the next sequence number, reserving a new block when needed.
+        """
+        async with self._lock:
+            if self._next is None or self._next > self._end:
+                await self._reserve_block(db)
+            value = self._next
+            self._next += 1
+            return value
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import time
+from typing import Callable, List, Optional, Tuple
+
+from future_bridge.config.config import settings
+from future_bridge.repositories.supportRepository import SEARCH_COMMENT_WEIGHT, SEARCH_FIELD_WEIGHTS, SupportRepository
+from future_bridge.utils.searchIndex import InvertedIndex
+
+
+class TicketSearch:
+    """
+    Process-wide full-text search over support tickets and their comments.
+
+    The inverted index is built from the collections on the first search and
+    kept current from ticket create / comment / delete events of this process.
+    Other workers' writes are picked up by a full rebuild in the background once
+    the index is older than SUPPORT_SEARCH_REBUILD_SECONDS. Events that arrive
+    while a rebuild is scanning are replayed onto the new index before it is
+    swapped in. With SUPPORT_SEARCH_BACKEND=mongo, searches go to MongoDB text
+    indexes instead and no in-process index is kept.
+    """
+
+    def __init__(self, rebuild_seconds: int = settings.SUPPORT_SEARCH_REBUILD_SECONDS):
+        self.rebuild_seconds = rebuild_seconds
+        self._index: Optional[InvertedIndex] = None
+        self._built_at = 0.0
+        self._pending: Optional[List[Callable[[InvertedIndex], None]]] = None
+        self._lock = asyncio.Lock()
+        self._rebuild_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _index_ticket(index: InvertedIndex, ticket: dict):
+        ticket_id = ticket["ticket_id"]
+        index.remove(ticket_id)
+        for field, weight in SEARCH_FIELD_WEIGHTS.items():
+            index.add(ticket_id, ticket.get(field), weight)
+        for comment in ticket.get("comments") or []:
+            index.add(ticket_id, comment.get("comment"), SEARCH_COMMENT_WEIGHT)
+
+    def _apply(self, event: Callable[[InvertedIndex], None]):
+        if self._index is not None:
+            event(self._index)
+        if self._pending is not None:
+            self._pending.append(event)
+
+    def on_ticket_created(self, ticket: dict):
+        self._apply(lambda index: self._index_ticket(index, ticket))
+
+    def on_comment_added(self, ticket_id: str, comment: str):
+        self._apply(lambda index: index.add(ticket_id, comment, SEARCH_COMMENT_WEIGHT))
+
+    def on_tickets_deleted(self, ticket_ids: List[str]):
+        def remove(index: InvertedIndex):
+            for ticket_id in ticket_ids:
+                index.remove(ticket_id)
+        self._apply(remove)
+
+    async def rebuild(self, support_repository: Optional[SupportRepository] = None) -> int:
+        """
+        Build a fresh index from the ticket and comment collections and swap it in.
+        Returns the number of indexed tickets.
+        """
+        repository = support_repository or SupportRepository()
+        async with self._lock:
+            started = time.perf_counter()
+            self._pending = []
+            try:
+                index = InvertedIndex()
+                async for ticket in repository.iter_tickets_for_search():
+                    self._index_ticket(index, ticket)
+                async for bucket in repository.iter_comment_buckets_for_search():
+                    for comment in bucket.get("comments", []):
+                        index.add(bucket["ticket_id"], comment.get("comment"), SEARCH_COMMENT_WEIGHT)
+                for event in self._pending:
+                    event(index)
+            finally:
+                self._pending = None
+            self._index = index
+            self._built_at = time.monotonic()
+            logging.info(f"Support search index rebuilt with {len(index)} tickets in {time.perf_counter() - started:.2f}s")
+            return len(index)
+
+    def _rebuild_in_background(self):
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return
+
+        async def run():
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logging.error(f"Support search index rebuild failed: {e}", exc_info=True)
+
+        self._rebuild_task = asyncio.create_task(run())
+
+    async def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Rank tickets for `query`; returns (ticket_id, score) pairs, best first.
+        """
+        if settings.SUPPORT_SEARCH_BACKEND == "mongo":
+            return await SupportRepository().text_search_ticket_ids(query, limit)
+
+        if self._index is None:
+            if self._lock.locked():
+                # Another request is already building it
+                async with self._lock:
+                    pass
+            if self._index is None:
+                await self.rebuild()
+        elif time.monotonic() - self._built_at >= self.rebuild_seconds:
+            self._rebuild_in_background()
+        return self._index.search(query, limit=limit, prefix=True)
+
+
+ticket_search = TicketSearch()
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from future_bridge.config.config import settings
+from future_bridge.utils import sendEmail
+from future_bridge.utils.blobStorage import get_blob_service_client
+from future_bridge.utils.configFlags import config_flags
+from future_bridge.utils.courseCatalog import course_catalog
+from future_bridge.utils.db import get_db
+from future_bridge.utils.ticketSearch import ticket_search
+
+
+class StepSkipped(Exception):
+    """
+    Raised by a warm-up step that does not apply to this instance (e.g. a client
+    whose credentials are not configured).
+    """
+
+
+async def _warm_mongo() -> str:
+    # Creates the shared client and pings it, which opens the first pooled connection
+    await get_db()
+    return "connected"
+
+
+async def _warm_config_flags() -> str:
+    flags = await config_flags.load()
+    return f"{len(flags)} flags"
+
+
+async def _warm_course_catalog() -> str:
+    counts = []
+    for collection_name in (settings.COLLEGE_CUTOFF_COLLECTION, settings.DIPLOMA_COLLEGE_CUTOFF_COLLECTION):
+        counts.append(f"{collection_name}: {len(await course_catalog.get_keys(collection_name))}")
+    return ", ".join(counts)
+
+
+async def _warm_email_token() -> str:
+    if not all([sendEmail.client_id, sendEmail.client_secret, sendEmail.tenant_id]):
+        raise StepSkipped("Azure AD credentials are not configured")
+    # MSAL is synchronous; the token lands in the shared MSAL cache used by every later email
+    await asyncio.to_thread(sendEmail.get_microsoft_email_service().get_access_token)
+    return "token cached"
+
+
+async def _warm_blob_client() -> str:
+    if not settings.CONNECTION_STRING:
+        raise StepSkipped("Blob storage connection string is not configured")
+    # Constructing the client imports the Azure SDK, which is kept off the import path of the app
+    await asyncio.to_thread(get_blob_service_client)
+    return "client created"
+
+
+async def _warm_ticket_search() -> str:
+    if settings.SUPPORT_SEARCH_BACKEND == "mongo":
+        raise StepSkipped("Support search uses MongoDB text indexes")
+    return f"{await ticket_search.rebuild()} tickets indexed"
+
+
+# Warm-up steps by the name used in WARMUP_BLOCKING_STEPS / WARMUP_BACKGROUND_STEPS.
+# Each returns a short description of what it loaded.
+WARMUP_STEPS: Dict[str, Callable[[], Awaitable[str]]] = {
+    "mongo": _warm_mongo,
+    "config_flags": _warm_config_flags,
+    "course_catalog": _warm_course_catalog,
+    "email_token": _warm_email_token,
+    "blob_client": _warm_blob_client,
+    "ticket_search": _warm_ticket_search,
+}
+
+
+def _step_names(value: str) -> List[str]:
+    names = []
+    for name in (part.strip() for part in value.split(",")):
+        if not name:
+            continue
+        if name not in WARMUP_STEPS:
+            logging.error(f"Unknown warm-up step '{name}' ignored. Known steps: {', '.join(WARMUP_STEPS)}")
+            continue
+        if name not in names:
+            names.append(name)
+    return names
+
+
+class Warmup:
+    """
+    Startup warm-up of the process-wide clients and caches that the first request
+    would otherwise pay for: the Mongo connection, the AAD token for Graph mail,
+    the config flags and the reference catalogs.
+
+    Blocking steps run in order before startup completes, so the instance only
+    takes traffic once they are done; each is bounded by
+    WARMUP_STEP_TIMEOUT_SECONDS. Background steps then run in a task without
+    holding up readiness. A failed step is logged and left to the lazy path it
+    pre-empts, so warm-up never stops the app from starting. Timings of every
+    step are logged and kept for the /internal/warmup endpoint.
+    """
+
+    def __init__(
+        self,
+        blocking: str = settings.WARMUP_BLOCKING_STEPS,
+        background: str = settings.WARMUP_BACKGROUND_STEPS,
+        step_timeout_seconds: float = settings.WARMUP_STEP_TIMEOUT_SECONDS,
+    ):
+        self.blocking = _step_names(blocking)
+        self.background = [name for name in _step_names(background) if name not in self.blocking]
+        self.step_timeout_seconds = step_timeout_seconds
+        self._steps: Dict[str, Dict[str, Any]] = {}
+        self._ready_ms: Optional[float] = None
+        self._background_task: Optional[asyncio.Task] = None
+
+    async def _run_step(self, name: str, mode: str, timeout: Optional[float]):
+        record = self._steps[name]
+        record["status"] = "running"
+        started = time.perf_counter()
+        try:
+            record["detail"] = await asyncio.wait_for(WARMUP_STEPS[name](), timeout)
+            record["status"] = "ok"
+        except StepSkipped as e:
+            record["status"], record["detail"] = "skipped", str(e)
+        except asyncio.TimeoutError:
+            record["status"], record["detail"] = "timeout", f"exceeded {timeout:g}s"
+        except Exception as e:
+            record["status"], record["detail"] = "failed", str(e)
+            logging.error(f"Warm-up step {name} failed: {e}", exc_info=True)
+        record["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        logging.info(f"Warm-up step {name} ({mode}) {record['status']} in {record['duration_ms']:.0f} ms: {record['detail']}")
+
+    async def _run_background(self):
+        for name in self.background:
+            await self._run_step(name, "background", None)
+        total = sum(self._steps[name]["duration_ms"] for name in self.background)
+        logging.info(f"Background warm-up finished in {total:.0f} ms")
+
+    async def start(self):
+        """
+        Run the blocking steps, then start the background ones (called on application startup).
+        """
+        started = time.perf_counter()
+        for name in self.blocking:
+            self._steps[name] = {"mode": "blocking", "status": "pending", "duration_ms": None, "detail": None}
+        for name in self.background:
+            self._steps[name] = {"mode": "background", "status": "pending", "duration_ms": None, "detail": None}
+        for name in self.blocking:
+            await self._run_step(name, "blocking", self.step_timeout_seconds)
+        self._ready_ms = round((time.perf_counter() - started) * 1000, 1)
+        logging.info(f"Warm-up ready in {self._ready_ms:.0f} ms ({len(self.blocking)} blocking step(s))")
+        if self.background and self._background_task is None:
+            self._background_task = asyncio.create_task(self._run_background())
+
+    async def stop(self):
+        """
+        Cancel background steps that are still running (called on application shutdown).
+        """
+        if self._background_task is not None:
+            self._background_task.cancel()
+            try:
+                await self._background_task
+            except asyncio.CancelledError:
+                pass
+            self._background_task = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "ready_ms": self._ready_ms,
+            "blocking": self.blocking,
+            "background": self.background,
+            "steps": {name: dict(record) for name, record in self._steps.items()},
+        }
+
+
+warmup = Warmup()
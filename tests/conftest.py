@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The tests never talk to Azure AD, Google or a real database; these only
+# satisfy import-time configuration checks of the app.
+os.environ.setdefault("Environment", "Development")
+os.environ.setdefault("LMSTOKEN", "tests")
+for _name in ("CLIENT_ID", "CLIENT_SECRET", "TENANT_ID"):
+    os.environ.setdefault(_name, "tests")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
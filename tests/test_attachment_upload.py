@@ -0,0 +1,134 @@
+"""
+Streaming attachment uploads (SupportService.validate_and_upload_files) against
+an in-memory stand-in for the Azure blob client.
+"""
+import asyncio
+import io
+
+import pytest
+from starlette.datastructures import Headers, UploadFile
+
+from future_bridge.config.config import settings
+from future_bridge.services import supportService
+from future_bridge.services.supportService import SupportService
+
+BLOCK_SIZE = 1024
+MB = 1024 * 1024
+
+
+class StubBlobClient:
+    def __init__(self, service, name):
+        self.service = service
+        self.name = name
+        self.url = f"https://stub.blob.local/{service.container}/{name}"
+
+    async def stage_block(self, block_id, data, length):
+        assert len(data) == length <= BLOCK_SIZE
+        self.service.staged.setdefault(self.name, {})[block_id] = bytes(data)
+        # Yield like a network call, so concurrent uploads interleave
+        await asyncio.sleep(0)
+
+    async def commit_block_list(self, block_list, content_settings=None):
+        staged = self.service.staged.pop(self.name)
+        self.service.blobs[self.name] = b"".join(staged[block.id] for block in block_list)
+        self.service.content_types[self.name] = content_settings.content_type if content_settings else None
+
+    async def delete_blob(self):
+        del self.service.blobs[self.name]
+        self.service.deleted.append(self.name)
+
+
+class StubBlobService:
+    """
+    Keeps committed blobs, staged (uncommitted) blocks and deletions in memory.
+    """
+
+    def __init__(self, container):
+        self.container = container
+        self.blobs = {}
+        self.staged = {}
+        self.content_types = {}
+        self.deleted = []
+
+    def get_blob_client(self, container, blob):
+        assert container == self.container
+        return StubBlobClient(self, blob)
+
+
+class SlowUploadFile(UploadFile):
+    """
+    UploadFile whose reads wait until `release` is set, so a sibling upload can fail first.
+    """
+
+    def __init__(self, *args, release: asyncio.Event, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = release
+
+    async def read(self, size=-1):
+        await self.release.wait()
+        return await super().read(size)
+
+
+def upload_file(filename, data, content_type="image/png"):
+    return UploadFile(io.BytesIO(data), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+@pytest.fixture
+def blob_service(monkeypatch):
+    service = StubBlobService(settings.AZURE_BLOB_CONTAINER)
+    monkeypatch.setattr(supportService, "get_blob_service_client", lambda: service)
+    monkeypatch.setattr(settings, "BLOB_UPLOAD_BLOCK_SIZE", BLOCK_SIZE)
+    return service
+
+
+def test_files_are_staged_in_blocks_and_committed(blob_service):
+    image = bytes(range(256)) * 10  # 2560 bytes -> 3 blocks
+    video = b"v" * 100
+
+    urls = asyncio.run(SupportService(None).validate_and_upload_files(
+        [upload_file("photo.png", image), upload_file("clip.mp4", video, "video/mp4")], max_size_mb=1
+    ))
+
+    assert len(urls) == 2
+    names = [url.rsplit("/", 1)[-1] for url in urls]
+    assert names[0].endswith(".png") and names[1].endswith(".mp4")
+    assert blob_service.blobs[names[0]] == image
+    assert blob_service.blobs[names[1]] == video
+    assert blob_service.content_types[names[1]] == "video/mp4"
+    assert blob_service.staged == {}
+    assert blob_service.deleted == []
+
+
+def test_oversized_file_is_never_committed(blob_service):
+    with pytest.raises(ValueError, match="exceeds 1MB limit"):
+        asyncio.run(SupportService(None).validate_and_upload_files([upload_file("big.png", b"x" * (MB + 1))], max_size_mb=1))
+
+    assert blob_service.blobs == {}
+
+
+def test_failed_upload_removes_committed_sibling(blob_service):
+    async def upload():
+        release = asyncio.Event()
+        # The small file is committed before the big one goes over the limit
+        small = upload_file("small.png", b"s" * 10)
+        big = SlowUploadFile(io.BytesIO(b"x" * (MB + 1)), filename="big.mov", release=release)
+        task = asyncio.create_task(SupportService(None).validate_and_upload_files([small, big], max_size_mb=1))
+        while not blob_service.blobs:
+            await asyncio.sleep(0)
+        release.set()
+        return await task
+
+    with pytest.raises(ValueError, match="big.mov exceeds"):
+        asyncio.run(upload())
+
+    assert blob_service.blobs == {}
+    assert len(blob_service.deleted) == 1 and blob_service.deleted[0].endswith(".png")
+
+
+def test_invalid_extension_uploads_nothing(blob_service):
+    with pytest.raises(ValueError, match="Invalid file type"):
+        asyncio.run(SupportService(None).validate_and_upload_files(
+            [upload_file("photo.png", b"p"), upload_file("script.exe", b"e")], max_size_mb=1
+        ))
+
+    assert blob_service.blobs == {} and blob_service.staged == {}
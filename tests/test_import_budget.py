@@ -0,0 +1,22 @@
+"""
+Cold-start import budget of the Function App entry point (see future_bridge.perf.importBudget).
+"""
+from future_bridge.perf.importBudget import DEFERRED_MODULES, ENTRY_POINT, IMPORT_BUDGET_MS, check, measure_once
+
+RUNS = 3
+
+
+def _fastest_profile():
+    profiles = [measure_once() for _ in range(RUNS)]
+    return min(profiles, key=lambda profile: next((cumulative for name, _, cumulative, _ in profile if name == ENTRY_POINT), 0))
+
+
+def test_deferred_sdks_are_not_imported_at_startup():
+    imported = {name for name, _, _, _ in measure_once()}
+
+    assert ENTRY_POINT in imported
+    assert [module for module in DEFERRED_MODULES if module in imported] == []
+
+
+def test_entry_point_imports_within_budget():
+    assert check(_fastest_profile(), IMPORT_BUDGET_MS) == []
@@ -0,0 +1,19 @@
+"""
+Per-endpoint MongoDB query budgets against the in-process stand-in (see future_bridge.perf.queryBudget).
+"""
+import asyncio
+
+from future_bridge.perf.queryBudget import check, measure
+from future_bridge.utils import db as db_module
+
+# Two data set sizes, so a command count that grows with the data (an N+1 query) is caught
+SCALES = [0.05, 0.2]
+
+
+def test_endpoints_within_query_budget(monkeypatch):
+    monkeypatch.setattr(db_module, "client", None)
+    monkeypatch.setattr(db_module, "cj_client", None)
+
+    measurements = {scale: asyncio.run(measure(scale)) for scale in SCALES}
+
+    assert check(measurements) == []
@@ -0,0 +1,78 @@
+"""
+Support ticket comments (embedded legacy comments and comment buckets) against
+the in-process Mongo stand-in.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from future_bridge.config.config import settings
+from future_bridge.perf.mongoStandIn import install_mock_client
+from future_bridge.repositories import supportRepository
+from future_bridge.repositories.supportRepository import SupportRepository
+from future_bridge.utils import db as db_module
+
+TICKET_ID = "FB-00001"
+USER_EMAIL = "student@example.com"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(db_module, "client", None)
+    monkeypatch.setattr(db_module, "cj_client", None)
+    monkeypatch.setattr(supportRepository, "comment_bucket_index_ready", False)
+    return install_mock_client()[settings.DATABASE]
+
+
+def legacy_ticket(comments):
+    started = datetime(2024, 1, 1)
+    return {
+        "ticket_id": TICKET_ID,
+        "username": USER_EMAIL,
+        "status": "open",
+        "created_at": started,
+        "comments": [
+            {"timestamp": started + timedelta(minutes=i), "email": USER_EMAIL, "user_type": "user", "comment": text}
+            for i, text in enumerate(comments)
+        ],
+    }
+
+
+def comment_texts(ticket):
+    return [comment["comment"] for comment in ticket["comments"]]
+
+
+def test_admin_views_list_embedded_and_bucketed_comments_oldest_first(db):
+    async def scenario():
+        await db[settings.SUPPORT_ISSUES_COLLECTION].insert_one(legacy_ticket(["first", "second"]))
+        repository = SupportRepository()
+        await repository.add_comment_to_ticket_by_admin("admin@example.com", TICKET_ID, "third")
+        return await repository.get_ticket_by_id(TICKET_ID), await repository.get_all_tickets(None, "created_at:desc", 1, 10)
+
+    ticket, page = asyncio.run(scenario())
+
+    assert comment_texts(ticket) == ["first", "second", "third"]
+    assert comment_texts(page["tickets"][0]) == ["first", "second", "third"]
+
+
+def test_repeated_migration_does_not_duplicate_buckets(db):
+    async def scenario():
+        ticket = legacy_ticket(["first", "second"])
+        await db[settings.SUPPORT_ISSUES_COLLECTION].insert_one(ticket)
+        # An interrupted run already copied the first comment but kept the embedded ones
+        await db[settings.SUPPORT_COMMENTS_COLLECTION].insert_one(
+            {"ticket_id": TICKET_ID, "bucket": 0, "count": 1, "comments": [{**ticket["comments"][0], "seq": 0}]}
+        )
+        repository = SupportRepository()
+        await repository.migrate_embedded_comments()
+        buckets = await db[settings.SUPPORT_COMMENTS_COLLECTION].find({"ticket_id": TICKET_ID}).to_list(None)
+        indexes = await db[settings.SUPPORT_COMMENTS_COLLECTION].index_information()
+        return buckets, indexes, await repository.get_ticket_comments(TICKET_ID, 1, 10)
+
+    buckets, indexes, page = asyncio.run(scenario())
+
+    assert len(buckets) == 1
+    assert [comment["seq"] for comment in buckets[0]["comments"]] == [0, 1]
+    assert any(info["key"] == [("ticket_id", 1), ("bucket", 1)] and info.get("unique") for info in indexes.values())
+    assert [comment["comment"] for comment in page["comments"]] == ["second", "first"]